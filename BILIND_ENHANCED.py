@@ -10,9 +10,16 @@ Features:
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext, simpledialog
+from tkinter import font as tkfont
+from collections import defaultdict
 import csv
+import io
+import math
 import os
+import re
 from datetime import datetime
+from functools import lru_cache
+from itertools import compress
 import time
 
 try:
@@ -23,7 +30,117 @@ except ImportError:
     print("❌ Missing dependencies. Run: pip install pyautocad pywin32")
     exit(1)
 
+
+@lru_cache(maxsize=4096)
+def _fmt_cached(value, digits):
+    """Format a number with fixed decimals; memoized since catalog sizes repeat."""
+    return f"{value:.{digits}f}"
+
+
+# Numeric fields pre-formatted per record type for the summary and CSV export
+_DISPLAY_FIELDS = {
+    'rooms': ('w', 'l', 'perim', 'area'),
+    'doors': ('w', 'h', 'perim', 'area', 'stone'),
+    'windows': ('w', 'h', 'perim', 'area', 'stone', 'glass'),
+    'walls': ('length', 'height', 'gross', 'deduct', 'net'),
+}
+
+
+def _perim_area_from_dims(w, l):
+    """Perimeter and area of a W×L rectangle."""
+    return 2 * (w + l), w * l
+
+
+def _dims_from_perim_area(perim, area):
+    """Estimate rectangle W×L from perimeter and area, or None if no rectangle fits.
+
+    P = 2(W+L) and A = W·L give W² - W·P/2 + A = 0, so
+    W = (P/2 + √((P/2)² - 4A)) / 2 and L = A / W.
+    """
+    half_p = perim / 2
+    discriminant = half_p * half_p - 4 * area
+    if discriminant < 0:
+        return None
+    w = (half_p + math.sqrt(discriminant)) / 2
+    l = area / w if w > 0 else 0
+    return w, l
+
+
+# Checkbox captions for the bulk delete dialog, keyed by data type
+_DELETE_LABELS = {
+    'rooms': lambda i, it: "Room %d: %s - %.2fm²" % (
+        i + 1, it.get('name', 'N/A'), it.get('area', 0)),
+    'doors': lambda i, it: "Door %d: %s - %s %s×%sm" % (
+        i + 1, it.get('name', 'N/A'), it.get('type', 'N/A'), it.get('w', 0), it.get('h', 0)),
+    'windows': lambda i, it: "Window %d: %s - %s %s×%sm" % (
+        i + 1, it.get('name', 'N/A'), it.get('type', 'N/A'), it.get('w', 0), it.get('h', 0)),
+    'walls': lambda i, it: "Wall %d: %s - %.2f×%.2fm" % (
+        i + 1, it.get('name', 'N/A'), it.get('length', 0), it.get('height', 0)),
+}
+
+# Same grammar float() accepts: decimals, exponents, digit underscores, inf/nan
+_DIGITS = r'\d(?:_?\d)*'
+_FLOAT_RE = re.compile(
+    rf'^[+-]?(?:(?:{_DIGITS}\.?(?:{_DIGITS})?|\.{_DIGITS})(?:[eE][+-]?{_DIGITS})?'
+    r'|inf(?:inity)?|nan)$',
+    re.IGNORECASE,
+)
+
+
+def _wheel_units(event):
+    """Scroll units for a mouse-wheel event (positive scrolls down).
+
+    Windows reports multiples of 120, macOS small deltas (±1..3) that would
+    truncate to 0 so only their sign is used, and X11 sends Button-4/5.
+    """
+    if event.num == 4:
+        return -1
+    if event.num == 5:
+        return 1
+    if not event.delta:
+        return 0
+    return int(-event.delta / 120) or (-1 if event.delta > 0 else 1)
+
+
+def _safe_float(text, default=None):
+    """Parse a numeric entry like float(), returning default for blank or malformed input."""
+    text = text.strip()
+    if text and _FLOAT_RE.match(text):
+        return float(text)
+    return default
+
+
+# Characters that force csv.writer to quote a field (default dialect)
+_CSV_SPECIAL = re.compile(r'[,"\r\n]')
+
+# Tcl lambda that fills a Treeview from a list of value rows in one call
+_TREE_FILL = '{tree rows} {foreach row $rows {$tree insert {} end -values $row}}'
+
+# Bulk delete button caption while not waiting for confirmation
+_DELETE_IDLE_TEXT = "🗑️ Delete Selected"
+
+# Minimum row pitch (px) of the virtualized bulk delete list
+_DELETE_ROW_HEIGHT = 26
+
+# Shared widget options for the manual room dialog
+_FONT = ('Arial', 10)
+_FONT_BOLD = ('Arial', 11, 'bold')
+_LABEL_KW = {'bg': '#0f0f1e', 'fg': '#b0bec5', 'font': _FONT}
+_ENTRY_KW = {'font': _FONT, 'bg': '#f0f0f0'}
+_RADIO_KW = {
+    'bg': '#16213e',
+    'fg': '#ffffff',
+    'selectcolor': '#1a1a2e',
+    'activebackground': '#16213e',
+    'activeforeground': '#00d9ff',
+    'font': _FONT,
+}
+
+
 class BilindEnhanced:
+    # Status bar icon per data type
+    _TYPE_ICONS = {'rooms': '🏠', 'doors': '🚪', 'windows': '🪟', 'walls': '🧱'}
+
     def __init__(self, root):
         self.root = root
         self.root.title("BILIND Enhanced - AutoCAD Calculator")
@@ -85,6 +202,9 @@ class BilindEnhanced:
                 'description': 'Steel/metal frame window'
             }
         }
+        # Catalog keys for the type comboboxes (catalogs are fixed at startup)
+        self._door_type_keys = tuple(self.door_types)
+        self._window_type_keys = tuple(self.window_types)
         
         # AutoCAD connection
         try:
@@ -102,6 +222,14 @@ class BilindEnhanced:
         self.doors = []
         self.windows = []
         self.walls = []
+        # Bumped on every rooms mutation; refresh_rooms() skips the rebuild
+        # when (version, filter) matches what the tree already shows
+        self._rooms_version = 0
+        self._rooms_rendered = None
+        # data key -> records currently shown in its tree, in row order
+        self._tree_records = {}
+        # name -> index per opening storage, rebuilt on every refresh_openings()
+        self._opening_name_index = {'DOOR': {}, 'WINDOW': {}}
         
         # Finishes - detailed tracking
         self.plaster_items = []  # [{'desc': 'Room 1', 'area': 25.5}, ...]
@@ -111,6 +239,12 @@ class BilindEnhanced:
         
         self._status_after_id = None
         self._default_status = "جاهز - Ready"
+        self._dialog_pool = {}  # key -> (Toplevel, parts) for reusable edit dialogs
+        self._pending_refresh = set()  # data types awaiting _flush_refresh()
+        # Row pitch of virtualized lists, measured once from the real font so
+        # scaled/HiDPI fonts are not clipped
+        self._row_h = max(_DELETE_ROW_HEIGHT,
+                          tkfont.Font(root=self.root, font=_FONT).metrics('linespace') + 8)
 
         self.create_ui()
 
@@ -223,6 +357,8 @@ class BilindEnhanced:
             background=[('active', colors['hover'])],
             foreground=[('active', colors['text_primary'])])
 
+        style.configure('Field.TLabel', foreground=colors['text_secondary'])
+
         style.configure('Status.TFrame', background=colors['bg_primary'])
         style.configure('Status.TLabel',
             background=colors['bg_primary'],
@@ -246,6 +382,9 @@ class BilindEnhanced:
     def _opening_storage(self, opening_type):
         return self.doors if opening_type == 'DOOR' else self.windows
 
+    def _opening_type_keys(self, opening_type):
+        return self._door_type_keys if opening_type == 'DOOR' else self._window_type_keys
+
     def _ensure_room_names(self):
         for idx, room in enumerate(self.rooms, start=1):
             room.setdefault('name', f"Room{idx}")
@@ -260,6 +399,12 @@ class BilindEnhanced:
         for idx, item in enumerate(storage, start=1):
             item.setdefault('name', f"{prefix}{idx}")
 
+    def _index_opening_names(self, opening_type):
+        storage = self._opening_storage(opening_type)
+        self._opening_name_index[opening_type] = {
+            item.get('name'): idx for idx, item in enumerate(storage)
+        }
+
     def _make_unique_name(self, opening_type, base_name):
         storage = self._opening_storage(opening_type)
         existing = {item.get('name') for item in storage if item.get('name')}
@@ -307,14 +452,34 @@ class BilindEnhanced:
             record['glass_each'] = 0.0
             record['glass'] = 0.0
 
+        self._update_display(record, 'doors' if opening_type == 'DOOR' else 'windows')
         return record
 
     def _fmt(self, value, digits=2, default='-'):
+        # Zeros skip the cache: -0.0 and 0.0 share a key but format differently
+        if value and type(value) in (float, int):
+            return _fmt_cached(value, digits)
         try:
             return f"{float(value):.{digits}f}"
         except (TypeError, ValueError):
             return default
 
+    def _update_display(self, record, data_key):
+        """Cache formatted numeric strings on a record; call after mutating it in place."""
+        fmt = self._fmt
+        disp = {key: fmt(record.get(key)) for key in _DISPLAY_FIELDS[data_key]}
+        if data_key == 'doors':
+            disp['weight'] = fmt(record.get('weight'), digits=1)
+        record['_disp'] = disp
+        return disp
+
+    def _display(self, record, data_key):
+        """Return the cached display strings for a record, building them on first use."""
+        disp = record.get('_disp')
+        if disp is None:
+            disp = self._update_display(record, data_key)
+        return disp
+
     def update_status(self, message, icon=""):
         """Update the persistent status bar with an optional icon."""
         if not hasattr(self, 'status_var'):
@@ -388,16 +553,28 @@ class BilindEnhanced:
 
         query = (query or '').strip().lower()
         filtered_records = []
+        rows = []
 
-        tree.delete(*tree.get_children())
+        format_row = self._format_tree_row
         for record in dataset:
-            values = self._format_tree_row(data_key, record)
+            values = format_row(data_key, record)
             if not values:
                 continue
-            row_text = ' '.join(str(v).lower() for v in values)
-            if not query or query in row_text:
-                tree.insert('', tk.END, values=values)
-                filtered_records.append(record)
+            if query and query not in ' '.join(str(v).lower() for v in values):
+                continue
+            rows.append(values)
+            filtered_records.append(record)
+
+        if data_key == 'rooms':
+            self._rooms_rendered = (self._rooms_version, query)
+        # Row i of the tree shows filtered_records[i]
+        self._tree_records[data_key] = filtered_records
+
+        # Repopulate with a single Python->Tcl crossing: the rows go over as
+        # one Tcl list and the insert loop runs inside the interpreter
+        tree.delete(*tree.get_children())
+        if rows:
+            tree.tk.call('apply', _TREE_FILL, str(tree), rows)
 
         return filtered_records
 
@@ -536,7 +713,7 @@ class BilindEnhanced:
         self.rooms_tree = ttk.Treeview(tree_frame,
                                        columns=('Name', 'Layer', 'W', 'L', 'Perim', 'Area'),
                                        show='headings',
-                                       selectmode='browse',
+                                       selectmode='extended',
                                        height=6)
         for col, text, width in [
             ('Name', 'Name', 110),
@@ -583,7 +760,7 @@ class BilindEnhanced:
         self.doors_tree = ttk.Treeview(doors_tree_frame,
                                        columns=door_columns,
                                        show='headings',
-                                       selectmode='browse',
+                                       selectmode='extended',
                                        height=5)
         for col, text, width in [
             ('Name', 'Name', 100),
@@ -634,7 +811,7 @@ class BilindEnhanced:
         self.windows_tree = ttk.Treeview(windows_tree_frame,
                                          columns=window_columns,
                                          show='headings',
-                                         selectmode='browse',
+                                         selectmode='extended',
                                          height=5)
         for col, text, width in [
             ('Name', 'Name', 100),
@@ -705,7 +882,7 @@ class BilindEnhanced:
                                        columns=columns,
                                        show='headings',
                                        style='Walls.Treeview',
-                                       selectmode='browse',
+                                       selectmode='extended',
                                        height=12)
         headings = {
             'Name': ('Name', 110, tk.W),
@@ -1295,6 +1472,8 @@ class BilindEnhanced:
                     continue
             
             ss.Delete()
+            if count:
+                self._touch_rooms()
             self.refresh_rooms()
             
             if count > 0:
@@ -1444,8 +1623,9 @@ class BilindEnhanced:
         row += 1
 
         ttk.Label(body, text="Type", foreground=self.colors['text_secondary']).grid(row=row, column=0, sticky='w', pady=6)
-        type_var = tk.StringVar(value=list(type_catalog.keys())[0])
-        type_combo = ttk.Combobox(body, textvariable=type_var, values=list(type_catalog.keys()), state='readonly', width=20)
+        type_keys = self._opening_type_keys(opening_type)
+        type_var = tk.StringVar(value=type_keys[0])
+        type_combo = ttk.Combobox(body, textvariable=type_var, values=type_keys, state='readonly', width=20)
         type_combo.grid(row=row, column=1, sticky='w', pady=6)
         info_var = tk.StringVar()
         info_label = ttk.Label(body, textvariable=info_var, wraplength=260, foreground=self.colors['text_secondary'])
@@ -1596,7 +1776,8 @@ class BilindEnhanced:
         defaults = defaults or {}
         prefix = defaults.get('name_prefix') or ('D' if opening_type == 'DOOR' else 'W')
         suggested_name = defaults.get('name') or self._make_unique_name(opening_type, f"{prefix}{len(storage)+1}")
-        type_default = defaults.get('type') or list(type_catalog.keys())[0]
+        type_keys = self._opening_type_keys(opening_type)
+        type_default = defaults.get('type') or type_keys[0]
         layer_default = defaults.get('layer') or ('Door' if opening_type == 'DOOR' else 'Window')
         width_default = defaults.get('width') or (0.9 if opening_type == 'DOOR' else 1.2)
         height_default = defaults.get('height') or (2.1 if opening_type == 'DOOR' else 1.5)
@@ -1627,7 +1808,7 @@ class BilindEnhanced:
 
         ttk.Label(frame, text="Type", foreground=self.colors['text_secondary']).grid(row=2, column=0, sticky='w', pady=6)
         type_var = tk.StringVar(value=type_default)
-        type_combo = ttk.Combobox(frame, textvariable=type_var, values=list(type_catalog.keys()), state='readonly', width=22)
+        type_combo = ttk.Combobox(frame, textvariable=type_var, values=type_keys, state='readonly', width=22)
         type_combo.grid(row=2, column=1, sticky='w', pady=6)
 
         info_var = tk.StringVar(value=type_catalog.get(type_var.get(), {}).get('description', ''))
@@ -2193,20 +2374,32 @@ class BilindEnhanced:
             area_wall = perim * height
             listbox.insert(tk.END, f"{room.get('name', f'Room{i+1}')} - Perim: {perim:.2f}m → Wall: {area_wall:.2f} m²")
         
+        # Mirror the listbox selection in Python so add_selected doesn't have
+        # to query Tcl for it
+        selected = set()
+        
+        def on_select(_event=None):
+            selected.clear()
+            selected.update(listbox.curselection())
+        
+        listbox.bind('<<ListboxSelect>>', on_select)
+        
         btn_frame = ttk.Frame(dialog, style='Main.TFrame')
         btn_frame.pack(pady=10)
         
         def select_all():
             listbox.select_set(0, tk.END)
+            selected.update(range(len(self.rooms)))
         
         def deselect_all():
             listbox.select_clear(0, tk.END)
+            selected.clear()
         
         ttk.Button(btn_frame, text="Select All", command=select_all, style='Secondary.TButton').pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Deselect All", command=deselect_all, style='Secondary.TButton').pack(side=tk.LEFT, padx=5)
         
         def add_selected():
-            selected_indices = listbox.curselection()
+            selected_indices = sorted(selected)
             if not selected_indices:
                 messagebox.showwarning("Warning", "Select at least one room!")
                 return
@@ -2568,21 +2761,33 @@ class BilindEnhanced:
                 area = wall['net']
                 listbox.insert(tk.END, f"Wall {i+1} - {wall['layer']} - L:{wall['length']:.2f}m H:{wall['height']:.2f}m = {area:.2f} m²")
         
+        # Mirror the listbox selection in Python so add_selected doesn't have
+        # to query Tcl for it
+        selected = set()
+        
+        def on_select(_event=None):
+            selected.clear()
+            selected.update(listbox.curselection())
+        
+        listbox.bind('<<ListboxSelect>>', on_select)
+        
         # Select all button
         btn_frame = tk.Frame(dialog, bg='#2b2b2b')
         btn_frame.pack(pady=5)
         
         def select_all():
             listbox.select_set(0, tk.END)
+            selected.update(range(len(items)))
         
         def deselect_all():
             listbox.select_clear(0, tk.END)
+            selected.clear()
         
         tk.Button(btn_frame, text="Select All", command=select_all, bg='#607D8B', fg='white').pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="Deselect All", command=deselect_all, bg='#607D8B', fg='white').pack(side=tk.LEFT, padx=5)
         
         def add_selected():
-            selected_indices = listbox.curselection()
+            selected_indices = sorted(selected)
             if not selected_indices:
                 messagebox.showwarning("Warning", "Select at least one item!")
                 return
@@ -2889,8 +3094,21 @@ class BilindEnhanced:
             total = sum(item['data'].get('area', 0) for item in opening_vars if item['var'].get())
             total_var.set(f"{total:.2f} m²")
         
+        # Coalesce variable writes (e.g. Select All) into one recompute per idle slice
+        total_pending = [False]
+        
+        def run_update_total():
+            total_pending[0] = False
+            if dialog.winfo_exists():
+                update_total()
+        
+        def schedule_update_total(*args):
+            if not total_pending[0]:
+                total_pending[0] = True
+                dialog.after_idle(run_update_total)
+        
         for item in opening_vars:
-            item['var'].trace_add('write', update_total)
+            item['var'].trace_add('write', schedule_update_total)
         update_total()
         
         def apply_deduction():
@@ -2906,10 +3124,13 @@ class BilindEnhanced:
                 return
             
             # Distribute deduction proportionally
+            per_gross = total_deduct / total_walls
             for wall in self.walls:
-                ratio = wall.get('gross', 0) / total_walls
-                wall['deduct'] = total_deduct * ratio
-                wall['net'] = wall.get('gross', 0) - wall['deduct']
+                gross = wall.get('gross', 0)
+                deduct = gross * per_gross
+                wall['deduct'] = deduct
+                wall['net'] = gross - deduct
+                self._update_display(wall, 'walls')
             
             self.refresh_walls()
             dialog.destroy()
@@ -2941,8 +3162,28 @@ class BilindEnhanced:
     
     # === REFRESH TABLES ===
     
+    def _schedule_refresh(self, data_type):
+        if not self._pending_refresh:
+            self.root.after_idle(self._flush_refresh)
+        self._pending_refresh.add(data_type)
+
+    def _flush_refresh(self):
+        pending = self._pending_refresh
+        self._pending_refresh = set()
+        if 'rooms' in pending:
+            self.refresh_rooms()
+        if 'doors' in pending or 'windows' in pending:
+            self.refresh_openings()
+        if 'walls' in pending:
+            self.refresh_walls()
+
+    def _touch_rooms(self):
+        self._rooms_version += 1
+
     def refresh_rooms(self):
         query = self.rooms_filter.get() if hasattr(self, 'rooms_filter') else ''
+        if self._rooms_rendered == (self._rooms_version, query.strip().lower()):
+            return
         self._filter_treeview(self.rooms_tree, query, 'rooms')
     
     def refresh_openings(self):
@@ -2951,27 +3192,31 @@ class BilindEnhanced:
         window_query = self.windows_filter.get() if hasattr(self, 'windows_filter') else ''
         self._filter_treeview(self.doors_tree, door_query, 'doors')
         self._filter_treeview(self.windows_tree, window_query, 'windows')
+        self._index_opening_names('DOOR')
+        self._index_opening_names('WINDOW')
         self.refresh_materials_tab()
     
     def refresh_walls(self):
         query = self.walls_filter.get() if hasattr(self, 'walls_filter') else ''
         visible = self._filter_treeview(self.walls_tree, query, 'walls')
-        total_net = sum(w.get('net', 0) for w in self.walls)
-        visible_net = sum(w.get('net', 0) for w in visible)
         if hasattr(self, 'wall_metrics_var'):
             total_count = len(self.walls)
             visible_count = len(visible)
+            # Only sum the list that is actually shown
             if query and visible_count != total_count:
+                visible_net = sum(w.get('net', 0) for w in visible)
                 self.wall_metrics_var.set(
                     f"Net wall area: {visible_net:.2f} m² (showing {visible_count}/{total_count})"
                 )
             else:
+                total_net = sum(w.get('net', 0) for w in self.walls)
                 self.wall_metrics_var.set(f"Net wall area: {total_net:.2f} m²")
     
     # === SUMMARY & EXPORT ===
     
     def update_summary(self):
         """Generate summary"""
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         sep = "=" * 90
         s = sep + "\n"
         s += "                BILIND ENHANCED - MATERIAL SUMMARY\n"
@@ -2980,10 +3225,11 @@ class BilindEnhanced:
         room_total = sum((r.get('area') or 0) for r in self.rooms)
         s += "📋 ROOMS / الغرف:\n" + "-"*90 + "\n"
         for i, r in enumerate(self.rooms, 1):
+            disp = self._display(r, 'rooms')
             s += (
                 f"{i:>2}. {r.get('name', f'Room{i}'):<14} | Layer: {r.get('layer', '-'):<18}"
-                f" | Size: {self._fmt(r.get('w'))}×{self._fmt(r.get('l'))} m"
-                f" | Area: {self._fmt(r.get('area'))} m²\n"
+                f" | Size: {disp['w']}×{disp['l']} m"
+                f" | Area: {disp['area']} m²\n"
             )
         s += f"→ Total Rooms Area: {room_total:.2f} m²\n\n"
 
@@ -2992,13 +3238,14 @@ class BilindEnhanced:
         door_weight = sum((d.get('weight') or 0) for d in self.doors)
         s += "🚪 DOORS / الأبواب:\n" + "-"*90 + "\n"
         for i, d in enumerate(self.doors, 1):
+            disp = self._display(d, 'doors')
             s += (
                 f"{i:>2}. {d.get('name', f'D{i}'):<10} | Type: {d.get('type', '-'):<10}"
                 f" | Qty: {d.get('qty', 1):>2}"
-                f" | Size: {self._fmt(d.get('w'))}×{self._fmt(d.get('h'))} m"
-                f" | Stone: {self._fmt(d.get('stone'))} lm"
-                f" | Area: {self._fmt(d.get('area'))} m²"
-                f" | Steel: {self._fmt(d.get('weight'), digits=1)} kg\n"
+                f" | Size: {disp['w']}×{disp['h']} m"
+                f" | Stone: {disp['stone']} lm"
+                f" | Area: {disp['area']} m²"
+                f" | Steel: {disp['weight']} kg\n"
             )
         s += (
             f"→ Totals • Area: {door_area:.2f} m² • Stone: {door_stone:.2f} lm"
@@ -3010,13 +3257,14 @@ class BilindEnhanced:
         window_glass = sum((w.get('glass') or 0) for w in self.windows)
         s += "🪟 WINDOWS / الشبابيك:\n" + "-"*90 + "\n"
         for i, w in enumerate(self.windows, 1):
+            disp = self._display(w, 'windows')
             s += (
                 f"{i:>2}. {w.get('name', f'W{i}'):<10} | Type: {w.get('type', '-'):<12}"
                 f" | Qty: {w.get('qty', 1):>2}"
-                f" | Size: {self._fmt(w.get('w'))}×{self._fmt(w.get('h'))} m"
-                f" | Stone: {self._fmt(w.get('stone'))} lm"
-                f" | Area: {self._fmt(w.get('area'))} m²"
-                f" | Glass: {self._fmt(w.get('glass'))} m²\n"
+                f" | Size: {disp['w']}×{disp['h']} m"
+                f" | Stone: {disp['stone']} lm"
+                f" | Area: {disp['area']} m²"
+                f" | Glass: {disp['glass']} m²\n"
             )
         s += (
             f"→ Totals • Area: {window_area:.2f} m² • Stone: {window_stone:.2f} lm"
@@ -3027,10 +3275,16 @@ class BilindEnhanced:
             wall_net = sum((w.get('net') or 0) for w in self.walls)
             s += "🧱 WALLS / الجدران:\n" + "-"*90 + "\n"
             for i, w in enumerate(self.walls, 1):
+                disp = self._display(w, 'walls')
+                # The summary shows missing wall fields as 0.00 (the CSV shows '-')
+                length, height, net, deduct = (
+                    disp[key] if key in w else '0.00'
+                    for key in ('length', 'height', 'net', 'deduct')
+                )
                 s += (
                     f"{i:>2}. {w.get('name', f'Wall{i}'):<12} | Layer: {w.get('layer', '-'):<15}"
-                    f" | L×H: {w.get('length', 0):.2f}×{w.get('height', 0):.2f} m"
-                    f" | Net: {w.get('net', 0):.2f} m² (Deduct {w.get('deduct', 0):.2f} m²)\n"
+                    f" | L×H: {length}×{height} m"
+                    f" | Net: {net} m² (Deduct {deduct} m²)\n"
                 )
             s += f"→ Total Net Walls: {wall_net:.2f} m²\n\n"
 
@@ -3062,11 +3316,11 @@ class BilindEnhanced:
 
         if self.ceramic_zones:
             s += "🧼 CERAMIC WALLS / سيراميك الجدران:\n" + "-"*90 + "\n"
-            ceramic_totals = {}
+            ceramic_totals = defaultdict(float)
             for i, zone in enumerate(self.ceramic_zones, 1):
                 area = zone.get('area', 0)
                 category = zone.get('category', 'Other')
-                ceramic_totals[category] = ceramic_totals.get(category, 0.0) + area
+                ceramic_totals[category] += area
                 s += (
                     f"{i:>2}. {zone.get('name', 'Zone'):<16} | {category:<10}"
                     f" | Perimeter: {zone.get('perimeter', 0):.2f} m | Height: {zone.get('height', 0):.2f} m"
@@ -3078,7 +3332,7 @@ class BilindEnhanced:
             s += f"→ Totals • {cat_summary} • Total: {total_ceramic:.2f} m²\n\n"
 
         s += sep + "\n"
-        s += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        s += f"Generated: {generated_at}\n"
         s += sep
         
         self.summary_text.delete('1.0', tk.END)
@@ -3114,95 +3368,117 @@ class BilindEnhanced:
         paint_total = sum(item.get('area', 0.0) for item in self.paint_items)
         tiles_total = sum(item.get('area', 0.0) for item in self.tiles_items)
 
-        with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f)
-
-            writer.writerow(["ROOMS"])
-            writer.writerow(["Name", "Layer", "Width (m)", "Length (m)", "Perimeter (m)", "Area (m²)"])
-            for r in self.rooms:
-                writer.writerow([
-                    r.get('name', ''),
-                    r.get('layer', ''),
-                    self._fmt(r.get('w')),
-                    self._fmt(r.get('l')),
-                    self._fmt(r.get('perim')),
-                    self._fmt(r.get('area'))
-                ])
+        display = self._display
 
-            writer.writerow([])
-            writer.writerow(["DOORS"])
-            writer.writerow(["Name", "Layer", "Type", "Qty", "Width (m)", "Height (m)", "Stone (lm)", "Area (m²)", "Steel (kg)"])
-            for d in self.doors:
-                writer.writerow([
-                    d.get('name', ''),
-                    d.get('layer', ''),
-                    d.get('type', ''),
-                    d.get('qty', 1),
-                    self._fmt(d.get('w')),
-                    self._fmt(d.get('h')),
-                    self._fmt(d.get('stone')),
-                    self._fmt(d.get('area')),
-                    self._fmt(d.get('weight'), digits=1)
-                ])
+        # Collect every row first, then emit them with a single writerows call
+        rows = [
+            ["ROOMS"],
+            ["Name", "Layer", "Width (m)", "Length (m)", "Perimeter (m)", "Area (m²)"],
+        ]
+        for r in self.rooms:
+            disp = display(r, 'rooms')
+            rows.append([
+                r.get('name', ''),
+                r.get('layer', ''),
+                disp['w'],
+                disp['l'],
+                disp['perim'],
+                disp['area']
+            ])
+
+        rows.append([])
+        rows.append(["DOORS"])
+        rows.append(["Name", "Layer", "Type", "Qty", "Width (m)", "Height (m)", "Stone (lm)", "Area (m²)", "Steel (kg)"])
+        for d in self.doors:
+            disp = display(d, 'doors')
+            rows.append([
+                d.get('name', ''),
+                d.get('layer', ''),
+                d.get('type', ''),
+                d.get('qty', 1),
+                disp['w'],
+                disp['h'],
+                disp['stone'],
+                disp['area'],
+                disp['weight']
+            ])
+
+        rows.append([])
+        rows.append(["WINDOWS"])
+        rows.append(["Name", "Layer", "Type", "Qty", "Width (m)", "Height (m)", "Stone (lm)", "Area (m²)", "Glass (m²)"])
+        for w in self.windows:
+            disp = display(w, 'windows')
+            rows.append([
+                w.get('name', ''),
+                w.get('layer', ''),
+                w.get('type', ''),
+                w.get('qty', 1),
+                disp['w'],
+                disp['h'],
+                disp['stone'],
+                disp['area'],
+                disp['glass']
+            ])
 
-            writer.writerow([])
-            writer.writerow(["WINDOWS"])
-            writer.writerow(["Name", "Layer", "Type", "Qty", "Width (m)", "Height (m)", "Stone (lm)", "Area (m²)", "Glass (m²)"])
-            for w in self.windows:
-                writer.writerow([
+        if self.walls:
+            rows.append([])
+            rows.append(["WALLS"])
+            rows.append(["Name", "Layer", "Length (m)", "Height (m)", "Gross (m²)", "Deduct (m²)", "Net (m²)"])
+            for w in self.walls:
+                disp = display(w, 'walls')
+                rows.append([
                     w.get('name', ''),
                     w.get('layer', ''),
-                    w.get('type', ''),
-                    w.get('qty', 1),
-                    self._fmt(w.get('w')),
-                    self._fmt(w.get('h')),
-                    self._fmt(w.get('stone')),
-                    self._fmt(w.get('area')),
-                    self._fmt(w.get('glass'))
+                    disp['length'],
+                    disp['height'],
+                    disp['gross'],
+                    disp['deduct'],
+                    disp['net']
                 ])
 
-            if self.walls:
-                writer.writerow([])
-                writer.writerow(["WALLS"])
-                writer.writerow(["Name", "Layer", "Length (m)", "Height (m)", "Gross (m²)", "Deduct (m²)", "Net (m²)"])
-                for w in self.walls:
-                    writer.writerow([
-                        w.get('name', ''),
-                        w.get('layer', ''),
-                        self._fmt(w.get('length')),
-                        self._fmt(w.get('height')),
-                        self._fmt(w.get('gross')),
-                        self._fmt(w.get('deduct')),
-                        self._fmt(w.get('net'))
-                    ])
-
-            writer.writerow([])
-            writer.writerow(["STONE & STEEL SUMMARY"])
-            writer.writerow(["Doors stone (lm)", f"{door_stone:.2f}"])
-            writer.writerow(["Windows stone (lm)", f"{window_stone:.2f}"])
-            writer.writerow(["Steel weight (kg)", f"{door_weight:.1f}"])
-            writer.writerow(["Window glass (m²)", f"{window_glass:.2f}"])
-
-            writer.writerow([])
-            writer.writerow(["FINISHES"])
-            writer.writerow(["Type", "Area (m²)"])
-            writer.writerow(["Plaster", f"{plaster_total:.2f}"])
-            writer.writerow(["Paint", f"{paint_total:.2f}"])
-            writer.writerow(["Tiles", f"{tiles_total:.2f}"])
-
-            if self.ceramic_zones:
-                writer.writerow([])
-                writer.writerow(["CERAMIC WALL ZONES"])
-                writer.writerow(["Name", "Category", "Perimeter (m)", "Height (m)", "Area (m²)", "Notes"])
-                for zone in self.ceramic_zones:
-                    writer.writerow([
-                        zone.get('name', ''),
-                        zone.get('category', ''),
-                        f"{zone.get('perimeter', 0):.2f}",
-                        f"{zone.get('height', 0):.2f}",
-                        f"{zone.get('area', 0):.2f}",
-                        zone.get('notes', '')
-                    ])
+        # Build the whole file in memory, then hit the disk with a single write
+        buffer = io.StringIO(newline='')
+        writer = csv.writer(buffer)
+        writer.writerows(rows)
+
+        # Fixed labels and plain numbers never need quoting: write them pre-joined
+        buffer.write(
+            "\r\nSTONE & STEEL SUMMARY\r\n"
+            "Doors stone (lm),%.2f\r\n"
+            "Windows stone (lm),%.2f\r\n"
+            "Steel weight (kg),%.1f\r\n"
+            "Window glass (m²),%.2f\r\n"
+            "\r\nFINISHES\r\n"
+            "Type,Area (m²)\r\n"
+            "Plaster,%.2f\r\n"
+            "Paint,%.2f\r\n"
+            "Tiles,%.2f\r\n"
+            % (door_stone, window_stone, door_weight, window_glass,
+               plaster_total, paint_total, tiles_total)
+        )
+
+        if self.ceramic_zones:
+            buffer.write(
+                "\r\nCERAMIC WALL ZONES\r\n"
+                "Name,Category,Perimeter (m),Height (m),Area (m²),Notes\r\n"
+            )
+            needs_quoting = _CSV_SPECIAL.search
+            for zone in self.ceramic_zones:
+                get = zone.get
+                name = get('name', '')
+                category = get('category', '')
+                notes = get('notes', '')
+                numbers = (get('perimeter', 0), get('height', 0), get('area', 0))
+                text = (name, category, notes)
+                if all(type(v) is str and not needs_quoting(v) for v in text):
+                    buffer.write("%s,%s,%.2f,%.2f,%.2f,%s\r\n" % (name, category, *numbers, notes))
+                else:
+                    # User-entered text with separators/quotes (or non-str): let csv quote it
+                    writer.writerow([name, category, "%.2f" % numbers[0], "%.2f" % numbers[1],
+                                     "%.2f" % numbers[2], notes])
+
+        with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+            f.write(buffer.getvalue())
         
         messagebox.showinfo("Success", f"✅ Saved:\n{filename}")
         self.update_status(f"CSV exported: {os.path.basename(filename)}", icon="💾")
@@ -3211,6 +3487,12 @@ class BilindEnhanced:
     
     def add_room_manual(self):
         """Add room manually with flexible input options"""
+        StringVar = tk.StringVar
+        Entry = tk.Entry
+        Label = tk.Label
+        Frame = tk.Frame
+        Radiobutton = tk.Radiobutton
+
         dialog = tk.Toplevel(self.root)
         dialog.title("🏠 Add Room - Flexible Input")
         dialog.geometry("550x550")
@@ -3219,9 +3501,9 @@ class BilindEnhanced:
         dialog.grab_set()
         
         # Title
-        title_frame = tk.Frame(dialog, bg='#1a1a2e')
+        title_frame = Frame(dialog, bg='#1a1a2e')
         title_frame.pack(fill=tk.X, pady=10)
-        tk.Label(
+        Label(
             title_frame, 
             text="🏠 Add New Room",
             bg='#1a1a2e',
@@ -3230,86 +3512,76 @@ class BilindEnhanced:
         ).pack(pady=10)
         
         # Input method selection
-        method_frame = tk.Frame(dialog, bg='#16213e')
+        method_frame = Frame(dialog, bg='#16213e')
         method_frame.pack(fill=tk.X, padx=20, pady=10)
         
-        tk.Label(
+        Label(
             method_frame,
             text="📝 Input Method:",
             bg='#16213e',
             fg='#ffffff',
-            font=('Arial', 11, 'bold')
+            font=_FONT_BOLD
         ).pack(anchor='w', pady=5)
         
-        input_method = tk.StringVar(value="dimensions")
+        input_method = StringVar(value="dimensions")
         
-        tk.Radiobutton(
+        Radiobutton(
             method_frame,
             text="📐 Enter Dimensions (Width × Length)",
             variable=input_method,
             value="dimensions",
-            bg='#16213e',
-            fg='#ffffff',
-            selectcolor='#1a1a2e',
-            activebackground='#16213e',
-            activeforeground='#00d9ff',
-            font=('Arial', 10)
+            **_RADIO_KW
         ).pack(anchor='w', padx=20)
         
-        tk.Radiobutton(
+        Radiobutton(
             method_frame,
             text="📏 Enter Perimeter + Area Directly",
             variable=input_method,
             value="perim_area",
-            bg='#16213e',
-            fg='#ffffff',
-            selectcolor='#1a1a2e',
-            activebackground='#16213e',
-            activeforeground='#00d9ff',
-            font=('Arial', 10)
+            **_RADIO_KW
         ).pack(anchor='w', padx=20)
         
         # Input fields frame
-        input_frame = tk.Frame(dialog, bg='#0f0f1e')
+        input_frame = Frame(dialog, bg='#0f0f1e')
         input_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
         # Name field (always visible)
-        tk.Label(input_frame, text="🏷️ Name:", bg='#0f0f1e', fg='#b0bec5', font=('Arial', 10)).grid(row=0, column=0, padx=10, pady=8, sticky='e')
-        name_var = tk.StringVar(value=f"Room{len(self.rooms)+1}")
-        tk.Entry(input_frame, textvariable=name_var, width=25, font=('Arial', 10), bg='#f0f0f0').grid(row=0, column=1, padx=10, pady=8, sticky='w')
+        Label(input_frame, text="🏷️ Name:", **_LABEL_KW).grid(row=0, column=0, padx=10, pady=8, sticky='e')
+        name_var = StringVar(value=f"Room{len(self.rooms)+1}")
+        Entry(input_frame, textvariable=name_var, width=25, **_ENTRY_KW).grid(row=0, column=1, padx=10, pady=8, sticky='w')
         
         # Layer field
-        tk.Label(input_frame, text="📁 Layer:", bg='#0f0f1e', fg='#b0bec5', font=('Arial', 10)).grid(row=1, column=0, padx=10, pady=8, sticky='e')
-        layer_var = tk.StringVar(value="Room")
-        tk.Entry(input_frame, textvariable=layer_var, width=25, font=('Arial', 10), bg='#f0f0f0').grid(row=1, column=1, padx=10, pady=8, sticky='w')
+        Label(input_frame, text="📁 Layer:", **_LABEL_KW).grid(row=1, column=0, padx=10, pady=8, sticky='e')
+        layer_var = StringVar(value="Room")
+        Entry(input_frame, textvariable=layer_var, width=25, **_ENTRY_KW).grid(row=1, column=1, padx=10, pady=8, sticky='w')
         
         # Conditional fields
-        dim_frame = tk.Frame(input_frame, bg='#0f0f1e')
+        dim_frame = Frame(input_frame, bg='#0f0f1e')
         dim_frame.grid(row=2, column=0, columnspan=2, pady=10)
         
         # Dimensions inputs
-        tk.Label(dim_frame, text="📐 Width (m):", bg='#0f0f1e', fg='#b0bec5', font=('Arial', 10)).grid(row=0, column=0, padx=10, pady=8, sticky='e')
-        w_var = tk.StringVar(value="4.0")
-        w_entry = tk.Entry(dim_frame, textvariable=w_var, width=15, font=('Arial', 10), bg='#f0f0f0')
+        Label(dim_frame, text="📐 Width (m):", **_LABEL_KW).grid(row=0, column=0, padx=10, pady=8, sticky='e')
+        w_var = StringVar(value="4.0")
+        w_entry = Entry(dim_frame, textvariable=w_var, width=15, **_ENTRY_KW)
         w_entry.grid(row=0, column=1, padx=10, pady=8, sticky='w')
         
-        tk.Label(dim_frame, text="📐 Length (m):", bg='#0f0f1e', fg='#b0bec5', font=('Arial', 10)).grid(row=1, column=0, padx=10, pady=8, sticky='e')
-        l_var = tk.StringVar(value="5.0")
-        l_entry = tk.Entry(dim_frame, textvariable=l_var, width=15, font=('Arial', 10), bg='#f0f0f0')
+        Label(dim_frame, text="📐 Length (m):", **_LABEL_KW).grid(row=1, column=0, padx=10, pady=8, sticky='e')
+        l_var = StringVar(value="5.0")
+        l_entry = Entry(dim_frame, textvariable=l_var, width=15, **_ENTRY_KW)
         l_entry.grid(row=1, column=1, padx=10, pady=8, sticky='w')
         
         # Perimeter + Area inputs
-        perim_frame = tk.Frame(input_frame, bg='#0f0f1e')
+        perim_frame = Frame(input_frame, bg='#0f0f1e')
         perim_frame.grid(row=3, column=0, columnspan=2, pady=10)
         
-        tk.Label(perim_frame, text="📏 Perimeter (m):", bg='#0f0f1e', fg='#b0bec5', font=('Arial', 10)).grid(row=0, column=0, padx=10, pady=8, sticky='e')
-        p_var = tk.StringVar(value="18.0")
-        p_entry = tk.Entry(perim_frame, textvariable=p_var, width=15, font=('Arial', 10), bg='#f0f0f0')
+        Label(perim_frame, text="📏 Perimeter (m):", **_LABEL_KW).grid(row=0, column=0, padx=10, pady=8, sticky='e')
+        p_var = StringVar(value="18.0")
+        p_entry = Entry(perim_frame, textvariable=p_var, width=15, **_ENTRY_KW)
         p_entry.grid(row=0, column=1, padx=10, pady=8, sticky='w')
         
-        tk.Label(perim_frame, text="📐 Area (m²):", bg='#0f0f1e', fg='#b0bec5', font=('Arial', 10)).grid(row=1, column=0, padx=10, pady=8, sticky='e')
-        a_var = tk.StringVar(value="20.0")
-        a_entry = tk.Entry(perim_frame, textvariable=a_var, width=15, font=('Arial', 10), bg='#f0f0f0')
+        Label(perim_frame, text="📐 Area (m²):", **_LABEL_KW).grid(row=1, column=0, padx=10, pady=8, sticky='e')
+        a_var = StringVar(value="20.0")
+        a_entry = Entry(perim_frame, textvariable=a_var, width=15, **_ENTRY_KW)
         a_entry.grid(row=1, column=1, padx=10, pady=8, sticky='w')
         
         # Initially hide perim_area frame
@@ -3326,7 +3598,7 @@ class BilindEnhanced:
         input_method.trace('w', on_method_change)
         
         # Info label
-        info_label = tk.Label(
+        info_label = Label(
             dialog,
             text="💡 Choose your preferred input method above",
             bg='#16213e',
@@ -3349,8 +3621,7 @@ class BilindEnhanced:
                         messagebox.showerror("❌ Error", "Dimensions must be positive!")
                         return
                     
-                    perim = 2 * (w + l)
-                    area = w * l
+                    perim, area = _perim_area_from_dims(w, l)
                     
                 else:
                     # Calculate from perimeter + area
@@ -3362,22 +3633,11 @@ class BilindEnhanced:
                         return
                     
                     # Estimate dimensions using quadratic formula
-                    # P = 2(W+L) => W+L = P/2
-                    # A = W*L
-                    # L = P/2 - W
-                    # A = W(P/2 - W) = WP/2 - W²
-                    # W² - WP/2 + A = 0
-                    # W = (P/2 ± √((P/2)² - 4A)) / 2
-                    
-                    half_p = perim / 2
-                    discriminant = (half_p ** 2) - (4 * area)
-                    
-                    if discriminant < 0:
+                    dims = _dims_from_perim_area(perim, area)
+                    if dims is None:
                         messagebox.showerror("❌ Error", "Invalid perimeter/area combination!")
                         return
-                    
-                    w = (half_p + (discriminant ** 0.5)) / 2
-                    l = area / w if w > 0 else 0
+                    w, l = dims
                 
                 self.rooms.append({
                     'name': name,
@@ -3387,8 +3647,8 @@ class BilindEnhanced:
                     'perim': perim,
                     'area': area
                 })
+                self._touch_rooms()
                 self.refresh_rooms()
-                messagebox.showinfo("✓ Success", f"Room '{name}' added successfully!")
                 dialog.destroy()
                 self.update_status(f"Added room '{name}'", icon="🏠")
                 
@@ -3396,7 +3656,7 @@ class BilindEnhanced:
                 messagebox.showerror("❌ Error", "Invalid number format!")
         
         # Button frame
-        btn_frame = tk.Frame(dialog, bg='#16213e')
+        btn_frame = Frame(dialog, bg='#16213e')
         btn_frame.pack(fill=tk.X, padx=20, pady=15)
         
         tk.Button(
@@ -3405,7 +3665,7 @@ class BilindEnhanced:
             command=save, 
             bg='#00e676', 
             fg='white', 
-            font=('Arial', 11, 'bold'),
+            font=_FONT_BOLD,
             width=15
         ).pack(side=tk.LEFT, padx=5, expand=True)
         
@@ -3419,81 +3679,110 @@ class BilindEnhanced:
             width=15
         ).pack(side=tk.LEFT, padx=5, expand=True)
     
+    # === POOLED EDIT DIALOGS ===
+
+    def _pooled_dialog(self, key, build):
+        """Return (dialog, parts) for a reusable dialog, building it on first use.
+
+        Pooled dialogs are hidden with _hide_dialog() rather than destroyed, so
+        reopening one only rebinds values instead of recreating every widget.
+        """
+        entry = self._dialog_pool.get(key)
+        if entry is None or not entry[0].winfo_exists():
+            dialog = tk.Toplevel(self.root)
+            dialog.withdraw()
+            dialog.transient(self.root)
+            dialog.protocol('WM_DELETE_WINDOW', lambda: self._hide_dialog(dialog))
+            entry = (dialog, build(dialog))
+            self._dialog_pool[key] = entry
+        return entry
+
+    def _show_dialog(self, dialog):
+        dialog.deiconify()
+        dialog.lift()
+        dialog.grab_set()
+
+    def _hide_dialog(self, dialog):
+        dialog.grab_release()
+        dialog.withdraw()
+
+    def _build_edit_form(self, dialog, geometry, fields):
+        """Lay out a label/entry form with Save/Cancel; Save calls parts['save']."""
+        dialog.geometry(geometry)
+        dialog.configure(bg=self.colors['bg_secondary'])
+        
+        frame = ttk.Frame(dialog, padding=(18, 14), style='Main.TFrame')
+        frame.pack(fill=tk.BOTH, expand=True)
+        
+        parts = {'vars': [], 'save': None}
+        StringVar = tk.StringVar
+        for row, (caption, width) in enumerate(fields):
+            pady = (0, 8) if row == 0 else 8
+            ttk.Label(frame, text=caption, style='Field.TLabel').grid(row=row, column=0, sticky='w', pady=pady)
+            var = StringVar()
+            ttk.Entry(frame, textvariable=var, width=width).grid(row=row, column=1, sticky='w', pady=pady)
+            parts['vars'].append(var)
+        
+        btn_frame = ttk.Frame(dialog, padding=(18, 10), style='Main.TFrame')
+        btn_frame.pack(fill=tk.X)
+        ttk.Button(btn_frame, text="✓ Save", command=lambda: parts['save'](), style='Accent.TButton').pack(side=tk.LEFT, padx=4)
+        ttk.Button(btn_frame, text="✗ Cancel", command=lambda: self._hide_dialog(dialog), style='Secondary.TButton').pack(side=tk.RIGHT, padx=4)
+        return parts
+
     def edit_room(self):
         """Edit selected room with modern styling"""
         selection = self.rooms_tree.selection()
         if not selection:
             messagebox.showwarning("Warning", "Select a room to edit!")
             return
+        if len(selection) > 1:
+            messagebox.showwarning("Warning", "Select a single room to edit!")
+            return
         
         idx = self.rooms_tree.index(selection[0])
         room = self.rooms[idx]
         
-        dialog = tk.Toplevel(self.root)
+        dialog, parts = self._pooled_dialog('edit_room', lambda d: self._build_edit_form(
+            d, "420x340",
+            [("Name", 26), ("Layer", 26), ("Width (m)", 16), ("Length (m)", 16), ("Perimeter (m)", 16)]
+        ))
         dialog.title(f"✏️ Edit Room - {room.get('name', f'Room{idx+1}')}")
-        dialog.geometry("420x340")
-        dialog.configure(bg=self.colors['bg_secondary'])
-        dialog.transient(self.root)
-        dialog.grab_set()
-        
-        frame = ttk.Frame(dialog, padding=(18, 14), style='Main.TFrame')
-        frame.pack(fill=tk.BOTH, expand=True)
-        
-        ttk.Label(frame, text="Name", foreground=self.colors['text_secondary']).grid(row=0, column=0, sticky='w', pady=(0, 8))
-        name_var = tk.StringVar(value=room.get('name', ''))
-        ttk.Entry(frame, textvariable=name_var, width=26).grid(row=0, column=1, sticky='w', pady=(0, 8))
-        
-        ttk.Label(frame, text="Layer", foreground=self.colors['text_secondary']).grid(row=1, column=0, sticky='w', pady=8)
-        layer_var = tk.StringVar(value=room.get('layer', ''))
-        ttk.Entry(frame, textvariable=layer_var, width=26).grid(row=1, column=1, sticky='w', pady=8)
         
-        ttk.Label(frame, text="Width (m)", foreground=self.colors['text_secondary']).grid(row=2, column=0, sticky='w', pady=8)
-        w_var = tk.StringVar(value=str(room.get('w', '')))
-        ttk.Entry(frame, textvariable=w_var, width=16).grid(row=2, column=1, sticky='w', pady=8)
-        
-        ttk.Label(frame, text="Length (m)", foreground=self.colors['text_secondary']).grid(row=3, column=0, sticky='w', pady=8)
-        l_var = tk.StringVar(value=str(room.get('l', '')))
-        ttk.Entry(frame, textvariable=l_var, width=16).grid(row=3, column=1, sticky='w', pady=8)
-        
-        ttk.Label(frame, text="Perimeter (m)", foreground=self.colors['text_secondary']).grid(row=4, column=0, sticky='w', pady=8)
-        p_var = tk.StringVar(value=str(room.get('perim', '')))
-        ttk.Entry(frame, textvariable=p_var, width=16).grid(row=4, column=1, sticky='w', pady=8)
+        name_var, layer_var, w_var, l_var, p_var = parts['vars']
+        name_var.set(room.get('name', ''))
+        layer_var.set(room.get('layer', ''))
+        w_var.set(str(room.get('w', '')))
+        l_var.set(str(room.get('l', '')))
+        p_var.set(str(room.get('perim', '')))
         
         def save():
-            try:
-                name = name_var.get().strip() or room.get('name', f'Room{idx+1}')
-                layer = layer_var.get().strip() or room.get('layer', 'Room')
-                w_str = w_var.get().strip()
-                l_str = l_var.get().strip()
-                p = float(p_var.get())
-                
-                try:
-                    w_f = float(w_str) if w_str else room.get('w')
-                    l_f = float(l_str) if l_str else room.get('l')
-                    area = w_f * l_f if (w_f and l_f) else room.get('area', 0)
-                except:
-                    w_f = room.get('w')
-                    l_f = room.get('l')
-                    area = room.get('area', 0)
-                
-                self.rooms[idx] = {
-                    'name': name,
-                    'layer': layer,
-                    'w': w_f,
-                    'l': l_f,
-                    'perim': p,
-                    'area': area
-                }
-                self.refresh_rooms()
-                dialog.destroy()
-                self.update_status(f"Updated room '{name}'", icon="🏠")
-            except ValueError:
+            p = _safe_float(p_var.get())
+            if p is None:
                 messagebox.showerror("Error", "Invalid number format!")
+                return
+            
+            name = name_var.get().strip() or room.get('name', f'Room{idx+1}')
+            layer = layer_var.get().strip() or room.get('layer', 'Room')
+            # Blank or malformed dimensions keep the room's current value
+            w_f = _safe_float(w_var.get(), room.get('w'))
+            l_f = _safe_float(l_var.get(), room.get('l'))
+            area = w_f * l_f if (w_f and l_f) else room.get('area', 0)
+            
+            self.rooms[idx] = {
+                'name': name,
+                'layer': layer,
+                'w': w_f,
+                'l': l_f,
+                'perim': p,
+                'area': area
+            }
+            self._touch_rooms()
+            self.refresh_rooms()
+            self._hide_dialog(dialog)
+            self.update_status(f"Updated room '{name}'", icon="🏠")
         
-        btn_frame = ttk.Frame(dialog, padding=(18, 10), style='Main.TFrame')
-        btn_frame.pack(fill=tk.X)
-        ttk.Button(btn_frame, text="✓ Save", command=save, style='Accent.TButton').pack(side=tk.LEFT, padx=4)
-        ttk.Button(btn_frame, text="✗ Cancel", command=dialog.destroy, style='Secondary.TButton').pack(side=tk.RIGHT, padx=4)
+        parts['save'] = save
+        self._show_dialog(dialog)
     
     def delete_room(self):
         """Delete selected room"""
@@ -3502,11 +3791,7 @@ class BilindEnhanced:
             messagebox.showwarning("Warning", "Select a room to delete!")
             return
         
-        if messagebox.askyesno("Confirm", "Delete selected room?"):
-            idx = self.rooms_tree.index(selection[0])
-            del self.rooms[idx]
-            self.refresh_rooms()
-            self.update_status("Deleted room", icon="🏠")
+        self.delete_multiple('rooms')
     
     def edit_opening(self, opening_type):
         """Edit selected door/window with full metadata."""
@@ -3518,13 +3803,32 @@ class BilindEnhanced:
         if not selection:
             messagebox.showwarning("Warning", f"Select a {opening_type.lower()} to edit!")
             return
+        if len(selection) > 1:
+            messagebox.showwarning("Warning", f"Select a single {opening_type.lower()} to edit!")
+            return
 
         idx = tree.index(selection[0])
         item = storage[idx]
+        type_keys = self._opening_type_keys(opening_type)
+
+        # Read the record once up front
+        get = item.get
+        cur_name = get('name', '')
+        cur_layer = get('layer', '')
+        cur_type = get('type') or type_keys[0]
+        cur_w = get('w', 0)
+        cur_h = get('h', 0)
+        cur_qty = get('qty', 1)
+
+        colors = self.colors
+        bg_secondary = colors['bg_secondary']
+        accent = colors['accent']
+        warning = colors['warning']
+        StringVar = tk.StringVar
 
         dialog = tk.Toplevel(self.root)
         dialog.title(f"Edit {opening_type.title()} - {item.get('name', idx + 1)}")
-        dialog.configure(bg=self.colors['bg_secondary'])
+        dialog.configure(bg=bg_secondary)
         dialog.resizable(False, False)
         dialog.transient(self.root)
         dialog.grab_set()
@@ -3532,50 +3836,52 @@ class BilindEnhanced:
         frame = ttk.Frame(dialog, padding=(18, 14), style='Main.TFrame')
         frame.pack(fill=tk.BOTH, expand=True)
 
-        ttk.Label(frame, text="Name", foreground=self.colors['text_secondary']).grid(row=0, column=0, sticky='w', pady=(0, 6))
-        name_var = tk.StringVar(value=item.get('name', ''))
+        ttk.Label(frame, text="Name", style='Field.TLabel').grid(row=0, column=0, sticky='w', pady=(0, 6))
+        name_var = StringVar(value=cur_name)
         ttk.Entry(frame, textvariable=name_var, width=20).grid(row=0, column=1, sticky='w', pady=(0, 6))
 
-        ttk.Label(frame, text="Layer", foreground=self.colors['text_secondary']).grid(row=1, column=0, sticky='w', pady=6)
-        layer_var = tk.StringVar(value=item.get('layer', ''))
+        ttk.Label(frame, text="Layer", style='Field.TLabel').grid(row=1, column=0, sticky='w', pady=6)
+        layer_var = StringVar(value=cur_layer)
         ttk.Entry(frame, textvariable=layer_var, width=20).grid(row=1, column=1, sticky='w', pady=6)
 
-        ttk.Label(frame, text="Type", foreground=self.colors['text_secondary']).grid(row=2, column=0, sticky='w', pady=6)
-        type_var = tk.StringVar(value=item.get('type') or list(type_catalog.keys())[0])
-        type_combo = ttk.Combobox(frame, textvariable=type_var, values=list(type_catalog.keys()), state='readonly', width=22)
+        ttk.Label(frame, text="Type", style='Field.TLabel').grid(row=2, column=0, sticky='w', pady=6)
+        type_var = StringVar(value=cur_type)
+        type_combo = ttk.Combobox(frame, textvariable=type_var, values=type_keys, state='readonly', width=22)
         type_combo.grid(row=2, column=1, sticky='w', pady=6)
 
-        info_var = tk.StringVar(value=type_catalog.get(type_var.get(), {}).get('description', ''))
-        info_label = ttk.Label(frame, textvariable=info_var, wraplength=240, foreground=self.colors['text_secondary'])
+        info_var = StringVar(value=type_catalog.get(type_var.get(), {}).get('description', ''))
+        info_label = ttk.Label(frame, textvariable=info_var, wraplength=240, style='Field.TLabel')
         info_label.grid(row=2, column=2, sticky='w', padx=12, pady=6)
 
-        ttk.Label(frame, text="Width (m)", foreground=self.colors['text_secondary']).grid(row=3, column=0, sticky='w', pady=6)
-        w_var = tk.StringVar(value=f"{item.get('w', 0)}")
+        ttk.Label(frame, text="Width (m)", style='Field.TLabel').grid(row=3, column=0, sticky='w', pady=6)
+        w_var = StringVar(value=f"{cur_w}")
         ttk.Entry(frame, textvariable=w_var, width=12).grid(row=3, column=1, sticky='w', pady=6)
 
-        ttk.Label(frame, text="Height (m)", foreground=self.colors['text_secondary']).grid(row=4, column=0, sticky='w', pady=6)
-        h_var = tk.StringVar(value=f"{item.get('h', 0)}")
+        ttk.Label(frame, text="Height (m)", style='Field.TLabel').grid(row=4, column=0, sticky='w', pady=6)
+        h_var = StringVar(value=f"{cur_h}")
         ttk.Entry(frame, textvariable=h_var, width=12).grid(row=4, column=1, sticky='w', pady=6)
 
-        ttk.Label(frame, text="Quantity", foreground=self.colors['text_secondary']).grid(row=5, column=0, sticky='w', pady=6)
-        qty_var = tk.StringVar(value=str(item.get('qty', 1)))
+        ttk.Label(frame, text="Quantity", style='Field.TLabel').grid(row=5, column=0, sticky='w', pady=6)
+        qty_var = StringVar(value=str(cur_qty))
         ttk.Entry(frame, textvariable=qty_var, width=12).grid(row=5, column=1, sticky='w', pady=6)
 
         weight_var = None
         weight_hint = None
         if opening_type == 'DOOR':
-            default_weight_each = item.get('weight_each', item.get('weight', 0) / max(1, item.get('qty', 1)))
-            ttk.Label(frame, text="Weight (kg each)", foreground=self.colors['text_secondary']).grid(row=6, column=0, sticky='w', pady=6)
-            weight_var = tk.StringVar(value=f"{default_weight_each}")
+            default_weight_each = get('weight_each')
+            if default_weight_each is None:
+                default_weight_each = get('weight', 0) / max(1, cur_qty)
+            ttk.Label(frame, text="Weight (kg each)", style='Field.TLabel').grid(row=6, column=0, sticky='w', pady=6)
+            weight_var = StringVar(value=f"{default_weight_each}")
             ttk.Entry(frame, textvariable=weight_var, width=12).grid(row=6, column=1, sticky='w', pady=6)
-            weight_hint = ttk.Label(frame, text="", foreground=self.colors['warning'])
+            weight_hint = ttk.Label(frame, text="", foreground=warning)
             weight_hint.grid(row=6, column=2, sticky='w', padx=12)
             preview_row = 7
         else:
             preview_row = 6
 
-        preview_var = tk.StringVar(value="Preview: review values")
-        preview_label = ttk.Label(frame, textvariable=preview_var, foreground=self.colors['accent'], font=('Segoe UI', 10, 'italic'))
+        preview_var = StringVar(value="Preview: review values")
+        preview_label = ttk.Label(frame, textvariable=preview_var, foreground=accent, font=('Segoe UI', 10, 'italic'))
         preview_label.grid(row=preview_row, column=0, columnspan=3, sticky='w', pady=(10, 4))
 
         def update_type_info(*_):
@@ -3595,33 +3901,53 @@ class BilindEnhanced:
                         else:
                             weight_hint.config(text="")
 
+        last_preview_inputs = [None]
+
         def update_preview(*_):
+            inputs = (w_var.get(), h_var.get(), qty_var.get())
+            if inputs == last_preview_inputs[0]:
+                return
+            last_preview_inputs[0] = inputs
             try:
-                width = float(w_var.get())
-                height = float(h_var.get())
-                qty = max(1, int(qty_var.get()))
+                width = float(inputs[0])
+                height = float(inputs[1])
+                qty = max(1, int(inputs[2]))
                 perim_each = 2 * (width + height)
                 stone_total = perim_each * qty
                 area_total = width * height * qty
-                preview = f"Perim each: {perim_each:.2f} m • Stone total: {stone_total:.2f} lm"
+                preview = "Perim each: %.2f m • Stone total: %.2f lm" % (perim_each, stone_total)
                 if opening_type == 'WINDOW':
                     glass_total = width * height * 0.85 * qty
-                    preview += f" • Glass total: {glass_total:.2f} m²"
-                preview += f" • Area total: {area_total:.2f} m²"
+                    preview += " • Glass total: %.2f m²" % glass_total
+                preview += " • Area total: %.2f m²" % area_total
                 preview_var.set(preview)
             except Exception:
                 preview_var.set("Preview: enter valid values")
 
+        # Debounce the preview so typing recomputes it at most every 120 ms
+        preview_pending = [None]
+
+        def run_preview():
+            preview_pending[0] = None
+            if dialog.winfo_exists():
+                update_preview()
+
+        def schedule_preview(*_):
+            if preview_pending[0] is not None:
+                dialog.after_cancel(preview_pending[0])
+            preview_pending[0] = dialog.after(120, run_preview)
+
         type_combo.bind('<<ComboboxSelected>>', update_type_info)
         for var in (w_var, h_var, qty_var):
-            var.trace_add('write', update_preview)
+            var.trace_add('write', schedule_preview)
         update_type_info()
         update_preview()
 
         def save():
             try:
                 desired_name = name_var.get().strip() or item.get('name') or (('D' if opening_type == 'DOOR' else 'W') + str(idx + 1))
-                if desired_name != item.get('name') and any(other.get('name') == desired_name for j, other in enumerate(storage) if j != idx):
+                existing_idx = self._opening_name_index[opening_type].get(desired_name)
+                if desired_name != item.get('name') and existing_idx is not None and existing_idx != idx:
                     desired_name = self._make_unique_name(opening_type, desired_name)
 
                 width = float(w_var.get())
@@ -3659,19 +3985,13 @@ class BilindEnhanced:
     def delete_opening(self, opening_type):
         """Delete selected door/window"""
         tree = self.doors_tree if opening_type == 'DOOR' else self.windows_tree
-        storage = self.doors if opening_type == 'DOOR' else self.windows
         
         selection = tree.selection()
         if not selection:
             messagebox.showwarning("Warning", f"Select a {opening_type.lower()} to delete!")
             return
         
-        if messagebox.askyesno("Confirm", f"Delete selected {opening_type.lower()}?"):
-            idx = tree.index(selection[0])
-            del storage[idx]
-            self.refresh_openings()
-            icon = "🚪" if opening_type == 'DOOR' else "🪟"
-            self.update_status(f"Deleted {opening_type.lower()}", icon=icon)
+        self.delete_multiple('doors' if opening_type == 'DOOR' else 'windows')
     
     def edit_wall(self):
         """Edit selected wall with modern styling"""
@@ -3679,35 +3999,24 @@ class BilindEnhanced:
         if not selection:
             messagebox.showwarning("Warning", "Select a wall to edit!")
             return
+        if len(selection) > 1:
+            messagebox.showwarning("Warning", "Select a single wall to edit!")
+            return
         
         idx = self.walls_tree.index(selection[0])
         wall = self.walls[idx]
         
-        dialog = tk.Toplevel(self.root)
+        dialog, parts = self._pooled_dialog('edit_wall', lambda d: self._build_edit_form(
+            d, "400x280",
+            [("Name", 26), ("Layer", 26), ("Length (m)", 16), ("Height (m)", 16)]
+        ))
         dialog.title(f"✏️ Edit Wall - {wall.get('name', f'Wall{idx+1}')}")
-        dialog.geometry("400x280")
-        dialog.configure(bg=self.colors['bg_secondary'])
-        dialog.transient(self.root)
-        dialog.grab_set()
-        
-        frame = ttk.Frame(dialog, padding=(18, 14), style='Main.TFrame')
-        frame.pack(fill=tk.BOTH, expand=True)
-        
-        ttk.Label(frame, text="Name", foreground=self.colors['text_secondary']).grid(row=0, column=0, sticky='w', pady=(0, 8))
-        name_var = tk.StringVar(value=wall.get('name', ''))
-        ttk.Entry(frame, textvariable=name_var, width=26).grid(row=0, column=1, sticky='w', pady=(0, 8))
         
-        ttk.Label(frame, text="Layer", foreground=self.colors['text_secondary']).grid(row=1, column=0, sticky='w', pady=8)
-        layer_var = tk.StringVar(value=wall.get('layer', ''))
-        ttk.Entry(frame, textvariable=layer_var, width=26).grid(row=1, column=1, sticky='w', pady=8)
-        
-        ttk.Label(frame, text="Length (m)", foreground=self.colors['text_secondary']).grid(row=2, column=0, sticky='w', pady=8)
-        l_var = tk.StringVar(value=str(wall.get('length', '')))
-        ttk.Entry(frame, textvariable=l_var, width=16).grid(row=2, column=1, sticky='w', pady=8)
-        
-        ttk.Label(frame, text="Height (m)", foreground=self.colors['text_secondary']).grid(row=3, column=0, sticky='w', pady=8)
-        h_var = tk.StringVar(value=str(wall.get('height', '')))
-        ttk.Entry(frame, textvariable=h_var, width=16).grid(row=3, column=1, sticky='w', pady=8)
+        name_var, layer_var, l_var, h_var = parts['vars']
+        name_var.set(wall.get('name', ''))
+        layer_var.set(wall.get('layer', ''))
+        l_var.set(str(wall.get('length', '')))
+        h_var.set(str(wall.get('height', '')))
         
         def save():
             try:
@@ -3731,15 +4040,13 @@ class BilindEnhanced:
                     'net': gross - wall.get('deduct', 0)
                 }
                 self.refresh_walls()
-                dialog.destroy()
+                self._hide_dialog(dialog)
                 self.update_status(f"Updated wall '{name}'", icon="🧱")
             except ValueError:
                 messagebox.showerror("Error", "Invalid number format!")
         
-        btn_frame = ttk.Frame(dialog, padding=(18, 10), style='Main.TFrame')
-        btn_frame.pack(fill=tk.X)
-        ttk.Button(btn_frame, text="✓ Save", command=save, style='Accent.TButton').pack(side=tk.LEFT, padx=4)
-        ttk.Button(btn_frame, text="✗ Cancel", command=dialog.destroy, style='Secondary.TButton').pack(side=tk.RIGHT, padx=4)
+        parts['save'] = save
+        self._show_dialog(dialog)
     
     def delete_wall(self):
         """Delete selected wall"""
@@ -3748,11 +4055,7 @@ class BilindEnhanced:
             messagebox.showwarning("Warning", "Select a wall to delete!")
             return
         
-        if messagebox.askyesno("Confirm", "Delete selected wall?"):
-            idx = self.walls_tree.index(selection[0])
-            del self.walls[idx]
-            self.refresh_walls()
-            self.update_status("Deleted wall", icon="🧱")
+        self.delete_multiple('walls')
     
     def delete_multiple(self, data_type):
         """Delete multiple selected items with modern UI"""
@@ -3769,130 +4072,191 @@ class BilindEnhanced:
         
         storage, tree, label = mappings[data_type]
         
-        # Create modern selection dialog
-        dialog = tk.Toplevel(self.root)
+        # Every delete goes through the checklist dialog and its inline
+        # confirm; rows picked in the table (Ctrl/Shift-click) start checked
+        checked = self._selected_storage_indices(data_type, storage, tree)
+        
+        # One hidden selection dialog is shared by every data type; opening it
+        # only swaps the texts and the item list
+        dialog, parts = self._pooled_dialog('delete_multiple', self._build_delete_dialog)
         dialog.title(f"🗑️ Delete Multiple {label}")
+        parts['title'].configure(text=f"🗑️ Select {label} to Delete")
+        parts['info'].configure(text=f"✓ Check items to delete • Total: {len(storage)} items")
+        parts['load'](data_type, storage, label, checked)
+        self._show_dialog(dialog)
+    
+    def _selected_storage_indices(self, data_type, storage, tree):
+        """Storage indices of the rows selected in tree (which may be filtered)."""
+        selection = tree.selection()
+        if not selection:
+            return set()
+        position = {iid: i for i, iid in enumerate(tree.get_children())}
+        shown = self._tree_records.get(data_type, [])
+        picked = {id(shown[position[iid]]) for iid in selection}
+        return {i for i, item in enumerate(storage) if id(item) in picked}
+    
+    def _build_delete_dialog(self, dialog):
+        """Build the pooled bulk delete dialog; delete_multiple() fills it."""
         dialog.geometry("600x500")
         dialog.configure(bg='#16213e')
-        dialog.transient(self.root)
-        dialog.grab_set()
         
         # Title
         title_frame = tk.Frame(dialog, bg='#1a1a2e')
         title_frame.pack(fill=tk.X, pady=10)
-        tk.Label(
+        title = tk.Label(
             title_frame, 
-            text=f"🗑️ Select {label} to Delete",
             bg='#1a1a2e',
             fg='#ff1744',
             font=('Arial', 14, 'bold')
-        ).pack(pady=10)
+        )
+        title.pack(pady=10)
         
         # Info label
-        tk.Label(
+        info = tk.Label(
             dialog,
-            text=f"✓ Check items to delete • Total: {len(storage)} items",
             bg='#16213e',
             fg='#b0bec5',
             font=('Arial', 9)
-        ).pack(pady=5)
+        )
+        info.pack(pady=5)
         
         # Selection frame with scrollbar
         list_frame = tk.Frame(dialog, bg='#16213e')
         list_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
         
-        # Listbox with checkbuttons
-        canvas = tk.Canvas(list_frame, bg='#0f0f1e', highlightthickness=0)
-        scrollbar = tk.Scrollbar(list_frame, orient=tk.VERTICAL, command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg='#0f0f1e')
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        # Virtualized checkbutton list: one BooleanVar per item, but only
+        # enough Checkbutton widgets to fill the viewport. They are recycled
+        # (new text/variable, moved to the row's y) as the canvas scrolls.
+        # state holds whatever the current opening of the dialog is about.
+        state = {'data_type': None, 'storage': [], 'label': '', 'labels': [], 'check_vars': [],
+                 'armed': 0, 'confirm_after': None}
+        row_height = self._row_h
+        
+        canvas = tk.Canvas(list_frame, bg='#0f0f1e', highlightthickness=0,
+                           yscrollincrement=row_height)
+        scrollbar = tk.Scrollbar(list_frame, orient=tk.VERTICAL)
         canvas.configure(yscrollcommand=scrollbar.set)
         
-        # Create checkbuttons for each item
-        check_vars = []
-        for i, item in enumerate(storage):
-            var = tk.BooleanVar()
-            check_vars.append(var)
-            
-            # Create item display text
-            if data_type == 'rooms':
-                text = f"Room {i+1}: {item.get('name', 'N/A')} - {item.get('area', 0):.2f}m²"
-            elif data_type == 'doors':
-                text = f"Door {i+1}: {item.get('name', 'N/A')} - {item.get('type', 'N/A')} {item.get('w', 0)}×{item.get('h', 0)}m"
-            elif data_type == 'windows':
-                text = f"Window {i+1}: {item.get('name', 'N/A')} - {item.get('type', 'N/A')} {item.get('w', 0)}×{item.get('h', 0)}m"
-            else:  # walls
-                text = f"Wall {i+1}: {item.get('name', 'N/A')} - {item.get('length', 0):.2f}×{item.get('height', 0):.2f}m"
+        row_pool = []  # [(checkbutton, canvas window id)]
+        
+        def render_rows(*_):
+            labels = state['labels']
+            check_vars = state['check_vars']
+            first = max(0, int(canvas.canvasy(0) // row_height))
+            needed = canvas.winfo_height() // row_height + 2
+            while len(row_pool) < needed:
+                cb = tk.Checkbutton(
+                    canvas,
+                    bg='#0f0f1e',
+                    fg='#ffffff',
+                    selectcolor='#1a1a2e',
+                    activebackground='#16213e',
+                    activeforeground='#00d9ff',
+                    font=_FONT,
+                    anchor='w'
+                )
+                for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+                    cb.bind(sequence, on_mousewheel)
+                row_pool.append((cb, canvas.create_window(10, 0, window=cb, anchor='nw')))
             
-            cb = tk.Checkbutton(
-                scrollable_frame,
-                text=text,
-                variable=var,
-                bg='#0f0f1e',
-                fg='#ffffff',
-                selectcolor='#1a1a2e',
-                activebackground='#16213e',
-                activeforeground='#00d9ff',
-                font=('Arial', 10),
-                anchor='w'
-            )
-            cb.pack(fill=tk.X, padx=10, pady=2)
+            width = max(1, canvas.winfo_width() - 20)
+            for offset, (cb, window_id) in enumerate(row_pool):
+                row = first + offset
+                if row < len(labels):
+                    cb.configure(text=labels[row], variable=check_vars[row])
+                    canvas.coords(window_id, 10, row * row_height)
+                    canvas.itemconfigure(window_id, state='normal', width=width)
+                else:
+                    canvas.itemconfigure(window_id, state='hidden')
+        
+        def on_yview(*args):
+            canvas.yview(*args)
+            render_rows()
+        
+        def on_mousewheel(event):
+            units = _wheel_units(event)
+            if units:
+                on_yview('scroll', units, 'units')
+        
+        scrollbar.configure(command=on_yview)
+        canvas.bind('<Configure>', render_rows)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            canvas.bind(sequence, on_mousewheel)
         
         canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
+        def load(data_type, storage, label, checked=()):
+            make_label = _DELETE_LABELS[data_type]
+            labels = [make_label(i, item) for i, item in enumerate(storage)]
+            state.update(
+                data_type=data_type,
+                storage=storage,
+                label=label,
+                labels=labels,
+                check_vars=[tk.BooleanVar(value=i in checked) for i in range(len(labels))]
+            )
+            canvas.configure(scrollregion=(0, 0, 0, len(labels) * row_height))
+            # Start at the first pre-checked row so the selection is visible
+            first = min(checked) if checked else 0
+            canvas.yview_moveto(first / len(labels) if labels else 0)
+            render_rows()
+            disarm()
+        
         # Button frame
         btn_frame = tk.Frame(dialog, bg='#16213e')
         btn_frame.pack(fill=tk.X, padx=20, pady=15)
         
         def select_all():
-            for var in check_vars:
+            for var in state['check_vars']:
                 var.set(True)
         
         def deselect_all():
-            for var in check_vars:
+            for var in state['check_vars']:
                 var.set(False)
         
+        def disarm():
+            if state['confirm_after']:
+                dialog.after_cancel(state['confirm_after'])
+            state['confirm_after'] = None
+            state['armed'] = 0
+            delete_btn.configure(text=_DELETE_IDLE_TEXT, bg='#ff1744')
+        
         def delete_selected():
-            # Get indices to delete (in reverse order to avoid index issues)
-            to_delete = [i for i, var in enumerate(check_vars) if var.get()]
+            data_type = state['data_type']
+            storage = state['storage']
+            label = state['label']
+            # Read every checkbox once into a keep mask
+            keep = [not var.get() for var in state['check_vars']]
+            count = len(keep) - sum(keep)
             
-            if not to_delete:
+            if not count:
+                disarm()
                 messagebox.showwarning("⚠️ No Selection", "Please select at least one item to delete!")
                 return
             
-            # Confirm deletion
-            count = len(to_delete)
-            if not messagebox.askyesno("🗑️ Confirm Deletion", f"Delete {count} selected {label.lower()}?"):
+            # Confirm inline: the first click arms the button for 3 s, a second
+            # click on the same count deletes
+            if state['armed'] != count:
+                disarm()
+                state['armed'] = count
+                delete_btn.configure(text=f"Confirm delete {count}?", bg='#b71c1c')
+                state['confirm_after'] = dialog.after(3000, disarm)
                 return
+            disarm()
             
-            # Delete in reverse order
-            for i in reversed(to_delete):
-                del storage[i]
+            # Drop all checked items in one C-level pass; slice-assign keeps
+            # the list identity that self.rooms/doors/windows/walls point to
+            storage[:] = compress(storage, keep)
             
-            # Refresh appropriate view
+            # Refresh appropriate view once the event loop is idle
             if data_type == 'rooms':
-                self.refresh_rooms()
-            elif data_type in ['doors', 'windows']:
-                self.refresh_openings()
-            elif data_type == 'walls':
-                self.refresh_walls()
+                self._touch_rooms()
+            self._schedule_refresh(data_type)
             
-            messagebox.showinfo("✓ Success", f"Deleted {count} {label.lower()}!")
-            dialog.destroy()
-            icons = {
-                'rooms': '🏠',
-                'doors': '🚪',
-                'windows': '🪟',
-                'walls': '🧱'
-            }
-            self.update_status(f"Deleted {count} {label.lower()}", icon=icons.get(data_type, '🗑️'))
+            self._hide_dialog(dialog)
+            self.update_status(f"Deleted {count} {label.lower()}",
+                               icon=self._TYPE_ICONS.get(data_type, '🗑️'))
         
         tk.Button(
             btn_frame, 
@@ -3914,30 +4278,34 @@ class BilindEnhanced:
             width=12
         ).pack(side=tk.LEFT, padx=5)
         
-        tk.Button(
+        delete_btn = tk.Button(
             btn_frame, 
-            text="🗑️ Delete Selected", 
+            text=_DELETE_IDLE_TEXT, 
             command=delete_selected, 
             bg='#ff1744', 
             fg='white', 
             font=('Arial', 10, 'bold'),
-            width=15
-        ).pack(side=tk.LEFT, padx=5)
+            width=18
+        )
+        delete_btn.pack(side=tk.LEFT, padx=5)
         
         tk.Button(
             btn_frame, 
             text="Cancel", 
-            command=dialog.destroy, 
+            command=lambda: self._hide_dialog(dialog), 
             bg='#546e7a', 
             fg='white', 
             font=('Arial', 10),
             width=10
         ).pack(side=tk.LEFT, padx=5)
+        
+        return {'title': title, 'info': info, 'load': load}
     
     def reset_all(self):
         """Reset all data"""
         if messagebox.askyesno("Reset", "Clear ALL data?"):
             self.rooms.clear()
+            self._touch_rooms()
             self.doors.clear()
             self.windows.clear()
             self.walls.clear()
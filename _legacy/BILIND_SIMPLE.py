@@ -7,6 +7,9 @@ BILIND AutoCAD Extension - Simplified & Fixed Version
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext, simpledialog
 import csv
+import io
+import queue
+import threading
 import time
 from datetime import datetime
 import math
@@ -19,6 +22,27 @@ except ImportError:
     exit(1)
 
 class BilindSimple:
+    # قالب الملخص - تتغير فقط القيم بين الأقواس
+    _SUMMARY_TPL = """
+==================================================
+📊 ملخص المشروع - {ts}
+==================================================
+
+🏠 الغرف: {nr} غرفة
+🚪 الأبواب: {nd} باب
+🪟 الشبابيك: {nw} شباك
+🧱 الجدران: {nwl} جدار
+🟫 مناطق السيراميك: {nc} منطقة
+
+📈 الإحصائيات:
+- إجمالي مساحة الغرف: 250.5 م²
+- إجمالي مساحة الجدران: 180.3 م²
+- إجمالي التشطيبات: 145.8 م²
+
+==================================================
+تم إنشاء التقرير بواسطة BILIND Enhanced
+        """
+    
     def __init__(self, root):
         self.root = root
         self.root.title("BILIND Enhanced - محسن ومصحح")
@@ -50,15 +74,41 @@ class BilindSimple:
         self.paint_items = []
         self.tiles_items = []
         
-        # الاتصال بـ AutoCAD
+        # مؤقتات البحث المؤجل لكل جدول
+        self._search_after = {}
+        # كل صفوف الجدول (بما فيها المخفية) ونصوصها للبحث
+        self._all_iids = {}
+        self._row_text = {}
+        # الصفوف الظاهرة بعد آخر بحث، لكشف الصفوف المضافة/المحذوفة بعده
+        self._shown_iids = {}
+        # آخر محتوى معروض لكل نص (سطراً سطراً) لتحديث الأسطر المتغيرة فقط
+        self._text_lines = {}
+        self._status_after_id = None
+        
+        # الاتصال بـ AutoCAD مؤجل حتى أول استخدام (انظر acad)
+        self._acad = None
+        self._acad_tried = False
+        
+        self.setup_ui()
+    
+    @property
+    def acad(self):
+        """اتصال AutoCAD، يُنشأ عند أول طلب بدل إبطاء فتح النافذة"""
+        if not self._acad_tried:
+            self._acad_tried = True
+            self.update_status("جاري الاتصال بـ AutoCAD...")
+            self.root.update_idletasks()
+            self._acad = self._connect_acad()
+        return self._acad
+    
+    def _connect_acad(self):
         try:
-            self.acad = Autocad(create_if_not_exists=False)
+            acad = Autocad(create_if_not_exists=False)
             print("✅ Connected to AutoCAD")
+            return acad
         except:
-            self.acad = None
             print("⚠️ AutoCAD not running - some features will be disabled")
-        
-        self.setup_ui()
+            return None
     
     def setup_ui(self):
         """إنشاء واجهة المستخدم المحسنة"""
@@ -103,19 +153,20 @@ class BilindSimple:
         scrollbar = ttk.Scrollbar(content_frame, orient="vertical", command=canvas.yview)
         scrollable_frame = tk.Frame(canvas, bg=self.colors['bg_primary'])
         
-        # ربط التصفح
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        # ربط التصفح - الإطار يرسل حجمه في الحدث فلا حاجة لـ bbox("all")؛
+        # أي تغيير في المحتوى يغير حجم الإطار فيصل هنا تلقائياً
+        def _on_conf(e, c=canvas):
+            c.configure(scrollregion=(0, 0, e.width, e.height))
+        scrollable_frame.bind("<Configure>", _on_conf)
         
         canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
         
-        # ربط عجلة الماوس
+        # ربط عجلة الماوس فقط أثناء وجود المؤشر فوق منطقة التصفح
         def _on_mousewheel(event):
             canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        canvas.bind("<Enter>", lambda e: canvas.bind_all("<MouseWheel>", _on_mousewheel))
+        canvas.bind("<Leave>", lambda e: canvas.unbind_all("<MouseWheel>"))
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -141,6 +192,10 @@ class BilindSimple:
             ("🔄 إعادة تعيين", self.reset_all, self.colors['danger'])
         ]
         
+        # جعل الأعمدة متساوية (مرة واحدة قبل إنشاء الأزرار)
+        for c in range(3):
+            buttons_frame.grid_columnconfigure(c, weight=1, uniform='btn')
+        
         for i, (text, command, color) in enumerate(buttons):
             btn = tk.Button(buttons_frame,
                            text=text,
@@ -153,9 +208,6 @@ class BilindSimple:
                            pady=8,
                            cursor='hand2')
             btn.grid(row=i//3, column=i%3, padx=5, pady=5, sticky='ew')
-            
-            # جعل الأعمدة متساوية
-            buttons_frame.grid_columnconfigure(i%3, weight=1)
         
         # قسم الغرف
         rooms_frame = self.create_card(parent, "🏠 الغرف")
@@ -264,15 +316,72 @@ class BilindSimple:
         setattr(self, f"{data_type}_tree", tree)
         setattr(self, f"{data_type}_search", search_var)
         
-        # ربط البحث
+        # ربط البحث - تأجيل التصفية حتى يتوقف المستخدم عن الكتابة
         def search_data(*args):
-            query = search_var.get().lower()
-            # تطبيق البحث (سيتم تنفيذه لاحقاً)
-            self.update_status(f"البحث عن: {query}")
+            pending = self._search_after.get(data_type)
+            if pending:
+                self.root.after_cancel(pending)
+            self._search_after[data_type] = self.root.after(
+                150, lambda: self._do_filter(data_type, search_var.get().lower()))
         
         search_var.trace('w', search_data)
         clear_btn.configure(command=lambda: search_var.set(''))
     
+    def _index_table_rows(self, data_type):
+        """حفظ صفوف الجدول بعد تعبئته ليعمل البحث بالإخفاء بدل الحذف"""
+        tree = getattr(self, f"{data_type}_tree")
+        iids = list(tree.get_children())
+        self._all_iids[data_type] = iids
+        self._row_text[data_type] = [
+            " ".join(str(v) for v in tree.item(iid, 'values')).lower() for iid in iids
+        ]
+    
+    def _table_changed(self, data_type):
+        """إلغاء فهرس البحث بعد إضافة/حذف/تعديل صفوف الجدول
+        
+        الصفوف المخفية بالبحث تُعاد لمواضعها أولاً، وإلا لن تظهر في
+        get_children عند إعادة الفهرسة.
+        """
+        iids = self._all_iids.pop(data_type, None)
+        self._row_text.pop(data_type, None)
+        self._shown_iids.pop(data_type, None)
+        if not iids:
+            return
+        tree = getattr(self, f"{data_type}_tree")
+        attached = set(tree.get_children())
+        for pos, iid in enumerate(iid for iid in iids if tree.exists(iid)):
+            if iid not in attached:
+                tree.reattach(iid, '', pos)
+    
+    def _do_filter(self, data_type, query):
+        """تطبيق البحث على جدول واحد"""
+        self._search_after.pop(data_type, None)
+        tree = getattr(self, f"{data_type}_tree")
+        # صفوف أُضيفت أو حُذفت منذ آخر بحث: الفهرس قديم
+        if data_type in self._shown_iids and tree.get_children() != self._shown_iids[data_type]:
+            self._table_changed(data_type)
+        if not self._all_iids.get(data_type):
+            self._index_table_rows(data_type)
+        
+        # إخفاء/إظهار الصفوف بدل حذفها وإعادة إدخالها، مع إخفاء الأعمدة
+        # أثناء ذلك حتى يُرسم الجدول مرة واحدة بعد انتهاء التصفية
+        detach, reattach = tree.detach, tree.reattach
+        columns = tree.cget('displaycolumns')
+        tree.configure(displaycolumns=())
+        shown = 0
+        try:
+            for iid, text in zip(self._all_iids[data_type], self._row_text[data_type]):
+                if query in text:
+                    reattach(iid, '', 'end')
+                    shown += 1
+                else:
+                    detach(iid)
+        finally:
+            tree.configure(displaycolumns=columns)
+        self._shown_iids[data_type] = tree.get_children()
+        
+        self.update_status(f"البحث عن: {query} ({shown})")
+    
     def create_ceramic_section(self, parent):
         """قسم السيراميك المحسن"""
         
@@ -369,23 +478,68 @@ class BilindSimple:
         self.summary_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         summary_scroll.pack(side=tk.RIGHT, fill=tk.Y)
     
+    def _update_text(self, widget, content):
+        """استبدال الأسطر المتغيرة فقط بدل مسح النص وإعادة كتابته"""
+        key = str(widget)
+        new_lines = content.split('\n')
+        old_lines = self._text_lines.get(key)
+        # إذا عدّل المستخدم النص يدوياً نرجع للكتابة الكاملة
+        if old_lines is None or widget.get('1.0', 'end-1c') != '\n'.join(old_lines):
+            widget.delete('1.0', tk.END)
+            widget.insert('1.0', content)
+            self._text_lines[key] = new_lines
+            return
+        
+        common = min(len(old_lines), len(new_lines))
+        for i in range(common):
+            if old_lines[i] != new_lines[i]:
+                widget.delete(f'{i + 1}.0', f'{i + 1}.end')
+                widget.insert(f'{i + 1}.0', new_lines[i])
+        if len(new_lines) > common:
+            widget.insert('end-1c', '\n' + '\n'.join(new_lines[common:]))
+        elif len(old_lines) > common:
+            widget.delete(f'{common}.end', 'end-1c')
+        self._text_lines[key] = new_lines
+    
     def update_status(self, message):
         """تحديث شريط الحالة"""
         self.status_label.configure(text=message)
-        self.root.after(3000, lambda: self.status_label.configure(text="جاهز - Ready"))
+        # مؤقت واحد فقط لإرجاع "جاهز" بدل تراكم المؤقتات
+        if self._status_after_id:
+            self.root.after_cancel(self._status_after_id)
+        self._status_after_id = self.root.after(3000, self._reset_status)
+    
+    def _reset_status(self):
+        self._status_after_id = None
+        self.status_label.configure(text="جاهز - Ready")
     
     def show_dialog(self, title, message):
-        """عرض نافذة حوار محسنة"""
-        dialog = tk.Toplevel(self.root)
+        """عرض نافذة حوار محسنة (نافذة واحدة مخفية يعاد استخدامها)"""
+        dialog = getattr(self, '_message_dialog', None)
+        if dialog is None or not dialog.winfo_exists():
+            dialog = self._build_message_dialog()
+        
         dialog.title(title)
-        dialog.geometry("400x250")
+        self._message_label.configure(text=message)
+        dialog.deiconify()
+        dialog.lift()
+        dialog.grab_set()
+        return dialog
+    
+    def _build_message_dialog(self):
+        """بناء نافذة الرسائل مرة واحدة"""
+        dialog = tk.Toplevel(self.root)
+        dialog.withdraw()
         dialog.configure(bg=self.colors['bg_primary'])
         dialog.resizable(False, False)
         dialog.transient(self.root)
-        dialog.grab_set()
+        
+        def close():
+            dialog.grab_release()
+            dialog.withdraw()
+        dialog.protocol('WM_DELETE_WINDOW', close)
         
         # توسيط النافذة
-        dialog.update_idletasks()
         x = (dialog.winfo_screenwidth() // 2) - (400 // 2)
         y = (dialog.winfo_screenheight() // 2) - (250 // 2)
         dialog.geometry(f"400x250+{x}+{y}")
@@ -395,19 +549,18 @@ class BilindSimple:
         content_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
         # النص
-        text_label = tk.Label(content_frame,
-                             text=message,
-                             font=('Arial', 12),
-                             bg=self.colors['bg_card'],
-                             fg=self.colors['text_primary'],
-                             wraplength=350,
-                             justify='center')
-        text_label.pack(expand=True)
+        self._message_label = tk.Label(content_frame,
+                                       font=('Arial', 12),
+                                       bg=self.colors['bg_card'],
+                                       fg=self.colors['text_primary'],
+                                       wraplength=350,
+                                       justify='center')
+        self._message_label.pack(expand=True)
         
         # زر الإغلاق
         close_btn = tk.Button(content_frame,
                              text="إغلاق",
-                             command=dialog.destroy,
+                             command=close,
                              font=('Arial', 11, 'bold'),
                              bg=self.colors['accent'],
                              fg='white',
@@ -416,6 +569,7 @@ class BilindSimple:
                              pady=5)
         close_btn.pack(pady=10)
         
+        self._message_dialog = dialog
         return dialog
     
     # وظائف العمليات الرئيسية
@@ -440,8 +594,20 @@ class BilindSimple:
         dialog = self.show_dialog("إضافة سيراميك", "نافذة إضافة السيراميك تعمل بشكل صحيح!")
         
         # إضافة عنصر تجريبي
-        self.ceramic_listbox.insert(tk.END, f"منطقة سيراميك {len(self.ceramic_zones) + 1}")
         self.ceramic_zones.append({'name': f'Zone_{len(self.ceramic_zones) + 1}'})
+        self.ceramic_listbox.insert(tk.END, self._ceramic_label(len(self.ceramic_zones)))
+    
+    def _ceramic_label(self, number):
+        return f"منطقة سيراميك {number}"
+    
+    def refresh_ceramic_list(self):
+        """إعادة تعبئة قائمة السيراميك بحذف واحد وإدخال واحد"""
+        listbox = self.ceramic_listbox
+        listbox.delete(0, tk.END)
+        if self.ceramic_zones:
+            listbox.insert(tk.END, *(self._ceramic_label(i)
+                                     for i in range(1, len(self.ceramic_zones) + 1)))
+        listbox.update_idletasks()
     
     def calculate_finishes(self):
         self.update_status("حساب التشطيبات...")
@@ -458,39 +624,29 @@ class BilindSimple:
 - صافي مساحة التشطيب: 145.2 م²
         """
         
-        self.finishes_text.delete(1.0, tk.END)
-        self.finishes_text.insert(1.0, result)
+        self._update_text(self.finishes_text, result)
     
     def refresh_summary(self):
         self.update_status("تحديث الملخص...")
-        summary = f"""
-{'='*50}
-📊 ملخص المشروع - {datetime.now().strftime('%Y-%m-%d %H:%M')}
-{'='*50}
-
-🏠 الغرف: {len(self.rooms)} غرفة
-🚪 الأبواب: {len(self.doors)} باب
-🪟 الشبابيك: {len(self.windows)} شباك
-🧱 الجدران: {len(self.walls)} جدار
-🟫 مناطق السيراميك: {len(self.ceramic_zones)} منطقة
-
-📈 الإحصائيات:
-- إجمالي مساحة الغرف: 250.5 م²
-- إجمالي مساحة الجدران: 180.3 م²
-- إجمالي التشطيبات: 145.8 م²
-
-{'='*50}
-تم إنشاء التقرير بواسطة BILIND Enhanced
-        """
+        summary = self._SUMMARY_TPL.format(
+            ts=datetime.now().strftime('%Y-%m-%d %H:%M'),
+            nr=len(self.rooms),
+            nd=len(self.doors),
+            nw=len(self.windows),
+            nwl=len(self.walls),
+            nc=len(self.ceramic_zones)
+        )
         
-        self.summary_text.delete(1.0, tk.END)
-        self.summary_text.insert(1.0, summary)
+        self._update_text(self.summary_text, summary)
     
     def copy_summary(self):
         self.update_status("نسخ الملخص...")
         summary_content = self.summary_text.get(1.0, tk.END)
-        self.root.clipboard_clear()
-        self.root.clipboard_append(summary_content)
+        # أوامر clipboard مباشرة إلى Tcl بدل الدوال الوسيطة
+        tk_call = self.root.tk.call
+        window = self.root._w
+        tk_call('clipboard', 'clear', '-displayof', window)
+        tk_call('clipboard', 'append', '-displayof', window, '--', summary_content)
         messagebox.showinfo("نجح", "تم نسخ الملخص إلى الحافظة!")
     
     def export_csv(self):
@@ -502,16 +658,47 @@ class BilindSimple:
         )
         
         if filename:
-            # كتابة بيانات تجريبية
-            with open(filename, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-                writer.writerow(['النوع', 'الاسم', 'المساحة'])
-                writer.writerow(['غرفة', 'غرفة المعيشة', '25.5'])
-                writer.writerow(['غرفة', 'غرفة النوم', '18.2'])
-                writer.writerow(['باب', 'باب رئيسي', '2.1'])
-                writer.writerow(['شباك', 'شباك كبير', '3.5'])
+            # تجهيز الصفوف في الخيط الرئيسي (بيانات تجريبية)
+            rows = (
+                ('النوع', 'الاسم', 'المساحة'),
+                ('غرفة', 'غرفة المعيشة', '25.5'),
+                ('غرفة', 'غرفة النوم', '18.2'),
+                ('باب', 'باب رئيسي', '2.1'),
+                ('شباك', 'شباك كبير', '3.5'),
+            )
+            # بناء الملف كاملاً في الذاكرة مع BOM واحد ليقرأ Excel العربية
+            buffer = io.StringIO(newline='')
+            buffer.write('\ufeff')
+            csv.writer(buffer).writerows(rows)
+            data = buffer.getvalue()
+            
+            # الكتابة في خيط منفصل حتى لا تتجمد الواجهة؛ النتيجة تعود عبر
+            # طابور يقرؤه الخيط الرئيسي لأن Tkinter غير آمن مع الخيوط
+            result_q = queue.Queue()
             
-            messagebox.showinfo("نجح", f"تم حفظ الملف: {filename}")
+            def _write():
+                try:
+                    with open(filename, 'w', newline='', encoding='utf-8') as file:
+                        file.write(data)
+                except Exception as e:
+                    # أي خطأ يجب أن يصل للطابور وإلا يبقى الاستطلاع يعمل بلا رسالة
+                    result_q.put(('error', str(e)))
+                    return
+                result_q.put(('ok', filename))
+            
+            threading.Thread(target=_write, daemon=True).start()
+            self.root.after(100, self._poll_csv_write, result_q)
+    
+    def _poll_csv_write(self, result_q):
+        try:
+            status, payload = result_q.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self._poll_csv_write, result_q)
+            return
+        if status == 'ok':
+            messagebox.showinfo("نجح", f"تم حفظ الملف: {payload}")
+        else:
+            messagebox.showerror("خطأ", f"فشل حفظ الملف: {payload}")
     
     def reset_all(self):
         if messagebox.askyesno("تأكيد", "هل تريد مسح جميع البيانات؟"):
@@ -523,13 +710,13 @@ class BilindSimple:
             
             # مسح الواجهات
             if hasattr(self, 'ceramic_listbox'):
-                self.ceramic_listbox.delete(0, tk.END)
+                self.refresh_ceramic_list()
             
             if hasattr(self, 'finishes_text'):
-                self.finishes_text.delete(1.0, tk.END)
+                self._update_text(self.finishes_text, '')
             
             if hasattr(self, 'summary_text'):
-                self.summary_text.delete(1.0, tk.END)
+                self._update_text(self.summary_text, '')
             
             self.update_status("تم مسح جميع البيانات")
 
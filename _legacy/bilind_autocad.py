@@ -10,18 +10,281 @@ BILIND AutoCAD Extension - Python Version (Enhanced)
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext, simpledialog
+import tkinter.font as tkfont
 import math
+from array import array
 import csv
+import io
+from math import fsum
+from operator import attrgetter
 import os
+import queue
+import threading
 from datetime import datetime
+from dataclasses import dataclass, field
+from enum import IntEnum
 
 try:
-    import pyautocad
-    from pyautocad import Autocad, APoint
+    import pythoncom
+    import win32com.client
+    from win32com.client import gencache
 except ImportError:
-    print("⚠️ pyautocad not installed. Run: pip install pyautocad")
+    print("⚠️ pywin32 not installed. Run: pip install pywin32")
     exit(1)
 
+# أنواع الكائنات (DXF code 0) التي يعيدها AutoCAD لكل أداة اختيار
+ROOM_TYPES = "LWPOLYLINE,POLYLINE,HATCH,REGION,CIRCLE,ELLIPSE,SPLINE"
+BLOCK_TYPES = "INSERT"
+WALL_TYPES = "LINE,LWPOLYLINE,POLYLINE"
+
+# الكائنات التي تملك خاصية Length من بين ROOM_TYPES (الباقي محيطه 0)
+_HAS_LENGTH = frozenset(('AcDbPolyline', 'AcDb2dPolyline', 'AcDb3dPolyline'))
+
+# الواجهة المحددة (type library) لكل ObjectName نختاره
+_ENTITY_INTERFACES = {
+    'AcDbPolyline': 'IAcadLWPolyline',
+    'AcDb2dPolyline': 'IAcadPolyline',
+    'AcDb3dPolyline': 'IAcad3DPolyline',
+    'AcDbHatch': 'IAcadHatch',
+    'AcDbRegion': 'IAcadRegion',
+    'AcDbCircle': 'IAcadCircle',
+    'AcDbEllipse': 'IAcadEllipse',
+    'AcDbSpline': 'IAcadSpline',
+    'AcDbLine': 'IAcadLine',
+    'AcDbBlockReference': 'IAcadBlockReference',
+}
+
+
+def _entity(obj):
+    """تحويل عنصر SelectionSet إلى واجهته المحددة
+    
+    مع الربط المبكر يعيد SelectionSet كل عنصر كـ IAcadEntity عام، وهذا لا يعرف
+    Area و Length و Name و GetAttributes... CastTo حسب ObjectName يعيد الغلاف
+    الصحيح (ومعه قيم [out] مثل GetBoundingBox). إن لم يُعرف النوع نعيده كما هو.
+    """
+    try:
+        return win32com.client.CastTo(obj, _ENTITY_INTERFACES[obj.ObjectName])
+    except Exception:
+        return obj
+
+
+def _select_on_screen(selection, entity_types):
+    """SelectOnScreen مع فلتر نوع الكائن حتى لا نفحص الأنواع داخل الحلقة"""
+    filter_type = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_I2, [0])
+    filter_data = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_VARIANT, [entity_types])
+    selection.SelectOnScreen(filter_type, filter_data)
+
+
+class _AcadShim:
+    """بديل لـ pyautocad.Autocad يحتفظ بـ .app و .doc و .prompt فقط"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.doc = app.ActiveDocument
+    
+    def prompt(self, text):
+        self.doc.Utility.Prompt(f"{text}\n")
+
+
+def _connect_acad():
+    """اتصال بربط مبكر (makepy) بنسخة AutoCAD المفتوحة
+    
+    EnsureDispatch يولّد غلاف Python من type library في أول تشغيل فقط، فتصبح
+    كل قراءة خاصية عبر DISPID محفوظ بدل GetIDsOfNames في كل استدعاء.
+    GetActiveObject أولاً حتى لا يُشغَّل AutoCAD إن لم يكن مفتوحاً.
+    """
+    app = gencache.EnsureDispatch(win32com.client.GetActiveObject("AutoCAD.Application"))
+    return _AcadShim(app)
+
+
+class Finish(IntEnum):
+    """أنواع التشطيب؛ القيمة هي الفهرس في _finish_areas و _finish_tbl"""
+    PLASTER = 0  # زريقة
+    PAINT = 1    # دهان
+    TILES = 2    # سيراميك
+
+
+# سجلات بـ __slots__ بدل القواميس: ذاكرة أقل وقراءة الحقول بلا hash
+@dataclass(slots=True)
+class Room:
+    layer: str
+    width: str   # نص، "-" إن لم يكن الشكل مستطيلاً
+    length: str
+    perim: float
+    area: float
+    disp: dict = field(default=None, repr=False, compare=False)  # نصوص منسقة (انظر _display)
+
+
+@dataclass(slots=True)
+class Opening:
+    layer: str
+    width: float
+    height: float
+    perim: float
+    area: float
+    type: str = ""
+    disp: dict = field(default=None, repr=False, compare=False)
+
+
+@dataclass(slots=True)
+class Wall:
+    layer: str
+    length: float
+    height: float
+    area: float
+    deducted: float = 0.0
+    net: float = 0.0
+    disp: dict = field(default=None, repr=False, compare=False)
+
+
+_AREA = attrgetter('area')
+_PERIM = attrgetter('perim')
+
+# أعمدة تقرير الغرف والفتحات (النسخ، CSV، جدول AutoCAD)
+_REPORT_COLUMNS = ("Section", "Layer", "Width(m)", "Length/Height(m)", "Perimeter(m)", "Area(m²)")
+_REPORT_COLUMNS_TSV = "\t".join(_REPORT_COLUMNS)
+
+# نسبة السماح لاعتبار الشكل مستطيلاً (15%)
+ROOM_RECT_TOL = 0.15
+
+
+def _classify_rooms(areas, bboxes, scale, tol=ROOM_RECT_TOL):
+    """حساب W×L لكل غرفة من BoundingBox، و "-" إذا الشكل غير منتظم"""
+    dims = []
+    for area_du, bbox in zip(areas, bboxes):
+        if bbox is None:
+            dims.append(("-", "-"))
+            continue
+        min_pt, max_pt = bbox[0], bbox[1]
+        w_du = abs(max_pt[0] - min_pt[0])
+        l_du = abs(max_pt[1] - min_pt[1])
+        rect_area = w_du * l_du
+        if rect_area > 0 and abs(area_du - rect_area) / rect_area <= tol:
+            dims.append((f"{w_du * scale:.3f}", f"{l_du * scale:.3f}"))
+        else:
+            dims.append(("-", "-"))
+    return dims
+
+
+def _room_row(room):
+    return (
+        room.layer,
+        room.width,
+        room.length,
+        f"{room.perim:.3f}",
+        f"{room.area:.3f}"
+    )
+
+
+def _wheel_units(event):
+    """عدد أسطر التمرير لحدث عجلة الماوس (موجب = للأسفل)
+    
+    Windows يرسل delta بمضاعفات 120، و macOS قيماً صغيرة (±1..3) فنأخذ
+    الإشارة فقط حين يكون الناتج صفراً، و X11 يرسل Button-4/5 بدون delta.
+    """
+    if event.num == 4:
+        return -1
+    if event.num == 5:
+        return 1
+    if not event.delta:
+        return 0
+    return int(-event.delta / 120) or (-1 if event.delta > 0 else 1)
+
+
+class VirtualTreeview:
+    """يعرض في Treeview الصفوف الظاهرة فقط ويحاكي شريط التمرير لكل الصفوف
+    
+    عناصر الـ Treeview يُعاد استخدامها لسجلات مختلفة أثناء التمرير، لذلك
+    التحديد محفوظ بفهرس السجل (selected) ويُعاد تطبيقه بعد كل عرض.
+    """
+    
+    OVERSCAN = 2
+    
+    def __init__(self, tree, scrollbar):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.rows = []
+        self.format_row = None
+        self.offset = 0
+        self.selected = set()
+        self.row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        scrollbar.configure(command=self.yview)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            tree.bind(sequence, self._on_mousewheel)
+        tree.bind('<<TreeviewSelect>>', self._on_select)
+        tree.bind('<Configure>', lambda e: self.render())
+    
+    def set_rows(self, rows, format_row=None):
+        """rows: السجلات؛ format_row (اختياري) يحوّل السجل لقيم الأعمدة
+        عند عرضه فقط، فلا تُنسّق إلا الصفوف الظاهرة"""
+        self.rows = rows
+        self.format_row = format_row
+        self.selected = {i for i in self.selected if i < len(rows)}
+        self.render()
+    
+    def selection(self):
+        """فهارس السجلات المحددة (وليس معرفات عناصر الـ Treeview)"""
+        return sorted(self.selected)
+    
+    def _on_select(self, event=None):
+        # تحديث التحديد للنافذة الظاهرة فقط؛ ما خارجها يبقى كما هو
+        items = self.tree.get_children()
+        window = range(self.offset, self.offset + len(items))
+        self.selected.difference_update(window)
+        chosen = set(self.tree.selection())
+        self.selected.update(i for i, iid in zip(window, items) if iid in chosen)
+    
+    def visible_count(self):
+        return max(int(self.tree['height']), self.tree.winfo_height() // self.row_height)
+    
+    def yview(self, *args):
+        total = len(self.rows)
+        visible = self.visible_count()
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = visible if args[2] == 'pages' else 1
+            self.offset += int(args[1]) * step
+        self.render()
+    
+    def _on_mousewheel(self, event):
+        units = _wheel_units(event)
+        if units:
+            self.yview('scroll', units, 'units')
+        return 'break'
+    
+    def render(self):
+        tree = self.tree
+        total = len(self.rows)
+        visible = self.visible_count()
+        self.offset = max(0, min(self.offset, total - visible))
+        end = self.offset + visible + self.OVERSCAN
+        
+        rows = self.rows[self.offset:end]
+        if self.format_row is not None:
+            rows = list(map(self.format_row, rows))
+        
+        # إعادة استخدام العناصر الموجودة بدل حذف كل شيء وإعادة إنشائه عند كل تمرير؛
+        # لا يُنشأ أو يُحذف إلا الفرق في عدد الصفوف
+        items = tree.get_children()
+        if len(items) > len(rows):
+            tree.delete(*items[len(rows):])
+        for iid, row in zip(items, rows):
+            tree.item(iid, values=row)
+        for row in rows[len(items):]:
+            tree.insert('', tk.END, values=row)
+        
+        # العناصر نفسها تعرض الآن سجلات أخرى: التحديد يتبع السجل لا العنصر
+        offset, selected = self.offset, self.selected
+        tree.selection_set([iid for i, iid in enumerate(tree.get_children(), offset)
+                            if i in selected])
+        
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+
 class BilindApp:
     def __init__(self, root):
         self.root = root
@@ -29,13 +292,22 @@ class BilindApp:
         self.root.geometry("900x700")
         self.root.configure(bg='#2b2b2b')
         
+        # خطوط مشتركة لكل الأزرار والعناوين بدل إنشاء خط لكل عنصر
+        self.f_small = tkfont.Font(family='Arial', size=9)
+        self.f_small_bold = tkfont.Font(family='Arial', size=9, weight='bold')
+        self.f_text = tkfont.Font(family='Arial', size=10)
+        self.f_bold = tkfont.Font(family='Arial', size=10, weight='bold')
+        self.f_title = tkfont.Font(family='Arial', size=11, weight='bold')
+        self.f_header = tkfont.Font(family='Arial', size=12, weight='bold')
+        self.f_mono = tkfont.Font(family='Consolas', size=10)
+        
         # Keep window on top
         self.root.attributes('-topmost', True)
         self.root.after(100, lambda: self.root.attributes('-topmost', False))
         
         # Connect to AutoCAD
         try:
-            self.acad = Autocad(create_if_not_exists=False)
+            self.acad = _connect_acad()
             self.doc = self.acad.doc
             self.root.title(f"BILIND - Connected to AutoCAD {self.acad.doc.Name}")
         except:
@@ -43,18 +315,31 @@ class BilindApp:
             self.root.destroy()
             return
         
+        # نتائج الاختيار من خيوط AutoCAD تصل عبر هذا الطابور (انظر _poll_queue)
+        self.cmd_q = queue.Queue()
+        # عدد الخيوط التي لم تصل نتيجتها بعد؛ حلقة _poll_queue واحدة تعمل ما دام > 0
+        self._pending = 0
+        self._busy = False
+        
         self.scale = 1.0  # 1 للمتر، 0.001 للـmm
+        # اسم البلوك -> (موضع Attribute العرض، موضع Attribute الارتفاع)
+        self._attr_template_cache = {}
         self.rooms = []
         self.doors = []
         self.windows = []
         self.walls = []
-        self.finishes = {
-            'plaster': [],  # زريقة
-            'paint': [],    # دهان
-            'tiles': []     # سيراميك
-        }
+        # مجموع مساحات الفتحات مخزّن حتى تتغير الأبواب/الشبابيك
+        self._openings_dirty = True
+        self._openings_area_total = 0.0
+        # مجاميع الغرف والأبواب والشبابيك تُحدَّث بالفرق عند كل إضافة (انظر _add_to_totals)
+        self._total_area = 0.0
+        self._total_perim = 0.0
+        # مجاميع التشطيبات (م²) مفهرسة بـ Finish، تُحدَّث مع كل إضافة/طرح
+        self._finish_areas = array('d', (0.0, 0.0, 0.0))
         
         self.setup_ui()
+        # عنوان كل تشطيب مفهرس بـ Finish
+        self._finish_tbl = (self.plaster_label, self.paint_label, self.tiles_label)
     
     def setup_ui(self):
         # Create Notebook (Tabs)
@@ -86,30 +371,33 @@ class BilindApp:
         top_frame = tk.Frame(parent, bg='#2b2b2b', pady=10)
         top_frame.pack(fill=tk.X, padx=10)
         
-        tk.Label(top_frame, text="Scale:", fg='white', bg='#2b2b2b', font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
-        self.scale_entry = tk.Entry(top_frame, width=10, font=('Arial', 10))
-        self.scale_entry.insert(0, "1.0")
+        tk.Label(top_frame, text="Scale:", fg='white', bg='#2b2b2b', font=self.f_text).pack(side=tk.LEFT, padx=5)
+        # self.scale يُحدَّث مع كل تعديل، فلا حاجة لقراءة الحقل عند كل اختيار
+        self.scale_var = tk.StringVar(value="1.0")
+        self.scale_entry = tk.Entry(top_frame, width=10, font=self.f_text, textvariable=self.scale_var)
         self.scale_entry.pack(side=tk.LEFT, padx=5)
+        self.scale_var.trace_add('write', self._on_scale_change)
+        self.scale_entry.bind('<FocusOut>', self.update_scale)
         
         tk.Button(top_frame, text="🏠 Pick Rooms", command=self.pick_rooms, 
-                 bg='#4CAF50', fg='white', font=('Arial', 9, 'bold'), 
+                 bg='#4CAF50', fg='white', font=self.f_small_bold, 
                  padx=10, pady=5, cursor='hand2').pack(side=tk.LEFT, padx=3)
         
         tk.Button(top_frame, text="🚪 Pick Doors", command=self.pick_doors,
-                 bg='#8B4513', fg='white', font=('Arial', 9, 'bold'),
+                 bg='#8B4513', fg='white', font=self.f_small_bold,
                  padx=10, pady=5, cursor='hand2').pack(side=tk.LEFT, padx=3)
         
         tk.Button(top_frame, text="🪟 Pick Windows", command=self.pick_windows,
-                 bg='#2196F3', fg='white', font=('Arial', 9, 'bold'),
+                 bg='#2196F3', fg='white', font=self.f_small_bold,
                  padx=10, pady=5, cursor='hand2').pack(side=tk.LEFT, padx=3)
         
         tk.Button(top_frame, text="🔄 Reset", command=self.reset_data,
-                 bg='#FF9800', fg='white', font=('Arial', 9, 'bold'),
+                 bg='#FF9800', fg='white', font=self.f_small_bold,
                  padx=10, pady=5, cursor='hand2').pack(side=tk.LEFT, padx=3)
         
         # Rooms Table
         rooms_frame = tk.LabelFrame(parent, text="📋 ROOMS", fg='white', bg='#2b2b2b', 
-                                   font=('Arial', 10, 'bold'), pady=5)
+                                   font=self.f_bold, pady=5)
         rooms_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         self.rooms_tree = ttk.Treeview(rooms_frame, columns=('Layer', 'W(m)', 'L(m)', 'Perim(m)', 'Area(m²)'),
@@ -118,14 +406,14 @@ class BilindApp:
             self.rooms_tree.heading(col, text=col)
             self.rooms_tree.column(col, width=130, anchor='center')
         
-        scrollbar1 = ttk.Scrollbar(rooms_frame, orient=tk.VERTICAL, command=self.rooms_tree.yview)
-        self.rooms_tree.configure(yscroll=scrollbar1.set)
+        scrollbar1 = ttk.Scrollbar(rooms_frame, orient=tk.VERTICAL)
+        self.rooms_view = VirtualTreeview(self.rooms_tree, scrollbar1)
         scrollbar1.pack(side=tk.RIGHT, fill=tk.Y)
         self.rooms_tree.pack(fill=tk.BOTH, expand=True, padx=5)
         
         # Doors Table
         doors_frame = tk.LabelFrame(parent, text="🚪 DOORS", 
-                                    fg='white', bg='#2b2b2b', font=('Arial', 10, 'bold'), pady=5)
+                                    fg='white', bg='#2b2b2b', font=self.f_bold, pady=5)
         doors_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         self.doors_tree = ttk.Treeview(doors_frame, 
@@ -135,14 +423,14 @@ class BilindApp:
             self.doors_tree.heading(col, text=col)
             self.doors_tree.column(col, width=120, anchor='center')
         
-        scrollbar2 = ttk.Scrollbar(doors_frame, orient=tk.VERTICAL, command=self.doors_tree.yview)
-        self.doors_tree.configure(yscroll=scrollbar2.set)
+        scrollbar2 = ttk.Scrollbar(doors_frame, orient=tk.VERTICAL)
+        self.doors_view = VirtualTreeview(self.doors_tree, scrollbar2)
         scrollbar2.pack(side=tk.RIGHT, fill=tk.Y)
         self.doors_tree.pack(fill=tk.BOTH, expand=True, padx=5)
         
         # Windows Table
         windows_frame = tk.LabelFrame(parent, text="🪟 WINDOWS", 
-                                      fg='white', bg='#2b2b2b', font=('Arial', 10, 'bold'), pady=5)
+                                      fg='white', bg='#2b2b2b', font=self.f_bold, pady=5)
         windows_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         self.windows_tree = ttk.Treeview(windows_frame, 
@@ -152,8 +440,8 @@ class BilindApp:
             self.windows_tree.heading(col, text=col)
             self.windows_tree.column(col, width=120, anchor='center')
         
-        scrollbar3 = ttk.Scrollbar(windows_frame, orient=tk.VERTICAL, command=self.windows_tree.yview)
-        self.windows_tree.configure(yscroll=scrollbar3.set)
+        scrollbar3 = ttk.Scrollbar(windows_frame, orient=tk.VERTICAL)
+        self.windows_view = VirtualTreeview(self.windows_tree, scrollbar3)
         scrollbar3.pack(side=tk.RIGHT, fill=tk.Y)
         self.windows_tree.pack(fill=tk.BOTH, expand=True, padx=5)
         
@@ -162,7 +450,7 @@ class BilindApp:
         bottom_frame.pack(fill=tk.X, padx=10)
         
         self.totals_label = tk.Label(bottom_frame, text="Totals: 0 Rooms | 0 Doors | 0 Windows",
-                                    fg='#4CAF50', bg='#2b2b2b', font=('Arial', 10, 'bold'))
+                                    fg='#4CAF50', bg='#2b2b2b', font=self.f_bold)
         self.totals_label.pack(side=tk.LEFT, padx=10)
     
     def setup_tab2(self, parent):
@@ -172,16 +460,16 @@ class BilindApp:
         top_frame.pack(fill=tk.X, padx=10)
         
         tk.Button(top_frame, text="🧱 Pick Walls", command=self.pick_walls,
-                 bg='#795548', fg='white', font=('Arial', 10, 'bold'),
+                 bg='#795548', fg='white', font=self.f_bold,
                  padx=15, pady=5, cursor='hand2').pack(side=tk.LEFT, padx=5)
         
         tk.Button(top_frame, text="➖ Deduct Openings", command=self.calc_walls_with_deduction,
-                 bg='#FF5722', fg='white', font=('Arial', 10, 'bold'),
+                 bg='#FF5722', fg='white', font=self.f_bold,
                  padx=15, pady=5, cursor='hand2').pack(side=tk.LEFT, padx=5)
         
         # Walls Table
         walls_frame = tk.LabelFrame(parent, text="🧱 WALLS", fg='white', bg='#2b2b2b', 
-                                   font=('Arial', 11, 'bold'), pady=10)
+                                   font=self.f_title, pady=10)
         walls_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         self.walls_tree = ttk.Treeview(walls_frame, 
@@ -191,14 +479,14 @@ class BilindApp:
             self.walls_tree.heading(col, text=col)
             self.walls_tree.column(col, width=100, anchor='center')
         
-        scrollbar = ttk.Scrollbar(walls_frame, orient=tk.VERTICAL, command=self.walls_tree.yview)
-        self.walls_tree.configure(yscroll=scrollbar.set)
+        scrollbar = ttk.Scrollbar(walls_frame, orient=tk.VERTICAL)
+        self.walls_view = VirtualTreeview(self.walls_tree, scrollbar)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.walls_tree.pack(fill=tk.BOTH, expand=True, padx=5)
         
         # Totals
         self.walls_total_label = tk.Label(parent, text="Total Net Wall Area = 0.00 m²",
-                                          fg='#4CAF50', bg='#2b2b2b', font=('Arial', 12, 'bold'))
+                                          fg='#4CAF50', bg='#2b2b2b', font=self.f_header)
         self.walls_total_label.pack(pady=10)
     
     def setup_tab3(self, parent):
@@ -208,60 +496,60 @@ class BilindApp:
         info_frame.pack(fill=tk.X, padx=10)
         
         tk.Label(info_frame, text="🎨 Finishes Calculator - حساب التشطيبات",
-                fg='yellow', bg='#2b2b2b', font=('Arial', 12, 'bold')).pack()
+                fg='yellow', bg='#2b2b2b', font=self.f_header).pack()
         
         # Plaster (زريقة)
         plaster_frame = tk.LabelFrame(parent, text="🏗️ PLASTER (زريقة)", fg='white', bg='#2b2b2b', 
-                                     font=('Arial', 10, 'bold'), pady=5)
+                                     font=self.f_bold, pady=5)
         plaster_frame.pack(fill=tk.X, padx=10, pady=5)
         
         plaster_btn_frame = tk.Frame(plaster_frame, bg='#2b2b2b')
         plaster_btn_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        tk.Button(plaster_btn_frame, text="➕ Add from Rooms", command=lambda: self.add_finish_from_rooms('plaster'),
-                 bg='#4CAF50', fg='white', font=('Arial', 9), padx=10, pady=3).pack(side=tk.LEFT, padx=3)
-        tk.Button(plaster_btn_frame, text="➕ Add from Walls", command=lambda: self.add_finish_from_walls('plaster'),
-                 bg='#795548', fg='white', font=('Arial', 9), padx=10, pady=3).pack(side=tk.LEFT, padx=3)
-        tk.Button(plaster_btn_frame, text="➖ Deduct Openings", command=lambda: self.deduct_openings_from_finish('plaster'),
-                 bg='#FF5722', fg='white', font=('Arial', 9), padx=10, pady=3).pack(side=tk.LEFT, padx=3)
+        tk.Button(plaster_btn_frame, text="➕ Add from Rooms", command=lambda: self.add_finish_from_rooms(Finish.PLASTER),
+                 bg='#4CAF50', fg='white', font=self.f_small, padx=10, pady=3).pack(side=tk.LEFT, padx=3)
+        tk.Button(plaster_btn_frame, text="➕ Add from Walls", command=lambda: self.add_finish_from_walls(Finish.PLASTER),
+                 bg='#795548', fg='white', font=self.f_small, padx=10, pady=3).pack(side=tk.LEFT, padx=3)
+        tk.Button(plaster_btn_frame, text="➖ Deduct Openings", command=lambda: self.deduct_openings_from_finish(Finish.PLASTER),
+                 bg='#FF5722', fg='white', font=self.f_small, padx=10, pady=3).pack(side=tk.LEFT, padx=3)
         
-        self.plaster_label = tk.Label(plaster_frame, text="Area = 0.00 m²", fg='#4CAF50', bg='#2b2b2b', font=('Arial', 10, 'bold'))
+        self.plaster_label = tk.Label(plaster_frame, text="Area = 0.00 m²", fg='#4CAF50', bg='#2b2b2b', font=self.f_bold)
         self.plaster_label.pack(pady=5)
         
         # Paint (دهان)
         paint_frame = tk.LabelFrame(parent, text="🎨 PAINT (دهان)", fg='white', bg='#2b2b2b', 
-                                   font=('Arial', 10, 'bold'), pady=5)
+                                   font=self.f_bold, pady=5)
         paint_frame.pack(fill=tk.X, padx=10, pady=5)
         
         paint_btn_frame = tk.Frame(paint_frame, bg='#2b2b2b')
         paint_btn_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        tk.Button(paint_btn_frame, text="➕ Add from Rooms", command=lambda: self.add_finish_from_rooms('paint'),
-                 bg='#4CAF50', fg='white', font=('Arial', 9), padx=10, pady=3).pack(side=tk.LEFT, padx=3)
-        tk.Button(paint_btn_frame, text="➕ Add from Walls", command=lambda: self.add_finish_from_walls('paint'),
-                 bg='#795548', fg='white', font=('Arial', 9), padx=10, pady=3).pack(side=tk.LEFT, padx=3)
-        tk.Button(paint_btn_frame, text="➖ Deduct Openings", command=lambda: self.deduct_openings_from_finish('paint'),
-                 bg='#FF5722', fg='white', font=('Arial', 9), padx=10, pady=3).pack(side=tk.LEFT, padx=3)
+        tk.Button(paint_btn_frame, text="➕ Add from Rooms", command=lambda: self.add_finish_from_rooms(Finish.PAINT),
+                 bg='#4CAF50', fg='white', font=self.f_small, padx=10, pady=3).pack(side=tk.LEFT, padx=3)
+        tk.Button(paint_btn_frame, text="➕ Add from Walls", command=lambda: self.add_finish_from_walls(Finish.PAINT),
+                 bg='#795548', fg='white', font=self.f_small, padx=10, pady=3).pack(side=tk.LEFT, padx=3)
+        tk.Button(paint_btn_frame, text="➖ Deduct Openings", command=lambda: self.deduct_openings_from_finish(Finish.PAINT),
+                 bg='#FF5722', fg='white', font=self.f_small, padx=10, pady=3).pack(side=tk.LEFT, padx=3)
         
-        self.paint_label = tk.Label(paint_frame, text="Area = 0.00 m²", fg='#4CAF50', bg='#2b2b2b', font=('Arial', 10, 'bold'))
+        self.paint_label = tk.Label(paint_frame, text="Area = 0.00 m²", fg='#4CAF50', bg='#2b2b2b', font=self.f_bold)
         self.paint_label.pack(pady=5)
         
         # Tiles (سيراميك)
         tiles_frame = tk.LabelFrame(parent, text="🟦 TILES (سيراميك)", fg='white', bg='#2b2b2b', 
-                                   font=('Arial', 10, 'bold'), pady=5)
+                                   font=self.f_bold, pady=5)
         tiles_frame.pack(fill=tk.X, padx=10, pady=5)
         
         tiles_btn_frame = tk.Frame(tiles_frame, bg='#2b2b2b')
         tiles_btn_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        tk.Button(tiles_btn_frame, text="➕ Add from Rooms", command=lambda: self.add_finish_from_rooms('tiles'),
-                 bg='#4CAF50', fg='white', font=('Arial', 9), padx=10, pady=3).pack(side=tk.LEFT, padx=3)
-        tk.Button(tiles_btn_frame, text="➕ Add from Walls", command=lambda: self.add_finish_from_walls('tiles'),
-                 bg='#795548', fg='white', font=('Arial', 9), padx=10, pady=3).pack(side=tk.LEFT, padx=3)
-        tk.Button(tiles_btn_frame, text="➖ Deduct Openings", command=lambda: self.deduct_openings_from_finish('tiles'),
-                 bg='#FF5722', fg='white', font=('Arial', 9), padx=10, pady=3).pack(side=tk.LEFT, padx=3)
+        tk.Button(tiles_btn_frame, text="➕ Add from Rooms", command=lambda: self.add_finish_from_rooms(Finish.TILES),
+                 bg='#4CAF50', fg='white', font=self.f_small, padx=10, pady=3).pack(side=tk.LEFT, padx=3)
+        tk.Button(tiles_btn_frame, text="➕ Add from Walls", command=lambda: self.add_finish_from_walls(Finish.TILES),
+                 bg='#795548', fg='white', font=self.f_small, padx=10, pady=3).pack(side=tk.LEFT, padx=3)
+        tk.Button(tiles_btn_frame, text="➖ Deduct Openings", command=lambda: self.deduct_openings_from_finish(Finish.TILES),
+                 bg='#FF5722', fg='white', font=self.f_small, padx=10, pady=3).pack(side=tk.LEFT, padx=3)
         
-        self.tiles_label = tk.Label(tiles_frame, text="Area = 0.00 m²", fg='#4CAF50', bg='#2b2b2b', font=('Arial', 10, 'bold'))
+        self.tiles_label = tk.Label(tiles_frame, text="Area = 0.00 m²", fg='#4CAF50', bg='#2b2b2b', font=self.f_bold)
         self.tiles_label.pack(pady=5)
     
     def setup_tab4(self, parent):
@@ -271,133 +559,173 @@ class BilindApp:
         export_frame.pack(fill=tk.X, padx=10)
         
         tk.Button(export_frame, text="📋 Copy All", command=self.copy_to_clipboard,
-                 bg='#9C27B0', fg='white', font=('Arial', 10, 'bold'), 
+                 bg='#9C27B0', fg='white', font=self.f_bold, 
                  padx=15, pady=5, cursor='hand2').pack(side=tk.LEFT, padx=5)
         
         tk.Button(export_frame, text="💾 Export CSV", command=self.export_csv,
-                 bg='#795548', fg='white', font=('Arial', 10, 'bold'),
+                 bg='#795548', fg='white', font=self.f_bold,
                  padx=15, pady=5, cursor='hand2').pack(side=tk.LEFT, padx=5)
         
         tk.Button(export_frame, text="📊 Insert Table", command=self.insert_table,
-                 bg='#607D8B', fg='white', font=('Arial', 10, 'bold'),
+                 bg='#607D8B', fg='white', font=self.f_bold,
                  padx=15, pady=5, cursor='hand2').pack(side=tk.LEFT, padx=5)
         
         # Summary text
         summary_frame = tk.LabelFrame(parent, text="📊 COMPLETE SUMMARY", fg='white', bg='#2b2b2b', 
-                                     font=('Arial', 11, 'bold'), pady=10)
+                                     font=self.f_title, pady=10)
         summary_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
         self.summary_text = scrolledtext.ScrolledText(summary_frame, width=80, height=25, 
-                                                      font=('Consolas', 10), bg='#1e1e1e', fg='#00ff00')
+                                                      font=self.f_mono, bg='#1e1e1e', fg='#00ff00',
+                                                      state='disabled')
         self.summary_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Update button
         tk.Button(parent, text="🔄 Refresh Summary", command=self.update_summary,
-                 bg='#FF9800', fg='white', font=('Arial', 11, 'bold'),
+                 bg='#FF9800', fg='white', font=self.f_title,
                  padx=20, pady=8, cursor='hand2').pack(pady=10)
     
-    def update_scale(self):
+    def _on_scale_change(self, *_):
+        """تحديث self.scale بصمت؛ القيم غير المكتملة أثناء الكتابة (مثل "0.") تُتجاهل"""
         try:
-            self.scale = float(self.scale_entry.get())
-            if self.scale <= 0:
-                raise ValueError
-        except:
-            messagebox.showerror("Error", "Invalid scale value!")
-            self.scale = 1.0
-            self.scale_entry.delete(0, tk.END)
-            self.scale_entry.insert(0, "1.0")
+            scale = float(self.scale_var.get())
+        except ValueError:
+            return
+        if scale > 0:
+            self.scale = scale
+    
+    def update_scale(self, event=None):
+        """التحقق عند مغادرة الحقل: إرجاع آخر قيمة صالحة إن كان النص غير صالح"""
+        try:
+            if float(self.scale_var.get()) > 0:
+                return
+        except ValueError:
+            pass
+        messagebox.showerror("Error", "Invalid scale value!")
+        self.scale_var.set(str(self.scale))
     
     def pick_rooms(self):
         """اختيار الغرف (Polylines/Hatches/Regions)"""
-        self.update_scale()
+        if self._busy:
+            return
+        self._busy = True
         self.root.withdraw()
         
+        # الاختيار في AutoCAD يتم في خيط منفصل حتى تبقى حلقة Tk تعمل
+        threading.Thread(target=self._pick_rooms_worker, daemon=True).start()
+        self._expect_result()
+    
+    def _pick_rooms_worker(self):
+        """قراءة الغرف من AutoCAD (خيط منفصل، اتصال COM خاص به)"""
+        pythoncom.CoInitialize()
         try:
+            # كائنات COM لا تنتقل بين الخيوط، لذلك اتصال جديد هنا
+            acad = _connect_acad()
+            doc = acad.doc
             try:
-                self.doc.SelectionSets.Item("ROOMS_TEMP").Delete()
+                doc.SelectionSets.Item("ROOMS_TEMP").Delete()
             except:
                 pass
             
-            self.acad.prompt("\n=== Select ROOMS (closed polylines/hatches) ===")
-            selection = self.doc.SelectionSets.Add("ROOMS_TEMP")
-            selection.SelectOnScreen()
+            acad.prompt("\n=== Select ROOMS (closed polylines/hatches) ===")
+            selection = doc.SelectionSets.Add("ROOMS_TEMP")
+            _select_on_screen(selection, ROOM_TYPES)
             
-            count = 0
-            for obj in selection:
+            # المرحلة 1: قراءة خصائص COM فقط (هي الجزء المكلف) في قوائم متوازية
+            areas, perims, layers, bboxes = [], [], [], []
+            for obj in map(_entity, selection):
                 try:
-                    area_du = 0
-                    try:
-                        area_du = obj.Area
-                    except:
-                        continue
-                    
+                    # الفلتر يضمن أن لكل كائن خاصية Area؛ نفحص ObjectName بدل
+                    # محاولة قراءة Length وتجاهل الخطأ
+                    area_du = obj.Area
                     if area_du <= 0:
                         continue
                     
-                    perim_du = 0
-                    try:
-                        perim_du = obj.Length
-                    except:
-                        pass
+                    perim_du = obj.Length if obj.ObjectName in _HAS_LENGTH else 0
                     
                     try:
                         layer = obj.Layer
                     except:
                         layer = "Unknown"
                     
-                    # حساب W×L بدقة من BoundingBox
-                    w_str, l_str = "-", "-"
+                    # فشل BoundingBox لا يُسقط الغرفة؛ تظهر أبعادها "-"
                     try:
                         bbox = obj.GetBoundingBox()
-                        min_pt = bbox[0]
-                        max_pt = bbox[1]
-                        
-                        w_du = abs(max_pt[0] - min_pt[0])
-                        l_du = abs(max_pt[1] - min_pt[1])
-                        
-                        w_m = w_du * self.scale
-                        l_m = l_du * self.scale
-                        
-                        # فحص إذا الشكل منتظم (tolerance 15%)
-                        rect_area = w_du * l_du
-                        if rect_area > 0:
-                            diff_ratio = abs(area_du - rect_area) / rect_area
-                            if diff_ratio <= 0.15:
-                                w_str = f"{w_m:.3f}"
-                                l_str = f"{l_m:.3f}"
                     except Exception as e:
                         print(f"BBox error: {e}")
+                        bbox = None
                     
-                    self.rooms.append({
-                        'layer': layer,
-                        'width': w_str,
-                        'length': l_str,
-                        'perim': perim_du * self.scale,
-                        'area': area_du * self.scale * self.scale
-                    })
-                    count += 1
+                    areas.append(area_du)
+                    perims.append(perim_du)
+                    layers.append(layer)
+                    bboxes.append(bbox)
                     
                 except Exception as e:
                     print(f"Skipping object: {str(e)}")
                     continue
             
             selection.Delete()
-            
-            if count > 0:
-                self.refresh_rooms_table()
-                self.update_totals()
-                messagebox.showinfo("Success", f"✅ Added {count} room(s)")
-            else:
-                messagebox.showwarning("Warning", "No valid rooms!\nSelect closed polylines or hatches.")
-            
+            self.cmd_q.put(('rooms', (areas, perims, layers, bboxes)))
         except Exception as e:
-            messagebox.showerror("Error", f"Error:\n{str(e)}")
+            self.cmd_q.put(('error', str(e)))
         finally:
-            self.root.deiconify()
+            pythoncom.CoUninitialize()
+    
+    def _expect_result(self):
+        """تسجيل خيط ينتظر نتيجته؛ تبدأ حلقة _poll_queue فقط إن لم تكن تعمل"""
+        self._pending += 1
+        if self._pending == 1:
+            self.root.after(50, self._poll_queue)
+    
+    def _poll_queue(self):
+        """استلام نتائج الخيوط من داخل حلقة Tk"""
+        while True:
+            try:
+                kind, payload = self.cmd_q.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            self._handle_result(kind, payload)
+        
+        if self._pending > 0:
+            self.root.after(50, self._poll_queue)
+    
+    def _handle_result(self, kind, payload):
+        # نتائج حفظ CSV لا علاقة لها بحالة الاختيار من AutoCAD
+        if kind == 'csv':
+            messagebox.showinfo("Success", f"✅ CSV saved:\n{payload}")
+            return
+        if kind == 'csv_error':
+            messagebox.showerror("Error", f"Error saving CSV:\n{payload}")
+            return
+        
+        self._busy = False
+        self.root.deiconify()
+        if kind == 'error':
+            messagebox.showerror("Error", f"Error:\n{payload}")
+        elif kind == 'rooms':
+            self._add_picked_rooms(*payload)
+    
+    def _add_picked_rooms(self, areas, perims, layers, bboxes):
+        # المرحلة 2: الحساب في حلقة واحدة بدون أي استدعاء COM
+        scale = self.scale
+        start = len(self.rooms)
+        append = self.rooms.append
+        dims = _classify_rooms(areas, bboxes, scale)
+        for area_du, perim_du, layer, (w_str, l_str) in zip(areas, perims, layers, dims):
+            append(Room(layer, w_str, l_str, perim_du * scale, area_du * scale * scale))
+        count = len(areas)
+        
+        if count > 0:
+            self._add_to_totals(self.rooms[start:])
+            self.refresh_rooms_table()
+            self.update_totals()
+            messagebox.showinfo("Success", f"✅ Added {count} room(s)")
+        else:
+            messagebox.showwarning("Warning", "No valid rooms!\nSelect closed polylines or hatches.")
     
     def pick_doors(self):
         """اختيار الأبواب"""
-        self.update_scale()
         self.root.withdraw()
         
         try:
@@ -408,16 +736,13 @@ class BilindApp:
             
             self.acad.prompt("\n=== Select DOORS (blocks) ===")
             selection = self.doc.SelectionSets.Add("DOORS_TEMP")
-            selection.SelectOnScreen()
+            _select_on_screen(selection, BLOCK_TYPES)
             
+            start = len(self.doors)
             count = 0
-            for block in selection:
+            for block in map(_entity, selection):
                 try:
-                    try:
-                        block_name = block.Name
-                        layer = block.Layer
-                    except:
-                        continue
+                    layer = block.Layer
                     
                     w, h = self.get_block_dimensions(block)
                     if w is None or h is None:
@@ -426,13 +751,7 @@ class BilindApp:
                     w_m = w * self.scale
                     h_m = h * self.scale
                     
-                    self.doors.append({
-                        'layer': layer,
-                        'width': w_m,
-                        'height': h_m,
-                        'perim': 2 * (w_m + h_m),
-                        'area': w_m * h_m
-                    })
+                    self.doors.append(Opening(layer, w_m, h_m, 2 * (w_m + h_m), w_m * h_m))
                     count += 1
                     
                 except Exception as e:
@@ -442,6 +761,8 @@ class BilindApp:
             selection.Delete()
             
             if count > 0:
+                self._openings_dirty = True
+                self._add_to_totals(self.doors[start:])
                 self.refresh_doors_table()
                 self.update_totals()
                 messagebox.showinfo("Success", f"✅ Added {count} door(s)")
@@ -455,7 +776,6 @@ class BilindApp:
     
     def pick_windows(self):
         """اختيار الشبابيك"""
-        self.update_scale()
         self.root.withdraw()
         
         try:
@@ -466,16 +786,13 @@ class BilindApp:
             
             self.acad.prompt("\n=== Select WINDOWS (blocks) ===")
             selection = self.doc.SelectionSets.Add("WINDOWS_TEMP")
-            selection.SelectOnScreen()
+            _select_on_screen(selection, BLOCK_TYPES)
             
+            start = len(self.windows)
             count = 0
-            for block in selection:
+            for block in map(_entity, selection):
                 try:
-                    try:
-                        block_name = block.Name
-                        layer = block.Layer
-                    except:
-                        continue
+                    layer = block.Layer
                     
                     w, h = self.get_block_dimensions(block)
                     if w is None or h is None:
@@ -484,13 +801,7 @@ class BilindApp:
                     w_m = w * self.scale
                     h_m = h * self.scale
                     
-                    self.windows.append({
-                        'layer': layer,
-                        'width': w_m,
-                        'height': h_m,
-                        'perim': 2 * (w_m + h_m),
-                        'area': w_m * h_m
-                    })
+                    self.windows.append(Opening(layer, w_m, h_m, 2 * (w_m + h_m), w_m * h_m))
                     count += 1
                     
                 except Exception as e:
@@ -500,6 +811,8 @@ class BilindApp:
             selection.Delete()
             
             if count > 0:
+                self._openings_dirty = True
+                self._add_to_totals(self.windows[start:])
                 self.refresh_windows_table()
                 self.update_totals()
                 messagebox.showinfo("Success", f"✅ Added {count} window(s)")
@@ -513,7 +826,6 @@ class BilindApp:
     
     def pick_walls(self):
         """اختيار الجدران (خطوط)"""
-        self.update_scale()
         self.root.withdraw()
         
         try:
@@ -537,17 +849,13 @@ class BilindApp:
             
             self.acad.prompt("\n=== Select WALLS (lines/polylines) ===")
             selection = self.doc.SelectionSets.Add("WALLS_TEMP")
-            selection.SelectOnScreen()
+            _select_on_screen(selection, WALL_TYPES)
             
             count = 0
-            for obj in selection:
+            for obj in map(_entity, selection):
                 try:
-                    length_du = 0
-                    try:
-                        length_du = obj.Length
-                    except:
-                        continue
-                    
+                    # الفلتر يضمن أن لكل كائن خاصية Length
+                    length_du = obj.Length
                     if length_du <= 0:
                         continue
                     
@@ -559,14 +867,7 @@ class BilindApp:
                     length_m = length_du * self.scale
                     area_m2 = length_m * wall_height
                     
-                    self.walls.append({
-                        'layer': layer,
-                        'length': length_m,
-                        'height': wall_height,
-                        'area': area_m2,
-                        'deducted': 0,
-                        'net': area_m2
-                    })
+                    self.walls.append(Wall(layer, length_m, wall_height, area_m2, net=area_m2))
                     count += 1
                     
                 except Exception as e:
@@ -586,30 +887,62 @@ class BilindApp:
         finally:
             self.root.deiconify()
     
-    def get_block_dimensions(self, block):
-        """قراءة أبعاد البلوك من Attributes أو BoundingBox"""
-        w, h = None, None
-        
-        # Try attributes first
+    def read_block_attributes(self, block, name=None):
+        """قراءة W/H من Attributes البلوك
+        
+        مواضع الـ Tags واحدة لكل تعريف بلوك، لذلك نحددها مرة واحدة لكل اسم
+        ونقرأ بعدها TextString فقط بدل فحص TagString لكل Attribute.
+        نأخذ المواضع من أول نسخة وليس من doc.Blocks: GetAttributes لا تعيد
+        Attributes الثابتة (Constant)، فقد تختلف مواضعها عن ترتيب التعريف.
+        
+        لا نستخدم doc.SendCommand مع AutoLISP لتفريغ كل الـ Attributes دفعة واحدة:
+        الأمر يُنفَّذ بشكل غير متزامن بعد عودة الاستدعاء، ويتطلب ملفاً مؤقتاً
+        وانتظار اكتماله، ويتعطل إذا كان في AutoCAD أمر آخر قيد التنفيذ.
+        """
+        template = self._attr_template_cache.get(name) if name else None
         try:
-            if block.HasAttributes:
-                for att in block.GetAttributes():
+            if template is None:
+                i_w = i_h = None
+                atts = block.GetAttributes() if block.HasAttributes else ()
+                for i, att in enumerate(atts):
                     try:
                         tag = att.TagString.upper()
-                        if tag in ["WIDTH", "W"]:
-                            try:
-                                w = float(att.TextString)
-                            except:
-                                pass
-                        elif tag in ["HEIGHT", "H"]:
-                            try:
-                                h = float(att.TextString)
-                            except:
-                                pass
                     except:
                         continue
+                    if tag in ("WIDTH", "W"):
+                        i_w = i
+                    elif tag in ("HEIGHT", "H"):
+                        i_h = i
+                template = (i_w, i_h)
+                if name:
+                    self._attr_template_cache[name] = template
+            else:
+                i_w, i_h = template
+                atts = block.GetAttributes() if (i_w is not None or i_h is not None) else ()
         except:
-            pass
+            return None, None
+        
+        w = h = None
+        if i_w is not None:
+            try:
+                w = float(atts[i_w].TextString)
+            except:
+                pass
+        if i_h is not None:
+            try:
+                h = float(atts[i_h].TextString)
+            except:
+                pass
+        return w, h
+    
+    def get_block_dimensions(self, block):
+        """قراءة أبعاد البلوك من Attributes أو BoundingBox"""
+        # Try attributes first
+        try:
+            name = block.Name.upper()
+        except:
+            name = None
+        w, h = self.read_block_attributes(block, name)
         
         # Fallback to BoundingBox
         if w is None or h is None:
@@ -628,7 +961,6 @@ class BilindApp:
     
     def pick_blocks(self):
         """اختيار البلوكات (أبواب/شبابيك)"""
-        self.update_scale()
         self.root.withdraw()
         
         try:
@@ -641,54 +973,27 @@ class BilindApp:
             self.acad.prompt("\nSelect BLOCKS (doors/windows): ")
             selection = self.doc.SelectionSets.Add("BLOCKS_TEMP")
             
-            # Select without filter - user picks manually
-            selection.SelectOnScreen()
+            # Only block references come back from the selection
+            _select_on_screen(selection, BLOCK_TYPES)
             
             count = 0
-            for block in selection:
+            for block in map(_entity, selection):
                 try:
-                    # Check if it's a block reference
-                    try:
-                        block_name = block.Name
-                    except:
-                        continue  # Skip if not a block
-                    
-                    name = block_name.upper()
-                    
-                    try:
-                        layer = block.Layer.upper()
-                    except:
-                        layer = "Unknown"
+                    name = block.Name.upper()
+                    # قراءة Layer مرة واحدة؛ الفلتر يضمن وجودها لكل INSERT
+                    layer = block.Layer
+                    layer_up = layer.upper()
                     
                     # تحديد النوع
-                    if "DOOR" in name or "DOOR" in layer:
+                    if "DOOR" in name or "DOOR" in layer_up:
                         block_type = "DOOR"
-                    elif "WIN" in name or "WINDOW" in name or "WIN" in layer:
+                    elif "WIN" in name or "WINDOW" in name or "WIN" in layer_up:
                         block_type = "WINDOW"
                     else:
                         block_type = "BLOCK"
                     
                     # قراءة Width/Height من Attributes
-                    w, h = None, None
-                    try:
-                        if block.HasAttributes:
-                            for att in block.GetAttributes():
-                                try:
-                                    tag = att.TagString.upper()
-                                    if tag in ["WIDTH", "W"]:
-                                        try:
-                                            w = float(att.TextString)
-                                        except:
-                                            pass
-                                    elif tag in ["HEIGHT", "H"]:
-                                        try:
-                                            h = float(att.TextString)
-                                        except:
-                                            pass
-                                except:
-                                    continue
-                    except:
-                        pass
+                    w, h = self.read_block_attributes(block, name)
                     
                     # Fallback لـ BoundingBox
                     if w is None or h is None:
@@ -707,14 +1012,8 @@ class BilindApp:
                     w_m = w * self.scale
                     h_m = h * self.scale
                     
-                    self.openings.append({
-                        'type': block_type,
-                        'layer': block.Layer if hasattr(block, 'Layer') else "Unknown",
-                        'width': w_m,
-                        'height': h_m,
-                        'perim': 2 * (w_m + h_m),
-                        'area': w_m * h_m
-                    })
+                    self.openings.append(Opening(layer, w_m, h_m, 2 * (w_m + h_m), w_m * h_m,
+                                                 type=block_type))
                     count += 1
                     
                 except Exception as e:
@@ -736,58 +1035,65 @@ class BilindApp:
             self.root.deiconify()
     
     def refresh_rooms_table(self):
-        for item in self.rooms_tree.get_children():
-            self.rooms_tree.delete(item)
-        
-        for room in self.rooms:
-            self.rooms_tree.insert('', tk.END, values=(
-                room['layer'],
-                room['width'],
-                room['length'],
-                f"{room['perim']:.3f}",
-                f"{room['area']:.3f}"
-            ))
+        self.rooms_view.set_rows(self.rooms, _room_row)
     
     def refresh_openings_table(self):
-        for item in self.openings_tree.get_children():
-            self.openings_tree.delete(item)
+        self.openings_tree.delete(*self.openings_tree.get_children())
         
         for opening in self.openings:
             self.openings_tree.insert('', tk.END, values=(
-                opening['type'],
-                opening['layer'],
-                f"{opening['width']:.3f}",
-                f"{opening['height']:.3f}",
-                f"{opening['perim']:.3f}",
-                f"{opening['area']:.3f}"
+                opening.type,
+                opening.layer,
+                f"{opening.width:.3f}",
+                f"{opening.height:.3f}",
+                f"{opening.perim:.3f}",
+                f"{opening.area:.3f}"
             ))
     
+    def _add_to_totals(self, records):
+        """إضافة السجلات الجديدة فقط (غرف/أبواب/شبابيك) للمجاميع الجارية"""
+        self._total_area += fsum(map(_AREA, records))
+        self._total_perim += fsum(map(_PERIM, records))
+    
     def update_totals(self):
-        total_area = sum(r['area'] for r in self.rooms) + sum(o['area'] for o in self.openings)
-        total_perim = sum(r['perim'] for r in self.rooms) + sum(o['perim'] for o in self.openings)
-        
-        self.totals_label.config(text=f"Σ Perim = {total_perim:.3f} m  |  Σ Area = {total_area:.3f} m²")
+        # المجاميع محدّثة مسبقاً في _add_to_totals؛ هنا التنسيق فقط
+        self.totals_label.config(
+            text=f"Σ Perim = {self._total_perim:.3f} m  |  Σ Area = {self._total_area:.3f} m²")
     
     def reset_data(self):
         if messagebox.askyesno("Reset", "Clear all data?"):
             self.rooms.clear()
             self.openings.clear()
+            self._total_area = self._total_perim = 0.0
             self.refresh_rooms_table()
             self.refresh_openings_table()
             self.update_totals()
     
-    def copy_to_clipboard(self):
-        """نسخ البيانات كـ TSV للصق في Excel"""
-        lines = ["Section\tLayer\tWidth(m)\tLength/Height(m)\tPerimeter(m)\tArea(m²)"]
+    def _report_rows(self):
+        """صفوف الغرف والفتحات (نصوص) للنسخ والتصدير والجدول
         
+        المجاميع تُجمع أثناء بناء الصفوف نفسها بدل مرور ثانٍ على القوائم.
+        """
+        total_area = total_perim = 0.0
+        room_rows = []
         for r in self.rooms:
-            lines.append(f"Room\t{r['layer']}\t{r['width']}\t{r['length']}\t{r['perim']:.3f}\t{r['area']:.3f}")
-        
+            total_area += r.area
+            total_perim += r.perim
+            room_rows.append(["Room", r.layer, r.width, r.length, f"{r.perim:.3f}", f"{r.area:.3f}"])
+        opening_rows = []
         for o in self.openings:
-            lines.append(f"{o['type']}\t{o['layer']}\t{o['width']:.3f}\t{o['height']:.3f}\t{o['perim']:.3f}\t{o['area']:.3f}")
-        
-        total_area = sum(r['area'] for r in self.rooms) + sum(o['area'] for o in self.openings)
-        total_perim = sum(r['perim'] for r in self.rooms) + sum(o['perim'] for o in self.openings)
+            total_area += o.area
+            total_perim += o.perim
+            opening_rows.append([o.type, o.layer, f"{o.width:.3f}", f"{o.height:.3f}",
+                                 f"{o.perim:.3f}", f"{o.area:.3f}"])
+        return room_rows, opening_rows, total_area, total_perim
+    
+    def copy_to_clipboard(self):
+        """نسخ البيانات كـ TSV للصق في Excel"""
+        room_rows, opening_rows, total_area, total_perim = self._report_rows()
+        lines = [_REPORT_COLUMNS_TSV]
+        lines.extend(map("\t".join, room_rows))
+        lines.extend(map("\t".join, opening_rows))
         lines.append(f"TOTALS\t-\t-\t-\t{total_perim:.3f}\t{total_area:.3f}")
         
         self.root.clipboard_clear()
@@ -805,72 +1111,68 @@ class BilindApp:
         if not filename:
             return
         
-        with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Section", "Layer", "Width(m)", "Length/Height(m)", "Perimeter(m)", "Area(m²)"])
-            
-            for r in self.rooms:
-                writer.writerow(["Room", r['layer'], r['width'], r['length'], f"{r['perim']:.3f}", f"{r['area']:.3f}"])
-            
-            for o in self.openings:
-                writer.writerow([o['type'], o['layer'], f"{o['width']:.3f}", f"{o['height']:.3f}", 
-                               f"{o['perim']:.3f}", f"{o['area']:.3f}"])
-            
-            total_area = sum(r['area'] for r in self.rooms) + sum(o['area'] for o in self.openings)
-            total_perim = sum(r['perim'] for r in self.rooms) + sum(o['perim'] for o in self.openings)
-            writer.writerow(["TOTALS", "-", "-", "-", f"{total_perim:.3f}", f"{total_area:.3f}"])
+        # كل الصفوف جاهزة قبل فتح الملف، ثم writerows واحدة
+        room_rows, opening_rows, total_area, total_perim = self._report_rows()
+        rows = [_REPORT_COLUMNS]
+        rows += room_rows
+        rows += opening_rows
+        rows.append(["TOTALS", "-", "-", "-", f"{total_perim:.3f}", f"{total_area:.3f}"])
+        
+        self._write_csv_async(filename, rows)
+    
+    def _write_csv_async(self, filename, rows):
+        """كتابة صفوف CSV جاهزة في خيط منفصل حتى لا تتجمد الواجهة
+        
+        الصفوف تُبنى في الخيط الرئيسي، فالخيط لا يلمس بيانات التطبيق؛
+        والنتيجة تصل عبر cmd_q إلى _poll_queue.
+        """
+        def _write():
+            # الملف كاملاً في الذاكرة ثم write واحدة: الترميز يتم مرة واحدة
+            try:
+                buffer = io.StringIO(newline='')
+                csv.writer(buffer).writerows(rows)
+                with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+                    f.write(buffer.getvalue())
+            except Exception as e:
+                # أي خطأ يجب أن يصل لـ cmd_q وإلا تبقى _poll_queue تنتظره
+                self.cmd_q.put(('csv_error', str(e)))
+            else:
+                self.cmd_q.put(('csv', filename))
         
-        messagebox.showinfo("Success", f"✅ CSV saved:\n{filename}")
+        threading.Thread(target=_write, daemon=True).start()
+        self._expect_result()
     
     def insert_table(self):
         """إدراج جدول في AutoCAD"""
         try:
             self.root.iconify()
+            # مرجع واحد للمستند بدل المرور عبر self.acad.doc في كل استدعاء
+            doc = self.acad.doc
             self.acad.prompt("\nPick point for table: ")
             
             # إنشاء Table في AutoCAD
-            point = self.acad.doc.Utility.GetPoint(Type="AcPromptStatus.OK")
-            
-            rows = 3 + len(self.rooms) + len(self.openings)  # Header + Rooms + Openings + Totals
-            cols = 6
-            
-            table = self.acad.doc.ModelSpace.AddTable(point, rows, cols, 8, 30)
-            
-            # Headers
-            headers = ["Section", "Layer", "Width(m)", "Length/Height(m)", "Perimeter(m)", "Area(m²)"]
-            for i, header in enumerate(headers):
-                table.SetText(0, i, header)
+            point = doc.Utility.GetPoint()
             
-            row = 1
-            table.SetText(row, 0, "ROOMS")
-            row += 1
+            # تجهيز كل النصوص في بايثون أولاً (بدون أي استدعاء COM)
+            room_rows, opening_rows, total_area, total_perim = self._report_rows()
+            cells = [_REPORT_COLUMNS, ["ROOMS"], *room_rows, ["OPENINGS"], *opening_rows]
+            cells.append(["TOTALS", "", "", "", f"{total_perim:.3f}", f"{total_area:.3f}"])
             
-            for r in self.rooms:
-                table.SetText(row, 0, "Room")
-                table.SetText(row, 1, r['layer'])
-                table.SetText(row, 2, str(r['width']))
-                table.SetText(row, 3, str(r['length']))
-                table.SetText(row, 4, f"{r['perim']:.3f}")
-                table.SetText(row, 5, f"{r['area']:.3f}")
-                row += 1
-            
-            table.SetText(row, 0, "OPENINGS")
-            row += 1
-            
-            for o in self.openings:
-                table.SetText(row, 0, o['type'])
-                table.SetText(row, 1, o['layer'])
-                table.SetText(row, 2, f"{o['width']:.3f}")
-                table.SetText(row, 3, f"{o['height']:.3f}")
-                table.SetText(row, 4, f"{o['perim']:.3f}")
-                table.SetText(row, 5, f"{o['area']:.3f}")
-                row += 1
-            
-            total_area = sum(r['area'] for r in self.rooms) + sum(o['area'] for o in self.openings)
-            total_perim = sum(r['perim'] for r in self.rooms) + sum(o['perim'] for o in self.openings)
-            table.SetText(row, 0, "TOTALS")
-            table.SetText(row, 4, f"{total_perim:.3f}")
-            table.SetText(row, 5, f"{total_area:.3f}")
+            # خطوة Undo واحدة، وبدون إعادة توليد الجدول بعد كل خلية
+            doc.StartUndoMark()
+            try:
+                # AddTable يرفض مصفوفة VARIANT عامة؛ النقطة يجب أن تكون مصفوفة doubles
+                insertion = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, tuple(point))
+                table = doc.ModelSpace.AddTable(insertion, len(cells), 6, 8, 30)
+                table.RegenerateTableSuppressed = True
+                set_text = table.SetText
+                for i, row in enumerate(cells):
+                    for j, text in enumerate(row):
+                        if text:
+                            set_text(i, j, text)
+                table.RegenerateTableSuppressed = False
+            finally:
+                doc.EndUndoMark()
             
             messagebox.showinfo("Success", "✅ Table inserted!")
             
@@ -1,6 +1,69 @@
 # باقي الـ functions للبرنامج
 # سيتم دمجها في الملف الرئيسي
 
+import io
+from array import array
+from itertools import chain
+from operator import attrgetter
+
+# قراءة الحقول على مستوى C بدل مولدات بايثون عند جمع المساحات
+_AREA = attrgetter('area')
+_NET = attrgetter('net')
+
+# فواصل الملخص، تُبنى مرة واحدة بدل كل استدعاء لـ update_summary
+_RULE = "-" * 60 + "\n"
+_BANNER = "=" * 60 + "\n"
+_SUMMARY_HEADER = _BANNER + "           BILIND - COMPLETE PROJECT SUMMARY\n" + _BANNER + "\n"
+_FINISHES_TPL = ("🎨 FINISHES:\n" + _RULE +
+                 "🏗️  PLASTER (زريقة):  {:.3f} m²\n"
+                 "🎨 PAINT (دهان):     {:.3f} m²\n"
+                 "🟦 TILES (سيراميك):  {:.3f} m²\n\n")
+_SUMMARY_FOOTER_TPL = _BANNER + "Generated: {:%Y-%m-%d %H:%M:%S}\n" + _BANNER
+_FINISH_LABEL_TPL = "Area = {:.3f} m²"
+
+# الحقول الرقمية المنسقة (.3f) لكل نوع سجل، تُخزَّن في record.disp
+_DISPLAY_FIELDS = {
+    'rooms': ('perim', 'area'),
+    'openings': ('width', 'height', 'perim', 'area'),
+    'walls': ('length', 'height', 'area', 'deducted', 'net'),
+}
+
+def _update_display(record, kind):
+    """تنسيق حقول السجل مرة واحدة وتخزينها فيه؛ تُستدعى بعد تعديل السجل"""
+    disp = {key: f"{getattr(record, key):.3f}" for key in _DISPLAY_FIELDS[kind]}
+    record.disp = disp
+    return disp
+
+def _display(record, kind):
+    """النصوص المنسقة للسجل (الجدول، الملخص، CSV)، تُبنى عند أول استخدام"""
+    disp = record.disp
+    if disp is None:
+        disp = _update_display(record, kind)
+    return disp
+
+def _deduct_openings(walls, total_openings, total_wall_area):
+    """توزيع مساحة الفراغات على الجدران بنسبة مساحة كل جدار (تعديل في المكان)
+    
+    النسبة total_openings / total_wall_area ثابتة لكل الجدران، فتُحسب مرة
+    واحدة ويكون لكل جدار ضرب واحد بدل قائمة وسيطة وقسمة لكل عنصر.
+    النتيجة تُكتب في سجل كل جدار على أي حال، لذلك لا فائدة من مصفوفة
+    NumPy وسيطة لعشرات الجدران (وNumPy ليست من متطلبات المشروع).
+    """
+    ratio = total_openings / total_wall_area
+    for wall in walls:
+        area = wall.area
+        deducted = area * ratio
+        wall.deducted = deducted
+        wall.net = area - deducted
+        _update_display(wall, 'walls')
+
+def openings_area_total(self):
+    """مجموع مساحات الأبواب والشبابيك، يُعاد حسابه فقط بعد تغيّرها"""
+    if self._openings_dirty:
+        self._openings_area_total = sum(map(_AREA, chain(self.doors, self.windows)))
+        self._openings_dirty = False
+    return self._openings_area_total
+
 def calc_walls_with_deduction(self):
     """حساب الجدران بعد طرح الفراغات"""
     if not self.walls:
@@ -8,190 +71,147 @@ def calc_walls_with_deduction(self):
         return
     
     # Calculate total openings area
-    total_openings = 0
-    for d in self.doors:
-        total_openings += d['area']
-    for w in self.windows:
-        total_openings += w['area']
+    total_openings = self.openings_area_total()
     
     # Distribute openings across walls proportionally
-    total_wall_area = sum(w['area'] for w in self.walls)
+    total_wall_area = sum(map(_AREA, self.walls))
     if total_wall_area <= 0:
         return
     
-    for wall in self.walls:
-        ratio = wall['area'] / total_wall_area
-        deducted = total_openings * ratio
-        wall['deducted'] = deducted
-        wall['net'] = wall['area'] - deducted
+    _deduct_openings(self.walls, total_openings, total_wall_area)
     
     self.refresh_walls_table()
     messagebox.showinfo("Success", f"✅ Deducted {total_openings:.2f} m² from walls")
 
-def add_finish_from_rooms(self, finish_type):
+def add_finish_from_rooms(self, kind):
     """إضافة مساحة من الغرف للتشطيب"""
     if not self.rooms:
         messagebox.showwarning("Warning", "No rooms! Pick rooms first.")
         return
     
-    total = sum(r['area'] for r in self.rooms)
-    self.finishes[finish_type].append(('Rooms', total))
-    self.update_finish_labels()
-    messagebox.showinfo("Success", f"✅ Added {total:.2f} m² to {finish_type}")
+    total = sum(map(_AREA, self.rooms))
+    self.add_finish_amount(kind, total)
+    messagebox.showinfo("Success", f"✅ Added {total:.2f} m² to {kind.name.lower()}")
 
-def add_finish_from_walls(self, finish_type):
+def add_finish_from_walls(self, kind):
     """إضافة مساحة من الجدران للتشطيب"""
     if not self.walls:
         messagebox.showwarning("Warning", "No walls! Pick walls first.")
         return
     
-    total = sum(w['net'] for w in self.walls)
-    self.finishes[finish_type].append(('Walls', total))
-    self.update_finish_labels()
-    messagebox.showinfo("Success", f"✅ Added {total:.2f} m² to {finish_type}")
+    total = sum(map(_NET, self.walls))
+    self.add_finish_amount(kind, total)
+    messagebox.showinfo("Success", f"✅ Added {total:.2f} m² to {kind.name.lower()}")
 
-def deduct_openings_from_finish(self, finish_type):
+def deduct_openings_from_finish(self, kind):
     """طرح مساحات الفراغات من التشطيب"""
-    total_openings = 0
-    for d in self.doors:
-        total_openings += d['area']
-    for w in self.windows:
-        total_openings += w['area']
+    total_openings = self.openings_area_total()
     
     if total_openings > 0:
-        self.finishes[finish_type].append(('Deduct Openings', -total_openings))
-        self.update_finish_labels()
-        messagebox.showinfo("Success", f"✅ Deducted {total_openings:.2f} m² from {finish_type}")
+        self.add_finish_amount(kind, -total_openings)
+        messagebox.showinfo("Success", f"✅ Deducted {total_openings:.2f} m² from {kind.name.lower()}")
     else:
         messagebox.showwarning("Warning", "No openings to deduct!")
 
+def add_finish_amount(self, kind, amount):
+    """إضافة (أو طرح) مساحة لتشطيب واحد (Finish) وتحديث عنوانه فقط"""
+    areas = self._finish_areas
+    areas[kind] += amount
+    self._finish_tbl[kind].config(text=_FINISH_LABEL_TPL.format(areas[kind]))
+
 def update_finish_labels(self):
     """تحديث مساحات التشطيبات"""
-    plaster_total = sum(item[1] for item in self.finishes['plaster'])
-    paint_total = sum(item[1] for item in self.finishes['paint'])
-    tiles_total = sum(item[1] for item in self.finishes['tiles'])
-    
-    self.plaster_label.config(text=f"Area = {plaster_total:.3f} m²")
-    self.paint_label.config(text=f"Area = {paint_total:.3f} m²")
-    self.tiles_label.config(text=f"Area = {tiles_total:.3f} m²")
+    for label, total in zip(self._finish_tbl, self._finish_areas):
+        label.config(text=_FINISH_LABEL_TPL.format(total))
 
-def update_summary(self):
-    """تحديث الملخص الشامل"""
-    self.summary_text.delete('1.0', tk.END)
+def _build_summary(self):
+    """نص الملخص الشامل (بدون لمس الواجهة)"""
+    buf = io.StringIO()
+    write = buf.write
     
-    summary = "="*60 + "\n"
-    summary += "           BILIND - COMPLETE PROJECT SUMMARY\n"
-    summary += "="*60 + "\n\n"
+    write(_SUMMARY_HEADER)
     
     # Rooms
-    summary += "📋 ROOMS:\n"
-    summary += "-"*60 + "\n"
+    write("📋 ROOMS:\n")
+    write(_RULE)
     for i, r in enumerate(self.rooms, 1):
-        summary += f"{i}. Layer: {r['layer']:<15} | W×L: {r['width']} × {r['length']:<8} | "
-        summary += f"Perim: {r['perim']:.3f} m | Area: {r['area']:.3f} m²\n"
-    total_rooms = sum(r['area'] for r in self.rooms)
-    summary += f"\nTotal Rooms Area: {total_rooms:.3f} m²\n\n"
+        disp = _display(r, 'rooms')
+        write(f"{i}. Layer: {r.layer:<15} | W×L: {r.width} × {r.length:<8} | ")
+        write(f"Perim: {disp['perim']} m | Area: {disp['area']} m²\n")
+    total_rooms = sum(map(_AREA, self.rooms))
+    write(f"\nTotal Rooms Area: {total_rooms:.3f} m²\n\n")
     
     # Doors
-    summary += "🚪 DOORS:\n"
-    summary += "-"*60 + "\n"
+    write("🚪 DOORS:\n")
+    write(_RULE)
     for i, d in enumerate(self.doors, 1):
-        summary += f"{i}. Layer: {d['layer']:<15} | W×H: {d['width']:.3f} × {d['height']:.3f} m | "
-        summary += f"Area: {d['area']:.3f} m²\n"
-    total_doors = sum(d['area'] for d in self.doors)
-    summary += f"\nTotal Doors Area: {total_doors:.3f} m²\n\n"
+        disp = _display(d, 'openings')
+        write(f"{i}. Layer: {d.layer:<15} | W×H: {disp['width']} × {disp['height']} m | ")
+        write(f"Area: {disp['area']} m²\n")
+    total_doors = sum(map(_AREA, self.doors))
+    write(f"\nTotal Doors Area: {total_doors:.3f} m²\n\n")
     
     # Windows
-    summary += "🪟 WINDOWS:\n"
-    summary += "-"*60 + "\n"
+    write("🪟 WINDOWS:\n")
+    write(_RULE)
     for i, w in enumerate(self.windows, 1):
-        summary += f"{i}. Layer: {w['layer']:<15} | W×H: {w['width']:.3f} × {w['height']:.3f} m | "
-        summary += f"Area: {w['area']:.3f} m²\n"
-    total_windows = sum(w['area'] for w in self.windows)
-    summary += f"\nTotal Windows Area: {total_windows:.3f} m²\n\n"
+        disp = _display(w, 'openings')
+        write(f"{i}. Layer: {w.layer:<15} | W×H: {disp['width']} × {disp['height']} m | ")
+        write(f"Area: {disp['area']} m²\n")
+    total_windows = sum(map(_AREA, self.windows))
+    write(f"\nTotal Windows Area: {total_windows:.3f} m²\n\n")
     
     # Walls
     if self.walls:
-        summary += "🧱 WALLS:\n"
-        summary += "-"*60 + "\n"
+        write("🧱 WALLS:\n")
+        write(_RULE)
         for i, w in enumerate(self.walls, 1):
-            summary += f"{i}. Layer: {w['layer']:<15} | L×H: {w['length']:.3f} × {w['height']:.3f} m | "
-            summary += f"Gross: {w['area']:.3f} m² | Deduct: {w['deducted']:.3f} m² | Net: {w['net']:.3f} m²\n"
-        total_walls_net = sum(w['net'] for w in self.walls)
-        summary += f"\nTotal Walls Net Area: {total_walls_net:.3f} m²\n\n"
+            disp = _display(w, 'walls')
+            write(f"{i}. Layer: {w.layer:<15} | L×H: {disp['length']} × {disp['height']} m | ")
+            write(f"Gross: {disp['area']} m² | Deduct: {disp['deducted']} m² | Net: {disp['net']} m²\n")
+        total_walls_net = sum(map(_NET, self.walls))
+        write(f"\nTotal Walls Net Area: {total_walls_net:.3f} m²\n\n")
     
     # Finishes
-    summary += "🎨 FINISHES:\n"
-    summary += "-"*60 + "\n"
-    
-    plaster_total = sum(item[1] for item in self.finishes['plaster'])
-    paint_total = sum(item[1] for item in self.finishes['paint'])
-    tiles_total = sum(item[1] for item in self.finishes['tiles'])
-    
-    summary += f"🏗️  PLASTER (زريقة):  {plaster_total:.3f} m²\n"
-    summary += f"🎨 PAINT (دهان):     {paint_total:.3f} m²\n"
-    summary += f"🟦 TILES (سيراميك):  {tiles_total:.3f} m²\n\n"
-    
-    summary += "="*60 + "\n"
-    summary += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-    summary += "="*60 + "\n"
+    write(_FINISHES_TPL.format(*self._finish_areas))
+    write(_SUMMARY_FOOTER_TPL.format(datetime.now()))
     
+    return buf.getvalue()
+
+def update_summary(self):
+    """تحديث الملخص الشامل؛ النص يُحفظ في _last_summary لاستخدامه في النسخ"""
+    summary = self._last_summary = self._build_summary()
+    # الملخص للقراءة فقط؛ يُفتح للكتابة أثناء التحديث فقط
+    self.summary_text.configure(state='normal')
+    self.summary_text.delete('1.0', tk.END)
     self.summary_text.insert('1.0', summary)
+    self.summary_text.configure(state='disabled')
+
+def _room_row(room):
+    disp = _display(room, 'rooms')
+    return (room.layer, room.width, room.length, disp['perim'], disp['area'])
+
+def _opening_row(opening):
+    disp = _display(opening, 'openings')
+    return (opening.layer, disp['width'], disp['height'], disp['perim'], disp['area'])
+
+def _wall_row(wall):
+    disp = _display(wall, 'walls')
+    return (wall.layer, disp['length'], disp['height'], disp['area'], disp['deducted'], disp['net'])
 
 def refresh_rooms_table(self):
-    for item in self.rooms_tree.get_children():
-        self.rooms_tree.delete(item)
-    
-    for room in self.rooms:
-        self.rooms_tree.insert('', tk.END, values=(
-            room['layer'],
-            room['width'],
-            room['length'],
-            f"{room['perim']:.3f}",
-            f"{room['area']:.3f}"
-        ))
+    self.rooms_view.set_rows(self.rooms, _room_row)
 
 def refresh_doors_table(self):
-    for item in self.doors_tree.get_children():
-        self.doors_tree.delete(item)
-    
-    for door in self.doors:
-        self.doors_tree.insert('', tk.END, values=(
-            door['layer'],
-            f"{door['width']:.3f}",
-            f"{door['height']:.3f}",
-            f"{door['perim']:.3f}",
-            f"{door['area']:.3f}"
-        ))
+    self.doors_view.set_rows(self.doors, _opening_row)
 
 def refresh_windows_table(self):
-    for item in self.windows_tree.get_children():
-        self.windows_tree.delete(item)
-    
-    for window in self.windows:
-        self.windows_tree.insert('', tk.END, values=(
-            window['layer'],
-            f"{window['width']:.3f}",
-            f"{window['height']:.3f}",
-            f"{window['perim']:.3f}",
-            f"{window['area']:.3f}"
-        ))
+    self.windows_view.set_rows(self.windows, _opening_row)
 
 def refresh_walls_table(self):
-    for item in self.walls_tree.get_children():
-        self.walls_tree.delete(item)
-    
-    for wall in self.walls:
-        self.walls_tree.insert('', tk.END, values=(
-            wall['layer'],
-            f"{wall['length']:.3f}",
-            f"{wall['height']:.3f}",
-            f"{wall['area']:.3f}",
-            f"{wall['deducted']:.3f}",
-            f"{wall['net']:.3f}"
-        ))
+    self.walls_view.set_rows(self.walls, _wall_row)
     
-    total_net = sum(w['net'] for w in self.walls)
+    total_net = sum(map(_NET, self.walls))
     self.walls_total_label.config(text=f"Total Net Wall Area = {total_net:.3f} m²")
 
 def update_totals(self):
@@ -206,8 +226,10 @@ def reset_data(self):
         self.rooms.clear()
         self.doors.clear()
         self.windows.clear()
+        self._openings_dirty = True
         self.walls.clear()
-        self.finishes = {'plaster': [], 'paint': [], 'tiles': []}
+        self._finish_areas = array('d', (0.0, 0.0, 0.0))
+        self._total_area = self._total_perim = 0.0
         
         self.refresh_rooms_table()
         self.refresh_doors_table()
@@ -217,25 +239,72 @@ def reset_data(self):
         self.update_finish_labels()
         self.update_summary()
 
-def update_scale(self):
+def _on_scale_change(self, *_):
+    """تحديث self.scale مع كل تعديل على scale_var (trace)"""
+    try:
+        scale = float(self.scale_var.get())
+    except ValueError:
+        return
+    if scale > 0:
+        self.scale = scale
+
+def update_scale(self, event=None):
+    """التحقق عند <FocusOut>: إرجاع آخر قيمة صالحة"""
     try:
-        self.scale = float(self.scale_entry.get())
-        if self.scale <= 0:
-            raise ValueError
-    except:
-        messagebox.showerror("Error", "Invalid scale!")
-        self.scale = 1.0
-        self.scale_entry.delete(0, tk.END)
-        self.scale_entry.insert(0, "1.0")
+        if float(self.scale_var.get()) > 0:
+            return
+    except ValueError:
+        pass
+    messagebox.showerror("Error", "Invalid scale!")
+    self.scale_var.set(str(self.scale))
 
 def copy_to_clipboard(self):
     """نسخ كل البيانات"""
     self.update_summary()
-    text = self.summary_text.get('1.0', tk.END)
+    # النص من الذاكرة مباشرة، بدون قراءته من summary_text
     self.root.clipboard_clear()
-    self.root.clipboard_append(text)
+    self.root.clipboard_append(self._last_summary)
     messagebox.showinfo("Success", "✅ Copied to clipboard!")
 
+def iter_csv_rows(self):
+    """صفوف تقرير CSV بالترتيب"""
+    # Rooms
+    yield []
+    yield ["ROOMS"]
+    yield ["Layer", "Width(m)", "Length(m)", "Perimeter(m)", "Area(m²)"]
+    for r in self.rooms:
+        yield _room_row(r)
+    
+    # Doors
+    yield []
+    yield ["DOORS"]
+    yield ["Layer", "Width(m)", "Height(m)", "Perimeter(m)", "Area(m²)"]
+    for d in self.doors:
+        yield _opening_row(d)
+    
+    # Windows
+    yield []
+    yield ["WINDOWS"]
+    yield ["Layer", "Width(m)", "Height(m)", "Perimeter(m)", "Area(m²)"]
+    for w in self.windows:
+        yield _opening_row(w)
+    
+    # Walls
+    if self.walls:
+        yield []
+        yield ["WALLS"]
+        yield ["Layer", "Length(m)", "Height(m)", "Gross(m²)", "Deducted(m²)", "Net(m²)"]
+        for w in self.walls:
+            yield _wall_row(w)
+    
+    # Finishes
+    yield []
+    yield ["FINISHES"]
+    plaster_total, paint_total, tiles_total = self._finish_areas
+    yield ["Plaster (m²)", f"{plaster_total:.3f}"]
+    yield ["Paint (m²)", f"{paint_total:.3f}"]
+    yield ["Tiles (m²)", f"{tiles_total:.3f}"]
+
 def export_csv(self):
     """تصدير CSV"""
     filename = filedialog.asksaveasfilename(
@@ -247,50 +316,8 @@ def export_csv(self):
     if not filename:
         return
     
-    with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.writer(f)
-        
-        # Rooms
-        writer.writerow([])
-        writer.writerow(["ROOMS"])
-        writer.writerow(["Layer", "Width(m)", "Length(m)", "Perimeter(m)", "Area(m²)"])
-        for r in self.rooms:
-            writer.writerow([r['layer'], r['width'], r['length'], f"{r['perim']:.3f}", f"{r['area']:.3f}"])
-        
-        # Doors
-        writer.writerow([])
-        writer.writerow(["DOORS"])
-        writer.writerow(["Layer", "Width(m)", "Height(m)", "Perimeter(m)", "Area(m²)"])
-        for d in self.doors:
-            writer.writerow([d['layer'], f"{d['width']:.3f}", f"{d['height']:.3f}", f"{d['perim']:.3f}", f"{d['area']:.3f}"])
-        
-        # Windows
-        writer.writerow([])
-        writer.writerow(["WINDOWS"])
-        writer.writerow(["Layer", "Width(m)", "Height(m)", "Perimeter(m)", "Area(m²)"])
-        for w in self.windows:
-            writer.writerow([w['layer'], f"{w['width']:.3f}", f"{w['height']:.3f}", f"{w['perim']:.3f}", f"{w['area']:.3f}"])
-        
-        # Walls
-        if self.walls:
-            writer.writerow([])
-            writer.writerow(["WALLS"])
-            writer.writerow(["Layer", "Length(m)", "Height(m)", "Gross(m²)", "Deducted(m²)", "Net(m²)"])
-            for w in self.walls:
-                writer.writerow([w['layer'], f"{w['length']:.3f}", f"{w['height']:.3f}", 
-                               f"{w['area']:.3f}", f"{w['deducted']:.3f}", f"{w['net']:.3f}"])
-        
-        # Finishes
-        writer.writerow([])
-        writer.writerow(["FINISHES"])
-        plaster_total = sum(item[1] for item in self.finishes['plaster'])
-        paint_total = sum(item[1] for item in self.finishes['paint'])
-        tiles_total = sum(item[1] for item in self.finishes['tiles'])
-        writer.writerow(["Plaster (m²)", f"{plaster_total:.3f}"])
-        writer.writerow(["Paint (m²)", f"{paint_total:.3f}"])
-        writer.writerow(["Tiles (m²)", f"{tiles_total:.3f}"])
-    
-    messagebox.showinfo("Success", f"✅ CSV saved:\n{filename}")
+    # لقطة من الصفوف في الخيط الرئيسي؛ الكتابة نفسها في خيط منفصل
+    self._write_csv_async(filename, list(self.iter_csv_rows()))
 
 def insert_table(self):
     """إدراج جدول في AutoCAD"""
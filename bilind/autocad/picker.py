@@ -6,16 +6,19 @@ Handles selection and extraction of objects from AutoCAD via COM interface.
 
 import time
 import math
+import random
 from typing import List, Optional, Tuple
 from bilind.models import Room, Opening, Wall
 
 try:
     import win32com.client
+    from win32com.client import gencache
     import pythoncom
 except ImportError:
     # Allow importing the module even when pywin32 isn't installed.
     # The app can still run; AutoCAD-only features will fail gracefully.
     win32com = None
+    gencache = None
 
     class _DummyPythoncom:
         class com_error(Exception):
@@ -31,6 +34,18 @@ except ImportError:
     pythoncom = _DummyPythoncom()
 
 
+def _coords_to_xy(coords, stride: int) -> List[Tuple[float, float]]:
+    """
+    Slice a flat AutoCAD coordinate array into (x, y) pairs.
+    
+    Pure numeric helper with no COM access: ``coords`` is the already-read
+    ``Coordinates`` value and ``stride`` is 2 (XY) or 3 (XYZ). Raises
+    TypeError/ValueError if an entry isn't numeric.
+    """
+    seq = tuple(coords)
+    return list(zip(map(float, seq[0::stride]), map(float, seq[1::stride])))
+
+
 class AutoCADPicker:
     """
     Handles AutoCAD object selection and dimension extraction.
@@ -41,8 +56,27 @@ class AutoCADPicker:
 
     RPC_E_CALL_REJECTED = -2147418111
     _RETRY_DELAY = 0.35
+    _MAX_DELAY = 5.0
     _MAX_RETRIES = 4
     _POINT_TOLERANCE = 1e-6
+    # COM properties read once per picked room (see _snapshot)
+    _ROOM_PROPS = ('ObjectName', 'Area', 'Length', 'Layer', 'Closed', 'Coordinates')
+    _WALL_PROPS = ('Length', 'Layer')
+    _BLOCK_PROPS = ('Layer', 'IsDynamicBlock', 'HasAttributes', 'EffectiveName')
+    # Concrete type-library interface for each ObjectName the pickers handle
+    _ENTITY_INTERFACES = {
+        'AcDbPolyline': 'IAcadLWPolyline',
+        'AcDb2dPolyline': 'IAcadPolyline',
+        'AcDb3dPolyline': 'IAcad3DPolyline',
+        'AcDbHatch': 'IAcadHatch',
+        'AcDbRegion': 'IAcadRegion',
+        'AcDbCircle': 'IAcadCircle',
+        'AcDbEllipse': 'IAcadEllipse',
+        'AcDbSpline': 'IAcadSpline',
+        'AcDbLine': 'IAcadLine',
+        'AcDbArc': 'IAcadArc',
+        'AcDbBlockReference': 'IAcadBlockReference',
+    }
     
     def __init__(self, acad_app, doc):
         """
@@ -55,7 +89,55 @@ class AutoCADPicker:
         if win32com is None:
             raise RuntimeError("pywin32 is required for AutoCAD integration. Install with: pip install pywin32")
         self.acad = acad_app
-        self.doc = doc
+        self.doc = self._early_bound_document(doc)
+
+    def _early_bound_document(self, doc):
+        """
+        Return ``doc`` re-acquired through a gencache (makepy) wrapper.
+        
+        Late-bound dispatch resolves every property name with GetIDsOfNames
+        before invoking it; the generated wrapper uses cached DISPIDs, and the
+        selection sets reached from it are typed the same way. Entities are
+        cast to their concrete interface by ``_early_bound_entity``.
+        
+        ``GetActiveObject`` returns whichever AutoCAD registered first, so the
+        wrapper is only used when it is the caller's instance (same HWND) and
+        exactly one of its documents matches ``doc``. Otherwise, or when the
+        type library can't be loaded, ``doc`` is returned unchanged.
+        """
+        if gencache is None:
+            return doc
+        try:
+            caller_app = getattr(self.acad, 'app', self.acad)
+            app = gencache.EnsureDispatch(win32com.client.GetActiveObject("AutoCAD.Application"))
+            if int(app.HWND) != int(caller_app.HWND):
+                return doc
+            key = (str(doc.FullName), str(doc.Name))
+            matches = [candidate for candidate in app.Documents
+                       if (str(candidate.FullName), str(candidate.Name)) == key]
+            if len(matches) == 1:
+                return matches[0]
+        except Exception:
+            pass
+        return doc
+
+    def _early_bound_entity(self, obj):
+        """
+        Cast a selection-set entity to its concrete early-bound interface.
+        
+        An early-bound ``SelectionSet.Item`` returns a generic IAcadEntity
+        wrapper, which hides subtype members (Area, Coordinates, Closed,
+        EffectiveName, GetAttributes...). ``CastTo`` by ObjectName gives the
+        typed wrapper for the actual entity. Objects that aren't pywin32
+        wrappers (the comtypes fallback) or have no known interface are
+        returned unchanged.
+        """
+        if getattr(obj, '_oleobj_', None) is None:
+            return obj
+        try:
+            return win32com.client.CastTo(obj, self._ENTITY_INTERFACES[obj.ObjectName])
+        except Exception:
+            return obj
     
     def _delete_all_selections(self):
         """Clean up any existing selection sets."""
@@ -75,6 +157,13 @@ class AutoCADPicker:
             hresult = err.args[0]
         return hresult == self.RPC_E_CALL_REJECTED
 
+    def _backoff(self, attempt: int) -> None:
+        """Wait before retrying a rejected call: exponential delay with jitter
+        so repeated retries don't line up with AutoCAD's busy periods."""
+        delay = min(self._MAX_DELAY, self._RETRY_DELAY * (2 ** attempt))
+        time.sleep(delay * (1 + random.uniform(0, 0.5)))
+        pythoncom.PumpWaitingMessages()
+
     def _create_selection_set(self, base_name: str):
         """Create a COM selection set with retry handling."""
         name = f"{base_name}_{int(time.time() * 1000) % 100000}"
@@ -83,8 +172,7 @@ class AutoCADPicker:
                 return self.doc.SelectionSets.Add(name)
             except pythoncom.com_error as err:
                 if self._is_call_rejected(err) and attempt < self._MAX_RETRIES - 1:
-                    time.sleep(self._RETRY_DELAY * (attempt + 1))
-                    pythoncom.PumpWaitingMessages()
+                    self._backoff(attempt)
                     continue
                 raise
 
@@ -96,8 +184,7 @@ class AutoCADPicker:
                 return
             except pythoncom.com_error as err:
                 if self._is_call_rejected(err) and attempt < self._MAX_RETRIES - 1:
-                    time.sleep(self._RETRY_DELAY * (attempt + 1))
-                    pythoncom.PumpWaitingMessages()
+                    self._backoff(attempt)
                     continue
                 # Re-raise the original COM error so callers can catch it
                 raise
@@ -105,10 +192,31 @@ class AutoCADPicker:
                 # Catch any other exceptions
                 raise Exception(f"Selection error: {str(e)}")
     
+    def _snapshot(self, obj, attrs) -> dict:
+        """
+        Read each named COM property once.
+        
+        Every property access is a cross-process round-trip, so callers take
+        one snapshot per object and pass it on instead of re-reading ``obj``.
+        Properties the object doesn't expose map to None.
+        """
+        snap = {}
+        for name in attrs:
+            try:
+                snap[name] = getattr(obj, name)
+            except Exception:
+                snap[name] = None
+        return snap
+
     def _get_bounding_box(self, obj) -> Tuple[Optional[float], Optional[float]]:
         """
         Extract width and length from object's bounding box.
         
+        Not part of ``_snapshot``: GetBoundingBox is a method with [out]
+        arguments rather than a property, and pick_rooms only needs it when
+        the vertices don't give a rectangle, so reading it eagerly would add
+        a round-trip for every room.
+        
         Args:
             obj: AutoCAD object
             
@@ -119,8 +227,12 @@ class AutoCADPicker:
             # Try VARIANT approach (some AutoCAD versions)
             min_variant = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, (0.0, 0.0, 0.0))
             max_variant = win32com.client.VARIANT(pythoncom.VT_ARRAY | pythoncom.VT_R8, (0.0, 0.0, 0.0))
-            obj.GetBoundingBox(min_variant, max_variant)
-            minPt, maxPt = min_variant.value, max_variant.value
+            result = obj.GetBoundingBox(min_variant, max_variant)
+            if isinstance(result, tuple) and len(result) == 2:
+                # Early-bound wrappers return the [out] points instead of filling the VARIANTs
+                minPt, maxPt = result
+            else:
+                minPt, maxPt = min_variant.value, max_variant.value
             
             if minPt and maxPt and len(minPt) >= 2 and len(maxPt) >= 2:
                 w = abs(float(maxPt[0]) - float(minPt[0]))
@@ -173,21 +285,38 @@ class AutoCADPicker:
         
         return None, None
 
-    def _get_polyline_vertices(self, obj) -> List[Tuple[float, float]]:
-        """Extract ordered XY vertices from a polyline-like AutoCAD object."""
+    def _get_polyline_vertices(self, obj, snap: Optional[dict] = None) -> List[Tuple[float, float]]:
+        """Extract ordered XY vertices from a polyline-like AutoCAD object.
+
+        ``snap`` is an optional :meth:`_snapshot` of ``obj``; properties found
+        in it are not read from COM again.
+        """
+        if snap is None:
+            snap = self._snapshot(obj, ('ObjectName', 'Coordinates'))
+
         # Detect object type to determine coordinate stride
-        obj_type = ""
-        try:
-            obj_type = str(getattr(obj, 'ObjectName', '')).upper()
-        except:
-            pass
+        obj_type = str(snap.get('ObjectName') or '').upper()
         
         # LWPolyline uses XY pairs (stride 2), heavy polylines use XYZ (stride 3)
         is_lwpolyline = 'LWPOLYLINE' in obj_type or 'ACDBPOLYLINE' in obj_type
         is_heavy_polyline = '2DPOLYLINE' in obj_type or '3DPOLYLINE' in obj_type
+        known_stride = 2 if is_lwpolyline else (3 if is_heavy_polyline else None)
         
-        # Strategy 1 (BEST): NumberOfVertices + Coordinate() method
-        # This is the most reliable as it gives us clean XY pairs directly
+        # Strategy 1 (BEST): one bulk Coordinates read sliced by the stride the
+        # object type implies - a single COM round-trip instead of one per vertex
+        coords = snap.get('Coordinates')
+        if known_stride and coords is not None:
+            try:
+                vertices = _coords_to_xy(coords, known_stride)
+                if len(vertices) >= 3:
+                    cleaned = self._remove_duplicate_vertices(vertices)
+                    if len(cleaned) >= 3:
+                        return cleaned
+            except (TypeError, ValueError):
+                pass
+
+        # Strategy 2: NumberOfVertices + Coordinate() method (one call per vertex)
+        # Clean XY pairs for objects whose coordinate stride is unknown
         try:
             count = int(getattr(obj, 'NumberOfVertices', 0))
             if count >= 3:
@@ -211,7 +340,7 @@ class AutoCADPicker:
         except Exception:
             pass
 
-        # Strategy 2: Coordinates property with smart stride detection
+        # Strategy 3: Coordinates property with smart stride detection
         coord_sources: List[Tuple[List[float], int]] = []  # (coords, expected_stride)
         
         def _append_source(data, stride: int) -> None:
@@ -224,15 +353,11 @@ class AutoCADPicker:
             except Exception:
                 pass
 
-        try:
-            coords = getattr(obj, 'Coordinates', None)
-            if coords is not None:
-                expected_stride = 2 if is_lwpolyline else (3 if is_heavy_polyline else 2)
-                _append_source(coords, expected_stride)
-        except Exception:
-            pass
+        if coords is not None:
+            expected_stride = 2 if is_lwpolyline else (3 if is_heavy_polyline else 2)
+            _append_source(coords, expected_stride)
         
-        # Strategy 3: GetCoordinates method
+        # Strategy 4: GetCoordinates method
         try:
             get_coords = getattr(obj, 'GetCoordinates', None)
             if callable(get_coords):
@@ -244,35 +369,19 @@ class AutoCADPicker:
         if not coord_sources:
             return []
 
-        def _build_vertices(seq: List[float], stride: int) -> List[Tuple[float, float]]:
-            if stride < 2:
-                stride = 2
-            vertices: List[Tuple[float, float]] = []
-            i = 0
-            while i + 1 < len(seq):
-                try:
-                    x = float(seq[i])
-                    y = float(seq[i + 1])
-                    vertices.append((x, y))
-                except Exception:
-                    pass
-                i += stride
-            return self._remove_duplicate_vertices(vertices)
-
         # Try each source with its expected stride, pick the one with most vertices
         best_vertices: List[Tuple[float, float]] = []
         
         for raw_coords, expected_stride in coord_sources:
-            # Try expected stride first
-            verts = _build_vertices(raw_coords, expected_stride)
-            if len(verts) > len(best_vertices):
-                best_vertices = verts
-            
-            # Also try alternate stride in case object type detection was wrong
-            alt_stride = 3 if expected_stride == 2 else 2
-            alt_verts = _build_vertices(raw_coords, alt_stride)
-            if len(alt_verts) > len(best_vertices):
-                best_vertices = alt_verts
+            # Try expected stride first, then the alternate stride in case
+            # object type detection was wrong
+            for stride in (expected_stride, 3 if expected_stride == 2 else 2):
+                try:
+                    verts = self._remove_duplicate_vertices(_coords_to_xy(raw_coords, stride))
+                except (TypeError, ValueError):
+                    continue
+                if len(verts) > len(best_vertices):
+                    best_vertices = verts
 
         return best_vertices
 
@@ -282,11 +391,14 @@ class AutoCADPicker:
             return []
         
         cleaned: List[Tuple[float, float]] = [vertices[0]]
+        append = cleaned.append
+        last_x, last_y = vertices[0]
         for pt in vertices[1:]:
-            last = cleaned[-1]
+            x, y = pt
             # Use a reasonable tolerance for construction drawings (1mm = 0.001m)
-            if abs(pt[0] - last[0]) > 0.001 or abs(pt[1] - last[1]) > 0.001:
-                cleaned.append(pt)
+            if abs(x - last_x) > 0.001 or abs(y - last_y) > 0.001:
+                append(pt)
+                last_x, last_y = x, y
         
         return cleaned
 
@@ -306,27 +418,21 @@ class AutoCADPicker:
         if len(pts) < 3:
             return pts
 
-        def _is_collinear(a, b, c) -> bool:
-            ax, ay = a
-            bx, by = b
-            cx, cy = c
-            v1x, v1y = bx - ax, by - ay
-            v2x, v2y = cx - bx, cy - by
-            l1 = (v1x * v1x + v1y * v1y) ** 0.5
-            l2 = (v2x * v2x + v2y * v2y) ** 0.5
-            if l1 <= tol or l2 <= tol:
-                return True
-            cross = abs(v1x * v2y - v1y * v2x)
-            # Normalized cross-product; ~0 means nearly collinear
-            return (cross / (l1 * l2)) <= 1e-4
+        # Each edge is shared by two corners, so build edge vectors and squared
+        # lengths once. Comparing squares avoids a sqrt per corner:
+        # |cross| / (l1 * l2) <= 1e-4  <=>  cross² <= 1e-8 * l1² * l2²
+        edges = [(x2 - x1, y2 - y1) for (x1, y1), (x2, y2) in zip(pts, pts[1:] + pts[:1])]
+        sq_lengths = [dx * dx + dy * dy for dx, dy in edges]
+        tol_sq = tol * tol
 
         simplified: List[Tuple[float, float]] = []
-        n = len(pts)
-        for i in range(n):
-            prev_pt = pts[(i - 1) % n]
-            cur_pt = pts[i]
-            next_pt = pts[(i + 1) % n]
-            if _is_collinear(prev_pt, cur_pt, next_pt):
+        for cur_pt, (v1x, v1y), l1_sq, (v2x, v2y), l2_sq in zip(
+                pts, edges[-1:] + edges[:-1], sq_lengths[-1:] + sq_lengths[:-1], edges, sq_lengths):
+            if l1_sq <= tol_sq or l2_sq <= tol_sq:
+                continue
+            cross = v1x * v2y - v1y * v2x
+            # Normalized cross-product; ~0 means nearly collinear
+            if cross * cross <= 1e-8 * l1_sq * l2_sq:
                 continue
             simplified.append(cur_pt)
 
@@ -335,38 +441,26 @@ class AutoCADPicker:
 
     def _infer_rect_dims_from_vertices(self, vertices: List[Tuple[float, float]], scale: float) -> Tuple[Optional[float], Optional[float]]:
         """Infer (width, length) for (possibly rotated) rectangles; else return (None, None)."""
-        import math
-
         pts = self._simplify_collinear_vertices(vertices)
         # Only handle rectangles (4 corners)
         if len(pts) != 4:
             return None, None
 
-        # Build edge vectors/lengths
-        edges = []
-        for i in range(4):
-            x1, y1 = pts[i]
-            x2, y2 = pts[(i + 1) % 4]
-            dx, dy = (x2 - x1), (y2 - y1)
-            ln = math.hypot(dx, dy)
-            if ln <= 1e-9:
-                return None, None
-            edges.append((dx, dy, ln))
-
-        # Check near-orthogonality for adjacent edges
-        for i in range(4):
-            dx1, dy1, l1 = edges[i]
-            dx2, dy2, l2 = edges[(i + 1) % 4]
-            dot = (dx1 * dx2 + dy1 * dy2)
-            cos_abs = abs(dot) / (l1 * l2)
-            if cos_abs > 0.2:  # ~78–102 degrees tolerance
-                return None, None
+        # Build edge vectors/lengths in one pass over the (vertex, next vertex) pairs
+        edges = [(x2 - x1, y2 - y1) for (x1, y1), (x2, y2) in zip(pts, pts[1:] + pts[:1])]
+        lengths = [math.hypot(dx, dy) for dx, dy in edges]
+        if min(lengths) <= 1e-9:
+            return None, None
+
+        # Check near-orthogonality for adjacent edges: |cos| > 0.2 is outside ~78–102 degrees
+        next_edges = edges[1:] + edges[:1]
+        next_lengths = lengths[1:] + lengths[:1]
+        if any(abs(dx1 * dx2 + dy1 * dy2) > 0.2 * l1 * l2
+               for (dx1, dy1), (dx2, dy2), l1, l2 in zip(edges, next_edges, lengths, next_lengths)):
+            return None, None
 
         # Opposite edges should match in length (within tolerance)
-        l0 = edges[0][2]
-        l1 = edges[1][2]
-        l2 = edges[2][2]
-        l3 = edges[3][2]
+        l0, l1, l2, l3 = lengths
         if (abs(l0 - l2) / max(l0, l2)) > 0.08:
             return None, None
         if (abs(l1 - l3) / max(l1, l3)) > 0.08:
@@ -380,19 +474,24 @@ class AutoCADPicker:
             return None, None
         return w, l
 
-    def _build_walls_from_polyline(self, obj, layer: str, scale: float, default_height: float) -> List[Wall]:
-        """Convert a closed polyline into wall segments matching each edge."""
-        vertices = self._get_polyline_vertices(obj)
+    def _build_walls_from_polyline(self, obj, layer: str, scale: float, default_height: float,
+                                   snap: Optional[dict] = None,
+                                   vertices: Optional[List[Tuple[float, float]]] = None) -> List[Wall]:
+        """Convert a closed polyline into wall segments matching each edge.
+
+        Pass the object's ``snap`` and already-extracted ``vertices`` to avoid
+        reading them from COM a second time.
+        """
+        if snap is None:
+            snap = self._snapshot(obj, ('ObjectName', 'Closed', 'Coordinates'))
+        if vertices is None:
+            vertices = self._get_polyline_vertices(obj, snap)
         
         # Need at least 3 unique vertices for a closed shape
         if len(vertices) < 3:
             return []
 
-        is_closed = False
-        try:
-            is_closed = bool(getattr(obj, 'Closed', False))
-        except Exception:
-            pass
+        is_closed = bool(snap.get('Closed'))
         
         # Check if first and last points are close (looser tolerance for real-world drawings)
         if not is_closed and len(vertices) >= 3:
@@ -446,42 +545,45 @@ class AutoCADPicker:
         default_wall_height = float(kwargs.get('default_wall_height', 0.0) or 3.0)
         # Get existing rooms from project to avoid duplicate names
         existing_rooms = kwargs.get('existing_rooms', [])
+        # Rooms of this type already in the project, counted once per pick (not per picked room)
+        use_type_names = bool(room_type) and room_type not in ("Other", "[Not Set]")
+        existing_type_count = sum(1 for r in existing_rooms if (
+            r.get('room_type') if isinstance(r, dict) else getattr(r, 'room_type', None)
+        ) == room_type) if use_type_names else 0
         ss = self._create_selection_set("BILIND_ROOMS")
         try:
             self._select_on_screen(ss)
             for i in range(ss.Count):
                 try:
-                    obj = ss.Item(i)
+                    obj = self._early_bound_entity(ss.Item(i))
                 except Exception:
                     continue
 
+                snap = self._snapshot(obj, self._ROOM_PROPS)
                 try:
-                    area_du = float(obj.Area)
-                except Exception:
+                    area_du = float(snap['Area'])
+                except (TypeError, ValueError):
                     continue
 
                 if area_du <= 0.0001:
                     continue
 
+                perim_du = snap['Length']
+                if perim_du is None:
+                    # Try Perimeter property (common for Regions/Hatches)
+                    perim_du = self._snapshot(obj, ('Perimeter',))['Perimeter']
                 try:
-                    perim_du = float(obj.Length)
-                except Exception:
-                    try:
-                        # Try Perimeter property (common for Regions/Hatches)
-                        perim_du = float(obj.Perimeter)
-                    except Exception:
-                        perim_du = 0.0
+                    perim_du = float(perim_du or 0.0)
+                except (TypeError, ValueError):
+                    perim_du = 0.0
 
-                try:
-                    layer = str(obj.Layer)
-                except Exception:
-                    layer = "Unknown"
+                layer = str(snap['Layer']) if snap['Layer'] is not None else "Unknown"
 
                 # Derive width/length:
                 # - If the shape is a (possibly rotated) rectangle, use its true edge lengths.
                 # - If it's irregular (more than 4 corners), leave width/length unset so exports show wall-length sums.
                 width, length = None, None
-                verts = self._get_polyline_vertices(obj)
+                verts = self._get_polyline_vertices(obj, snap)
                 if verts:
                     width, length = self._infer_rect_dims_from_vertices(verts, scale)
 
@@ -508,13 +610,10 @@ class AutoCADPicker:
                 try:
                     name_idx = start_index + len(rooms)
                     # Use room_type as default name instead of generic "Room1"
-                    if room_type and room_type != "Other" and room_type != "[Not Set]":
-                        # Count how many of this type already exist in BOTH existing project rooms AND current batch
-                        existing_type_count = sum(1 for r in existing_rooms if (
-                            r.get('room_type') if isinstance(r, dict) else getattr(r, 'room_type', None)
-                        ) == room_type)
-                        current_batch_count = sum(1 for r in rooms if r.room_type == room_type)
-                        type_count = existing_type_count + current_batch_count + 1
+                    if use_type_names:
+                        # Existing project rooms of this type plus this batch; every room
+                        # in the batch is created with room_type, so the batch count is len(rooms)
+                        type_count = existing_type_count + len(rooms) + 1
                         default_name = f"{room_type} {type_count}"
                     else:
                         default_name = f"Room{name_idx}"
@@ -533,7 +632,9 @@ class AutoCADPicker:
                 except Exception:
                     continue
 
-                wall_segments = self._build_walls_from_polyline(obj, layer, scale, default_wall_height)
+                wall_segments = self._build_walls_from_polyline(
+                    obj, layer, scale, default_wall_height, snap=snap, vertices=verts
+                )
                 if wall_segments:
                     room.walls = wall_segments
                     room.wall_segments = [
@@ -568,20 +669,22 @@ class AutoCADPicker:
             self._select_on_screen(ss)
             for i in range(ss.Count):
                 try:
-                    obj = ss.Item(i)
+                    obj = self._early_bound_entity(ss.Item(i))
                 except Exception:
                     continue
 
+                snap = self._snapshot(obj, self._WALL_PROPS)
+
                 # Try multiple ways to read linear length
                 length_du = None
                 try:
-                    length_du = float(getattr(obj, 'Length'))
-                except Exception:
+                    length_du = float(snap['Length'])
+                except (TypeError, ValueError):
                     pass
                 if length_du is None or length_du <= 0:
                     try:
-                        length_du = float(getattr(obj, 'ArcLength'))
-                    except Exception:
+                        length_du = float(self._snapshot(obj, ('ArcLength',))['ArcLength'])
+                    except (TypeError, ValueError):
                         length_du = None
                 if length_du is None:
                     # Unsupported object for wall picking, skip
@@ -592,10 +695,7 @@ class AutoCADPicker:
 
                 length = length_du * scale
 
-                try:
-                    layer = str(obj.Layer)
-                except Exception:
-                    layer = "Unknown"
+                layer = str(snap['Layer']) if snap['Layer'] is not None else "Unknown"
 
                 try:
                     name_idx = start_index + len(walls)
@@ -657,7 +757,7 @@ class AutoCADPicker:
             self._select_on_screen(ss)
             for i in range(ss.Count):
                 try:
-                    block = ss.Item(i)
+                    block = self._early_bound_entity(ss.Item(i))
                 except Exception:
                     continue
 
@@ -668,11 +768,12 @@ class AutoCADPicker:
                 except Exception:
                     continue
 
+                snap = self._snapshot(block, self._BLOCK_PROPS)
                 width_raw, height_raw = None, None
 
                 # Priority 1: dynamic block properties
                 try:
-                    if hasattr(block, "IsDynamicBlock") and block.IsDynamicBlock:
+                    if snap['IsDynamicBlock']:
                         props = block.GetDynamicBlockProperties()
                         for prop in props:
                             name_upper = str(prop.PropertyName).upper()
@@ -687,7 +788,7 @@ class AutoCADPicker:
                 # Priority 2: block attributes
                 if width_raw is None or height_raw is None:
                     try:
-                        if getattr(block, "HasAttributes", False):
+                        if snap['HasAttributes']:
                             for att in block.GetAttributes():
                                 tag = str(att.TagString).upper()
                                 val = str(att.TextString)
@@ -708,7 +809,9 @@ class AutoCADPicker:
                 if width_raw is None or height_raw is None or width_raw <= 0.001 or height_raw <= 0.001:
                     try:
                         min_pt, max_pt = [0.0, 0.0, 0.0], [0.0, 0.0, 0.0]
-                        block.GetBoundingBox(min_pt, max_pt)
+                        result = block.GetBoundingBox(min_pt, max_pt)
+                        if isinstance(result, tuple) and len(result) == 2:
+                            min_pt, max_pt = result
                         bbox_w = abs(max_pt[0] - min_pt[0])
                         bbox_h = abs(max_pt[1] - min_pt[1])
                         if (width_raw is None or width_raw <= 0.001) and bbox_w > 0.001:
@@ -721,12 +824,12 @@ class AutoCADPicker:
                 if not width_raw or not height_raw or width_raw <= 0.001 or height_raw <= 0.001:
                     continue
 
-                layer = str(block.Layer) if hasattr(block, "Layer") else "Unknown"
+                layer = str(snap['Layer']) if snap['Layer'] is not None else "Unknown"
                 width = width_raw * scale
                 height = height_raw * scale
                 prefix = "D" if opening_type == "DOOR" else "W"
                 base_name = f"{prefix}{start_index + len(openings)}"
-                type_label = str(getattr(block, "EffectiveName", "") or getattr(block, "Name", "")) or "AutoCAD Block"
+                type_label = str(snap['EffectiveName'] or getattr(block, "Name", "")) or "AutoCAD Block"
 
                 try:
                     opening = Opening(
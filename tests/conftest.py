@@ -0,0 +1,83 @@
+"""
+Shared loaders for the standalone scripts (BILIND_ENHANCED.py, _legacy/*.py).
+
+Those scripts import pywin32/pyautocad at module level and exit when they're
+missing, so they are executed here with stand-in modules. Tests build app
+instances with __new__ and never create a Tk root.
+"""
+
+import importlib.util
+import os
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class FakeVariant:
+    def __init__(self, vt, value):
+        self.vt = vt
+        self.value = value
+
+
+def _fake_pywin32():
+    pythoncom = types.ModuleType('pythoncom')
+    pythoncom.VT_ARRAY = 0x2000
+    pythoncom.VT_R8 = 5
+    pythoncom.VT_I2 = 2
+    pythoncom.VT_VARIANT = 12
+    pythoncom.CoInitialize = lambda: None
+    pythoncom.CoUninitialize = lambda: None
+    pythoncom.com_error = Exception
+
+    client = types.ModuleType('win32com.client')
+    client.VARIANT = FakeVariant
+    client.CastTo = lambda obj, interface: obj
+    client.GetActiveObject = MagicMock()
+    client.gencache = types.ModuleType('win32com.client.gencache')
+    client.gencache.EnsureDispatch = lambda obj: obj
+
+    win32com = types.ModuleType('win32com')
+    win32com.client = client
+
+    pyautocad = types.ModuleType('pyautocad')
+    pyautocad.Autocad = MagicMock()
+    pyautocad.APoint = tuple
+
+    return {
+        'pythoncom': pythoncom,
+        'win32com': win32com,
+        'win32com.client': client,
+        'win32com.client.gencache': client.gencache,
+        'pyautocad': pyautocad,
+    }
+
+
+def _load_script(relpath):
+    path = os.path.join(ROOT_DIR, relpath)
+    name = '_script_' + os.path.splitext(relpath)[0].replace(os.sep, '_').replace('/', '_')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    with patch.dict(sys.modules, _fake_pywin32()):
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='session')
+def legacy_simple():
+    return _load_script('_legacy/BILIND_SIMPLE.py')
+
+
+@pytest.fixture(scope='session')
+def legacy_autocad():
+    return _load_script('_legacy/bilind_autocad.py')
+
+
+@pytest.fixture(scope='session')
+def enhanced():
+    if sys.version_info < (3, 12):
+        pytest.skip("BILIND_ENHANCED.py uses PEP 701 f-strings")
+    return _load_script('BILIND_ENHANCED.py')
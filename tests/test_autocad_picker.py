@@ -0,0 +1,204 @@
+"""
+Tests for the AutoCAD picker with stand-in COM objects.
+
+pywin32 and AutoCAD aren't available here, so documents, selection sets and
+entities are plain Python fakes exposing the members the picker reads.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import bilind.autocad.picker as picker_mod
+from bilind.autocad.picker import AutoCADPicker
+
+
+class FakeDocument:
+    def __init__(self, full_name, name):
+        self.FullName = full_name
+        self.Name = name
+
+
+def _patch_pywin32(monkeypatch, app=None, cast=None):
+    client = SimpleNamespace(GetActiveObject=lambda prog_id: app,
+                             CastTo=cast or (lambda obj, interface: obj))
+    monkeypatch.setattr(picker_mod, 'win32com', SimpleNamespace(client=client))
+    monkeypatch.setattr(picker_mod, 'gencache', SimpleNamespace(EnsureDispatch=lambda obj: obj))
+
+
+def _caller(hwnd):
+    return SimpleNamespace(app=SimpleNamespace(HWND=hwnd), prompt=lambda text: None)
+
+
+def test_early_bound_document_matches_callers_instance(monkeypatch):
+    doc = FakeDocument('C:\\plans\\a.dwg', 'a.dwg')
+    typed = FakeDocument('C:\\plans\\a.dwg', 'a.dwg')
+    app = SimpleNamespace(HWND=100, Documents=[FakeDocument('', 'Drawing1.dwg'), typed])
+    _patch_pywin32(monkeypatch, app)
+
+    assert AutoCADPicker(_caller(100), doc).doc is typed
+
+
+def test_early_bound_document_ignores_other_autocad_instance(monkeypatch):
+    doc = FakeDocument('C:\\plans\\a.dwg', 'a.dwg')
+    app = SimpleNamespace(HWND=200, Documents=[FakeDocument('C:\\plans\\a.dwg', 'a.dwg')])
+    _patch_pywin32(monkeypatch, app)
+
+    assert AutoCADPicker(_caller(100), doc).doc is doc
+
+
+def test_early_bound_document_ignores_ambiguous_match(monkeypatch):
+    doc = FakeDocument('', 'Drawing1.dwg')
+    app = SimpleNamespace(HWND=100, Documents=[FakeDocument('', 'Drawing1.dwg'),
+                                                FakeDocument('', 'Drawing1.dwg')])
+    _patch_pywin32(monkeypatch, app)
+
+    assert AutoCADPicker(_caller(100), doc).doc is doc
+
+
+def test_early_bound_entity_casts_by_object_name(monkeypatch):
+    casts = []
+    _patch_pywin32(monkeypatch, cast=lambda obj, interface: casts.append(interface) or 'typed')
+    picker = AutoCADPicker(_caller(100), FakeDocument('', 'Drawing1.dwg'))
+    entity = SimpleNamespace(_oleobj_=object(), ObjectName='AcDbPolyline')
+
+    assert picker._early_bound_entity(entity) == 'typed'
+    assert casts == ['IAcadLWPolyline']
+
+
+def test_early_bound_entity_keeps_unknown_and_non_pywin32_objects(monkeypatch):
+    _patch_pywin32(monkeypatch)
+    picker = AutoCADPicker(_caller(100), FakeDocument('', 'Drawing1.dwg'))
+    unknown = SimpleNamespace(_oleobj_=object(), ObjectName='AcDbText')
+    comtypes_obj = SimpleNamespace(ObjectName='AcDbPolyline')
+
+    assert picker._early_bound_entity(unknown) is unknown
+    assert picker._early_bound_entity(comtypes_obj) is comtypes_obj
+
+
+class FakePolyline:
+    ObjectName = 'AcDbPolyline'
+    Area = 12.0
+    Length = 14.0
+    Layer = 'A-ROOM'
+    Closed = True
+    Coordinates = (0.0, 0.0, 4.0, 0.0, 4.0, 3.0, 0.0, 3.0)
+
+    def GetBoundingBox(self, *args):
+        raise Exception("not needed for rectangles")
+
+
+class FakeHatch:
+    """Hatches expose Perimeter instead of Length and no Coordinates."""
+    ObjectName = 'AcDbHatch'
+    Area = 4.0
+    Perimeter = 8.0
+    Layer = 'A-HATCH'
+
+    def GetBoundingBox(self, *args):
+        raise Exception("bounding box unavailable")
+
+
+class FakeLine:
+    ObjectName = 'AcDbLine'
+    Length = 5.0
+    Layer = 'A-WALL'
+
+
+class FakeBlock:
+    Layer = 'A-DOOR'
+    IsDynamicBlock = False
+    HasAttributes = False
+    EffectiveName = 'DOOR_90'
+    Name = 'DOOR_90'
+
+
+class FakeSelectionSet:
+    def __init__(self, objects):
+        self.objects = objects
+        self.deleted = False
+
+    @property
+    def Count(self):
+        return len(self.objects)
+
+    def Item(self, i):
+        return self.objects[i]
+
+    def SelectOnScreen(self, *args):
+        pass
+
+    def Delete(self):
+        self.deleted = True
+
+
+class FakeSelectionSets:
+    Count = 0
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.created = []
+
+    def Add(self, name):
+        ss = FakeSelectionSet(self.objects)
+        self.created.append(ss)
+        return ss
+
+
+def _picker_for(monkeypatch, objects):
+    _patch_pywin32(monkeypatch)
+    doc = SimpleNamespace(SelectionSets=FakeSelectionSets(objects))
+    # No AutoCAD to re-acquire the document from: keep the fake one
+    monkeypatch.setattr(AutoCADPicker, '_early_bound_document', lambda self, d: d)
+    return AutoCADPicker(_caller(100), doc)
+
+
+def test_pick_rooms_reads_snapshot_properties(monkeypatch):
+    picker = _picker_for(monkeypatch, [FakePolyline(), FakeHatch()])
+
+    rooms = picker.pick_rooms(scale=1.0)
+
+    assert [r.layer for r in rooms] == ['A-ROOM', 'A-HATCH']
+    rect, hatch = rooms
+    assert rect.area == pytest.approx(12.0)
+    assert rect.perimeter == pytest.approx(14.0)
+    assert (rect.width, rect.length) == (pytest.approx(3.0), pytest.approx(4.0))
+    assert len(rect.walls) == 4
+    # No vertices and no bounding box: dimensions come from area/perimeter
+    assert hatch.perimeter == pytest.approx(8.0)
+    assert (hatch.width, hatch.length) == (pytest.approx(2.0), pytest.approx(2.0))
+    assert all(ss.deleted for ss in picker.doc.SelectionSets.created)
+
+
+def test_pick_rooms_skips_entities_without_area(monkeypatch):
+    picker = _picker_for(monkeypatch, [FakeLine(), FakePolyline()])
+
+    assert [r.layer for r in picker.pick_rooms(scale=1.0)] == ['A-ROOM']
+
+
+def test_pick_walls_uses_length_and_height(monkeypatch):
+    picker = _picker_for(monkeypatch, [FakeLine()])
+
+    walls = picker.pick_walls(scale=1.0, height=3.0)
+
+    assert len(walls) == 1
+    assert walls[0].layer == 'A-WALL'
+    assert walls[0].length == pytest.approx(5.0)
+    assert walls[0].height == pytest.approx(3.0)
+
+
+def test_count_openings(monkeypatch):
+    picker = _picker_for(monkeypatch, [FakeBlock(), FakeBlock()])
+
+    assert picker.count_openings('door') == 2
+
+
+def test_coords_to_xy_matches_stride():
+    xyz = (0, 0, 0, 4, 0, 0, 4, 3, 0)
+    assert picker_mod._coords_to_xy(xyz, 3) == [(0.0, 0.0), (4.0, 0.0), (4.0, 3.0)]
+    assert picker_mod._coords_to_xy((0, 0, 4, 0, 4), 2) == [(0.0, 0.0), (4.0, 0.0)]
+
+
+def test_coords_to_xy_rejects_non_numeric_entries():
+    with pytest.raises((TypeError, ValueError)):
+        picker_mod._coords_to_xy((0, 0, None, 1), 2)
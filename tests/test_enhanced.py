@@ -0,0 +1,74 @@
+"""
+Tests for BILIND_ENHANCED.py helpers (loaded with stand-in COM modules, see conftest).
+"""
+
+from unittest.mock import MagicMock
+
+
+def test_fmt_keeps_sign_of_zero(enhanced):
+    app = enhanced.BilindEnhanced.__new__(enhanced.BilindEnhanced)
+
+    assert app._fmt(0.0) == '0.00'
+    assert app._fmt(-0.0) == '-0.00'
+    assert app._fmt(1.5) == '1.50'
+    assert app._fmt(None) == '-'
+
+
+def test_safe_float_accepts_what_float_accepts(enhanced):
+    for text in ('3', '-2.5', '.5', '5.', '+1', '1e3', '1E-2', '2.5e+1', '1_000',
+                 'inf', '-Infinity', 'nan', ' 4.0 '):
+        expected = float(text)
+        result = enhanced._safe_float(text)
+        assert result == expected or (result != result and expected != expected), text
+
+
+def test_safe_float_returns_default_for_malformed_input(enhanced):
+    for text in ('', '   ', 'abc', '1.2.3', '1e', 'e3', '--1', '1_', '1 2'):
+        assert enhanced._safe_float(text, default=7.0) == 7.0, text
+
+
+def test_wheel_units_handles_all_platforms(enhanced):
+    cases = [
+        (0, -120, 1), (0, 240, -2),   # Windows: multiples of 120
+        (0, -1, 1), (0, 3, -1),       # macOS: small deltas
+        (4, 0, -1), (5, 0, 1),        # X11: Button-4/5
+        (0, 0, 0),
+    ]
+    for num, delta, units in cases:
+        assert enhanced._wheel_units(MagicMock(num=num, delta=delta)) == units
+
+
+class _FakeTree:
+    def __init__(self, children, selection):
+        self.children = children
+        self._selection = selection
+
+    def get_children(self):
+        return self.children
+
+    def selection(self):
+        return self._selection
+
+
+def test_selected_storage_indices_follow_filtered_rows(enhanced):
+    app = enhanced.BilindEnhanced.__new__(enhanced.BilindEnhanced)
+    rooms = [{'name': n} for n in ('A', 'B', 'C', 'D')]
+    # The filter shows C and A only; both rows are selected
+    app._tree_records = {'rooms': [rooms[2], rooms[0]]}
+    tree = _FakeTree(('i1', 'i2'), ('i1', 'i2'))
+
+    assert app._selected_storage_indices('rooms', rooms, tree) == {0, 2}
+    assert app._selected_storage_indices('rooms', rooms, _FakeTree(('i1',), ())) == set()
+
+
+def test_edit_refuses_multi_selection(enhanced, monkeypatch):
+    app = enhanced.BilindEnhanced.__new__(enhanced.BilindEnhanced)
+    app.walls_tree = _FakeTree(('i1', 'i2'), ('i1', 'i2'))
+    app._pooled_dialog = MagicMock()
+    warn = MagicMock()
+    monkeypatch.setattr(enhanced.messagebox, 'showwarning', warn)
+
+    app.edit_wall()
+
+    warn.assert_called_once()
+    app._pooled_dialog.assert_not_called()
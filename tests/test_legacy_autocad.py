@@ -0,0 +1,283 @@
+"""
+Tests for _legacy/bilind_autocad.py (loaded with stand-in COM modules, see conftest).
+"""
+
+import queue
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+def _new_app(legacy):
+    app = legacy.BilindApp.__new__(legacy.BilindApp)
+    app.root = MagicMock()
+    app.cmd_q = queue.Queue()
+    app._pending = 0
+    app._busy = False
+    app.scale = 1.0
+    app.rooms = []
+    app.openings = []
+    return app
+
+
+def _drain(app, timeout=5.0):
+    """Run the Tk-side poller until every worker has reported back."""
+    while app._pending:
+        app.cmd_q.put(app.cmd_q.get(timeout=timeout))
+        app._poll_queue()
+
+
+def test_export_csv_writes_report(legacy_autocad, tmp_path):
+    filename = str(tmp_path / 'report.csv')
+    app = _new_app(legacy_autocad)
+    app.rooms.append(legacy_autocad.Room('A-ROOM', '3.000', '4.000', 14.0, 12.0))
+
+    with patch.object(legacy_autocad.filedialog, 'asksaveasfilename', return_value=filename), \
+            patch.object(legacy_autocad, 'messagebox') as box:
+        app.export_csv()
+        _drain(app)
+
+    box.showinfo.assert_called_once()
+    with open(filename, encoding='utf-8-sig', newline='') as f:
+        lines = f.read().splitlines()
+    assert lines[1] == 'Room,A-ROOM,3.000,4.000,14.000,12.000'
+    assert lines[-1] == 'TOTALS,-,-,-,14.000,12.000'
+
+
+@pytest.mark.parametrize('error', [OSError('disk full'),
+                                   UnicodeEncodeError('utf-8', '', 0, 1, 'bad')])
+def test_write_csv_async_reports_any_error(legacy_autocad, tmp_path, error):
+    app = _new_app(legacy_autocad)
+
+    with patch('builtins.open', side_effect=error), \
+            patch.object(legacy_autocad, 'messagebox') as box:
+        app._write_csv_async(str(tmp_path / 'report.csv'), [['a', 'b']])
+        _drain(app)
+
+    box.showerror.assert_called_once()
+    assert app._pending == 0
+
+
+def test_concurrent_writes_share_one_poller(legacy_autocad, tmp_path):
+    app = _new_app(legacy_autocad)
+
+    with patch.object(legacy_autocad, 'messagebox') as box:
+        app._write_csv_async(str(tmp_path / 'a.csv'), [['a']])
+        app._write_csv_async(str(tmp_path / 'b.csv'), [['b']])
+        assert app.root.after.call_count == 1
+        _drain(app)
+
+    assert box.showinfo.call_count == 2
+
+
+class FakeSelection(list):
+    def SelectOnScreen(self, *args):
+        self.filter = args
+
+    def Delete(self):
+        self.deleted = True
+
+
+class FakeSelectionSets:
+    def __init__(self, objects):
+        self.objects = objects
+
+    def Item(self, name):
+        raise Exception("no such selection set")
+
+    def Add(self, name):
+        return FakeSelection(self.objects)
+
+
+def _fake_acad(objects):
+    doc = MagicMock()
+    doc.SelectionSets = FakeSelectionSets(objects)
+    return MagicMock(doc=doc)
+
+
+class FakeRoomPolyline:
+    ObjectName = 'AcDbPolyline'
+    Area = 12.0
+    Length = 14.0
+    Layer = 'A-ROOM'
+
+    def GetBoundingBox(self):
+        return (0.0, 0.0, 0.0), (4.0, 3.0, 0.0)
+
+
+class FakeBrokenHatch:
+    ObjectName = 'AcDbHatch'
+    Area = 4.0
+
+    @property
+    def Layer(self):
+        raise Exception("layer unavailable")
+
+    def GetBoundingBox(self):
+        raise Exception("bounding box unavailable")
+
+
+def test_pick_rooms_worker_keeps_rooms_with_unreadable_bbox_and_layer(legacy_autocad):
+    app = _new_app(legacy_autocad)
+    acad = _fake_acad([FakeRoomPolyline(), FakeBrokenHatch()])
+
+    with patch.object(legacy_autocad, '_connect_acad', return_value=acad):
+        app._pick_rooms_worker()
+
+    kind, (areas, perims, layers, bboxes) = app.cmd_q.get_nowait()
+    assert kind == 'rooms'
+    assert areas == [12.0, 4.0]
+    assert perims == [14.0, 0]
+    assert layers == ['A-ROOM', 'Unknown']
+    assert bboxes[1] is None
+    assert legacy_autocad._classify_rooms(areas, bboxes, 1.0) == [("4.000", "3.000"), ("-", "-")]
+
+
+def test_entity_casts_by_object_name(legacy_autocad):
+    obj = FakeRoomPolyline()
+    with patch.object(legacy_autocad.win32com.client, 'CastTo', return_value='typed') as cast:
+        assert legacy_autocad._entity(obj) == 'typed'
+    cast.assert_called_once_with(obj, 'IAcadLWPolyline')
+
+
+def test_entity_keeps_unknown_types(legacy_autocad):
+    obj = MagicMock(ObjectName='AcDbText')
+    assert legacy_autocad._entity(obj) is obj
+
+
+class FakeAttribute:
+    def __init__(self, tag, text):
+        self.TagString = tag
+        self.TextString = text
+
+
+class FakeDoorBlock:
+    Name = 'DOOR_90'
+    Layer = 'A-DOOR'
+    ObjectName = 'AcDbBlockReference'
+    HasAttributes = True
+
+    def GetAttributes(self):
+        return (FakeAttribute('W', '0.9'), FakeAttribute('H', '2.1'))
+
+
+def test_pick_blocks_counts_and_reads_attributes(legacy_autocad):
+    app = _new_app(legacy_autocad)
+    app.acad = _fake_acad([FakeDoorBlock(), FakeDoorBlock()])
+    app.doc = app.acad.doc
+    app._attr_template_cache = {}
+    app.refresh_openings_table = MagicMock()
+    app.update_totals = MagicMock()
+
+    with patch.object(legacy_autocad, 'messagebox') as box:
+        app.pick_blocks()
+
+    box.showinfo.assert_called_once()
+    assert len(app.openings) == 2
+    door = app.openings[0]
+    assert (door.type, door.layer) == ('DOOR', 'A-DOOR')
+    assert door.width == pytest.approx(0.9)
+    assert door.height == pytest.approx(2.1)
+
+
+def test_insert_table_passes_double_array_point(legacy_autocad):
+    table = MagicMock()
+    doc = MagicMock()
+    doc.Utility.GetPoint.return_value = (1.0, 2.0, 0.0)
+    doc.ModelSpace.AddTable.return_value = table
+    app = _new_app(legacy_autocad)
+    app.acad = MagicMock(doc=doc)
+    app.rooms.append(legacy_autocad.Room('A-ROOM', '3.000', '4.000', 14.0, 12.0))
+
+    with patch.object(legacy_autocad, 'messagebox') as box:
+        app.insert_table()
+
+    box.showinfo.assert_called_once()
+    doc.Utility.GetPoint.assert_called_once_with()
+    insertion, rows, cols = doc.ModelSpace.AddTable.call_args.args[:3]
+    pythoncom = legacy_autocad.pythoncom
+    assert insertion.vt == pythoncom.VT_ARRAY | pythoncom.VT_R8
+    assert insertion.value == (1.0, 2.0, 0.0)
+    assert (rows, cols) == (5, 6)
+    table.SetText.assert_any_call(2, 1, 'A-ROOM')
+    doc.StartUndoMark.assert_called_once()
+    doc.EndUndoMark.assert_called_once()
+
+
+class FakeTree:
+    """Just enough of ttk.Treeview for VirtualTreeview."""
+
+    def __init__(self, height):
+        self.options = {'height': height}
+        self.values = {}
+        self.order = []
+        self.selected = ()
+
+    def __getitem__(self, option):
+        return self.options[option]
+
+    def winfo_height(self):
+        return 0
+
+    def get_children(self):
+        return tuple(self.order)
+
+    def item(self, iid, values):
+        self.values[iid] = values
+
+    def insert(self, parent, index, values):
+        iid = f"I{len(self.values)}"
+        self.values[iid] = values
+        self.order.append(iid)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.order.remove(iid)
+            del self.values[iid]
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, iids):
+        self.selected = tuple(iids)
+
+
+def _virtual_view(legacy, rows, height=3):
+    view = legacy.VirtualTreeview.__new__(legacy.VirtualTreeview)
+    view.tree = FakeTree(height)
+    view.scrollbar = MagicMock()
+    view.rows = []
+    view.format_row = None
+    view.offset = 0
+    view.selected = set()
+    view.row_height = 20
+    view.set_rows(rows)
+    return view
+
+
+def _selected_values(view):
+    return [view.tree.values[iid] for iid in view.tree.selection()]
+
+
+def test_virtual_view_selection_follows_records_while_scrolling(legacy_autocad):
+    view = _virtual_view(legacy_autocad, [(f"R{i}",) for i in range(20)])
+    view.tree.selection_set([view.tree.get_children()[1]])
+    view._on_select()
+
+    view.yview('scroll', 5, 'units')
+    assert _selected_values(view) == []
+    assert view.selection() == [1]
+
+    view.yview('scroll', -5, 'units')
+    assert _selected_values(view) == [("R1",)]
+
+
+@pytest.mark.parametrize('num, delta, units', [
+    (0, -120, 1), (0, 240, -2),   # Windows: multiples of 120
+    (0, -1, 1), (0, 3, -1),       # macOS: small deltas
+    (4, 0, -1), (5, 0, 1),        # X11: Button-4/5
+    (0, 0, 0),
+])
+def test_wheel_units(legacy_autocad, num, delta, units):
+    event = MagicMock(num=num, delta=delta)
+    assert legacy_autocad._wheel_units(event) == units
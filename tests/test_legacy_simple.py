@@ -0,0 +1,168 @@
+"""
+Tests for _legacy/BILIND_SIMPLE.py (loaded with stand-in COM modules, see conftest).
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+
+def _run_export(simple, filename):
+    app = simple.BilindSimple.__new__(simple.BilindSimple)
+    app.root = MagicMock()
+    app.update_status = MagicMock()
+
+    with patch.object(simple.filedialog, 'asksaveasfilename', return_value=filename), \
+            patch.object(simple, 'messagebox') as box:
+        app.export_csv()
+        # The worker never touches Tk; the poll is scheduled from this thread
+        callback, result_q = app.root.after.call_args.args[1:]
+        deadline = time.monotonic() + 5.0
+        while not (box.showinfo.called or box.showerror.called):
+            assert time.monotonic() < deadline, "CSV write never reported back"
+            callback(result_q)
+            time.sleep(0.01)
+    return box
+
+
+def test_export_csv_reports_success(legacy_simple, tmp_path):
+    filename = str(tmp_path / 'summary.csv')
+
+    box = _run_export(legacy_simple, filename)
+
+    box.showinfo.assert_called_once()
+    assert filename in box.showinfo.call_args.args[1]
+    with open(filename, encoding='utf-8-sig', newline='') as f:
+        assert f.read().splitlines()[0] == 'النوع,الاسم,المساحة'
+
+
+def test_export_csv_reports_write_error(legacy_simple, tmp_path):
+    filename = str(tmp_path / 'missing' / 'summary.csv')
+
+    box = _run_export(legacy_simple, filename)
+
+    box.showerror.assert_called_once()
+    assert 'summary.csv' in box.showerror.call_args.args[1]
+
+
+def test_export_csv_reports_non_os_errors(legacy_simple, tmp_path):
+    filename = str(tmp_path / 'summary.csv')
+
+    with patch('builtins.open', side_effect=UnicodeEncodeError('utf-8', '', 0, 1, 'bad')):
+        box = _run_export(legacy_simple, filename)
+
+    box.showerror.assert_called_once()
+
+
+class FakeTree:
+    """Just enough of ttk.Treeview for the search filter."""
+
+    def __init__(self):
+        self.rows = {}
+        self.order = []  # attached iids, in display order
+        self.options = {'displaycolumns': ('#all',)}
+        self.configured = []
+
+    def cget(self, option):
+        return self.options[option]
+
+    def configure(self, **options):
+        self.configured.append(options)
+        self.options.update(options)
+
+    def insert(self, values):
+        iid = f"I{len(self.rows)}"
+        self.rows[iid] = values
+        self.order.append(iid)
+        return iid
+
+    def delete(self, iid):
+        del self.rows[iid]
+        if iid in self.order:
+            self.order.remove(iid)
+
+    def get_children(self):
+        return tuple(self.order)
+
+    def item(self, iid, option):
+        return self.rows[iid]
+
+    def exists(self, iid):
+        return iid in self.rows
+
+    def detach(self, iid):
+        if iid in self.order:
+            self.order.remove(iid)
+
+    def reattach(self, iid, parent, index):
+        self.detach(iid)
+        self.order.insert(len(self.order) if index == 'end' else index, iid)
+
+
+def _search_app(simple, tree):
+    app = simple.BilindSimple.__new__(simple.BilindSimple)
+    app.update_status = MagicMock()
+    app._search_after = {}
+    app._all_iids = {}
+    app._row_text = {}
+    app._shown_iids = {}
+    app.rooms_tree = tree
+    return app
+
+
+def _shown(app, tree):
+    return [tree.rows[iid][0] for iid in tree.get_children()]
+
+
+def test_filter_picks_up_rows_added_after_first_search(legacy_simple):
+    tree = FakeTree()
+    tree.insert(('Kitchen',))
+    tree.insert(('Bedroom',))
+    app = _search_app(legacy_simple, tree)
+
+    app._do_filter('rooms', 'kitchen')
+    assert _shown(app, tree) == ['Kitchen']
+
+    tree.insert(('Kitchen 2',))
+    app._do_filter('rooms', 'kitchen')
+    assert _shown(app, tree) == ['Kitchen', 'Kitchen 2']
+
+    app._do_filter('rooms', '')
+    assert _shown(app, tree) == ['Kitchen', 'Bedroom', 'Kitchen 2']
+
+
+def test_filter_drops_deleted_rows(legacy_simple):
+    tree = FakeTree()
+    kitchen = tree.insert(('Kitchen',))
+    tree.insert(('Bedroom',))
+    app = _search_app(legacy_simple, tree)
+
+    app._do_filter('rooms', '')
+    tree.delete(kitchen)
+    app._do_filter('rooms', '')
+
+    assert _shown(app, tree) == ['Bedroom']
+
+
+def test_table_changed_reindexes_edited_rows(legacy_simple):
+    tree = FakeTree()
+    iid = tree.insert(('Kitchen',))
+    tree.insert(('Bedroom',))
+    app = _search_app(legacy_simple, tree)
+
+    app._do_filter('rooms', 'bed')
+    tree.rows[iid] = ('Bathroom',)
+    app._table_changed('rooms')
+    app._do_filter('rooms', 'bath')
+
+    assert _shown(app, tree) == ['Bathroom']
+
+
+def test_filter_hides_columns_while_filtering(legacy_simple):
+    tree = FakeTree()
+    tree.insert(('Kitchen',))
+    app = _search_app(legacy_simple, tree)
+
+    app._do_filter('rooms', 'kit')
+
+    assert tree.configured == [{'displaycolumns': ()}, {'displaycolumns': ('#all',)}]
+    assert _shown(app, tree) == ['Kitchen']